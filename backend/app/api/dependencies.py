@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hmac
 from collections.abc import Generator
 
+from fastapi import Depends, Header, HTTPException, Request, status
 from sqlmodel import Session
 
 from app.core.database import get_session
 from app.core.settings import Settings, get_settings
+from app.extensions.admission import READ_METHODS
 
 
 def get_settings_dependency() -> Settings:
@@ -14,7 +17,22 @@ def get_settings_dependency() -> Settings:
     return get_settings()
 
 
-def get_db_session() -> Generator[Session, None, None]:
-    """Yield a SQLModel session for FastAPI dependency injection."""
+def get_db_session(request: Request) -> Generator[Session, None, None]:
+    """Yield a SQLModel session for FastAPI dependency injection.
 
-    yield from get_session()
+    GET/HEAD/OPTIONS handlers only read, so they get a session on the read engine.
+    """
+
+    yield from get_session(read_only=request.method in READ_METHODS)
+
+
+def require_admin(
+    x_admin_token: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings_dependency),
+) -> None:
+    """Reject requests that do not carry the configured admin token."""
+
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from .settings import Settings
+
+
+class CacheBackend(Protocol):
+    """Byte-oriented cache with atomic version counters used to build invalidatable keys."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def get_version(self, key: str) -> int: ...
+
+    def bump_versions(self, *keys: str) -> None: ...
+
+
+class InMemoryCache:
+    """Process-local LRU cache bounded by the total size of stored values."""
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._versions: dict[str, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def get_version(self, key: str) -> int:
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def bump_versions(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+
+class RedisCache:
+    """Adapter for any client exposing redis-py's ``get``/``set``/``pipeline`` interface."""
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl > 0:
+            self.client.set(key, value, px=int(ttl * 1000))
+
+    def get_version(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+    def bump_versions(self, *keys: str) -> None:
+        pipeline = self.client.pipeline(transaction=True)
+        for key in keys:
+            pipeline.incr(key)
+        pipeline.execute()
+
+
+class NullCache(InMemoryCache):
+    """Stores nothing but still tracks versions so in-process coalescing keys stay correct."""
+
+    def __init__(self) -> None:
+        super().__init__(max_bytes=0)
+
+
+def resolve_cache_backend(settings: Settings) -> str:
+    """Backend name ``settings.cache_backend`` stands for, with ``auto`` resolved."""
+
+    if settings.cache_backend == "auto":
+        return "redis" if settings.cache_url else "none"
+    return settings.cache_backend
+
+
+def resolve_read_coalescing_ttl(settings: Settings) -> float:
+    """Reuse window of coalesced reads, with an unset ``read_coalescing_ttl`` resolved.
+
+    Reused bodies are keyed by the backend's version counters. Without a backend those counters
+    live in each process, so a write handled by another worker would not retire them; reads are
+    then only de-duplicated while in flight.
+    """
+
+    if settings.read_coalescing_ttl is not None:
+        return settings.read_coalescing_ttl
+    return 0.0 if resolve_cache_backend(settings) == "none" else 1.0
+
+
+def build_cache_backend(settings: Settings) -> CacheBackend:
+    """Instantiate the backend selected by ``settings.cache_backend``."""
+
+    name = resolve_cache_backend(settings)
+    if name == "redis":
+        try:
+            import redis
+        except ImportError as error:  # pragma: no cover - depends on optional dependency
+            raise RuntimeError("Install the `redis` package to use CACHE_BACKEND=redis") from error
+        if not settings.cache_url:
+            raise RuntimeError("CACHE_URL is required when CACHE_BACKEND=redis")
+        return RedisCache(redis.Redis.from_url(settings.cache_url))
+    if name == "none":
+        return NullCache()
+    return InMemoryCache(max_bytes=settings.cache_max_bytes)
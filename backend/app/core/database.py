@@ -1,28 +1,152 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session
 
 from .settings import get_settings
+from .slow_queries import SlowQueryLog
+from .sqlite import create_sqlite_engines, is_sqlite
 
-settings = get_settings()
+_engine: Engine | None = None
+_read_engine: Engine | None = None
+_engine_lock = threading.Lock()
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    future=True,
-)
-SessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
 
+def _create_engines() -> tuple[Engine, Engine]:
+    settings = get_settings()
+    if is_sqlite(settings.database_url):
+        engine, read_engine = create_sqlite_engines(settings)
+        for instrumented in {engine, read_engine}:
+            instrument_engine(instrumented)
+        return engine, read_engine
+    engine = create_engine(
+        settings.database_url,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        pool_recycle=settings.database_pool_recycle,
+        future=True,
+    )
+    instrument_engine(engine)
+    return engine, engine
 
-def get_session() -> Generator[Session, None, None]:
-    """Yield a SQLModel session for request-scoped usage."""
 
-    session: Session = SessionLocal()
+def get_engine() -> Engine:
+    """Return the application engine, creating it (and loading the DB driver) on first use."""
+
+    global _engine, _read_engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine, _read_engine = _create_engines()
+    return _engine
+
+
+def get_read_engine() -> Engine:
+    """Engine for work that only reads: the reader pool on SQLite, the application engine elsewhere."""
+
+    get_engine()
+    return _read_engine
+
+
+@lru_cache
+def get_sessionmaker() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_engine(), class_=Session, autoflush=False, autocommit=False)
+
+
+@lru_cache
+def get_read_sessionmaker() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_read_engine(), class_=Session, autoflush=False, autocommit=False)
+
+
+@lru_cache
+def get_slow_query_log() -> SlowQueryLog:
+    settings = get_settings()
+    return SlowQueryLog(
+        threshold_ms=settings.slow_query_threshold_ms,
+        explain_sample_rate=settings.slow_query_explain_sample_rate,
+        buffer_size=settings.slow_query_buffer_size,
+    )
+
+
+def dispose_engine() -> None:
+    """Close pooled connections and forget the engines; the next ``get_engine`` builds new ones."""
+
+    global _engine, _read_engine
+    with _engine_lock:
+        engines = {_engine, _read_engine} - {None}
+        _engine = _read_engine = None
+    get_sessionmaker.cache_clear()
+    get_read_sessionmaker.cache_clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def get_session(*, read_only: bool = False) -> Generator[Session, None, None]:
+    """Yield a SQLModel session for request-scoped usage; ``read_only`` sessions use the read engine."""
+
+    factory = get_read_sessionmaker() if read_only else get_sessionmaker()
+    session: Session = factory()
     try:
         yield session
     finally:
         session.close()
+
+
+@dataclass
+class QueryStats:
+    """SQL statement count and cumulative execution time for a unit of work."""
+
+    count: int = 0
+    duration: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Accumulate SQL timings for statements executed within the current context."""
+
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Time ``engine``'s statements for ``track_queries`` and the slow query log.
+
+    Only the application's engines are instrumented; Alembic, benchmark and test engines are not.
+    """
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_started_at", time.perf_counter())
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    get_slow_query_log().observe(
+        cursor, conn.dialect.name, statement, parameters, executemany, elapsed
+    )
@@ -1,12 +1,166 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
+import queue
+import random
+from collections.abc import MutableMapping
+from contextvars import ContextVar, Token
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
 
 from .settings import Settings
 
+_request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+_request_scope: ContextVar[MutableMapping[str, object] | None] = ContextVar(
+    "request_scope", default=None
+)
+_listener: QueueListener | None = None
+
+# Attributes present on every LogRecord; anything else was passed via `extra=` and is emitted.
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+def get_request_id() -> str | None:
+    """Return the request ID bound to the current context, if any."""
+
+    return _request_id.get()
+
+
+def bind_request_id(request_id: str | None) -> Token[str | None]:
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: Token[str | None]) -> None:
+    _request_id.reset(token)
+
+
+def bind_request_scope(
+    scope: MutableMapping[str, object],
+) -> Token[MutableMapping[str, object] | None]:
+    return _request_scope.set(scope)
+
+
+def reset_request_scope(token: Token[MutableMapping[str, object] | None]) -> None:
+    _request_scope.reset(token)
+
+
+def get_request_route() -> str | None:
+    """Return the matched route template of the current request, once routing has happened."""
+
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    return getattr(scope.get("route"), "path", None)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the request ID while still on the producing thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class DebugSampleFilter(logging.Filter):
+    """Keep only a fraction of DEBUG records so verbose loggers stay affordable."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, object] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            payload["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue records with their message resolved but leave formatting to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 
 def configure_logging(settings: Settings) -> None:
-    """Apply the service logging configuration."""
+    """Apply the service logging configuration.
+
+    Records are pushed onto an in-memory queue by the calling thread and formatted/written by a
+    background listener, so slow sinks never add to request latency.
+    """
+
+    global _listener
 
     level = getattr(logging, settings.log_level.upper(), logging.INFO)
-    logging.basicConfig(level=level)
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler()
+    if settings.log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s")
+        )
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSampleFilter(settings.log_debug_sample_rate))
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener."""
+
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
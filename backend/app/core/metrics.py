@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+
+def _key(name: str, labels: dict[str, str]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{label}="{value}"' for label, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class MetricsRegistry:
+    """Minimal in-process counters and gauges keyed Prometheus-style (`name{label="value"}`)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register_gauge(self, name: str, callback: Callable[[], float], **labels: str) -> None:
+        """Register a gauge whose value is read from ``callback`` at snapshot time."""
+
+        with self._lock:
+            self._gauges[_key(name, labels)] = callback
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            values = dict(self._counters)
+            gauges = dict(self._gauges)
+        for key, callback in gauges.items():
+            values[key] = callback()
+        return dict(sorted(values.items()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+from collections.abc import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run a blocking ``job`` in the threadpool every ``interval`` seconds for the app's lifetime.
+
+    The first run is delayed by a random fraction of the interval so workers started together do
+    not all hit the database at once. Failures are logged and counted; the schedule continues.
+    """
+
+    def __init__(self, name: str, job: Callable[[], object], *, interval: float) -> None:
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"periodic:{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.interval * random.random())
+        while True:
+            try:
+                await run_in_threadpool(self.job)
+            except Exception:
+                logger.exception("Periodic task failed", extra={"task": self.name})
+                metrics.increment("periodic_task_failures_total", task=self.name)
+            else:
+                metrics.increment("periodic_task_runs_total", task=self.name)
+            await asyncio.sleep(self.interval)
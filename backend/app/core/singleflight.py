@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent loads of the same key into one call and briefly cache the result.
+
+    The first caller for a key runs ``loader``; callers arriving while it runs block and receive
+    the same result (or exception). Successful results are kept for ``ttl`` seconds, bounded to
+    ``max_entries`` with least-recently-used eviction. Keys are expected to embed a version so
+    writers invalidate by bumping it rather than by deleting entries.
+    """
+
+    def __init__(self, *, ttl: float, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def do[T](self, key: Hashable, loader: Callable[[], T]) -> T:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._results.move_to_end(key)
+                return cached[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = loader()
+        except BaseException as error:
+            call.error = error
+            raise
+        else:
+            self._store(key, call.result)
+            return call.result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._results[key] = (time.monotonic() + self.ttl, value)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import random
+import re
+import threading
+from collections import deque
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from .logging import get_request_id, get_request_route
+
+logger = logging.getLogger("app.slow_query")
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists render one placeholder per value; collapse them so the shape stays stable.
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:%\(\w+\)s|\?|\$\d+)(?:\s*,\s*(?:%\(\w+\)s|\?|\$\d+))+\s*\)"
+)
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+
+@dataclass
+class SlowQuery:
+    recorded_at: datetime
+    statement: str
+    parameters: Any
+    duration_ms: float
+    route: str | None
+    request_id: str | None
+    plan: str | None = None
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and expanded placeholder lists into a stable statement shape."""
+
+    collapsed = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(...)", collapsed)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type names so no user data reaches the logs."""
+
+    if isinstance(parameters, Mapping):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, Sequence) and not isinstance(parameters, str | bytes):
+        return [redact_parameters(value) for value in parameters[:20]]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Log statements slower than a threshold and keep the most recent ones in a ring buffer."""
+
+    def __init__(
+        self,
+        *,
+        threshold_ms: float,
+        explain_sample_rate: float = 0.0,
+        buffer_size: int = 50,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        cursor: Any,
+        dialect_name: str,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration: float,
+    ) -> None:
+        duration_ms = duration * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = SlowQuery(
+            recorded_at=datetime.now(tz=UTC),
+            statement=normalize_statement(statement),
+            parameters=redact_parameters(parameters),
+            duration_ms=round(duration_ms, 2),
+            route=get_request_route(),
+            request_id=get_request_id(),
+        )
+        if self._should_explain(dialect_name, statement, executemany):
+            entry.plan = self._explain(cursor, statement, parameters)
+
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            "Slow query took %.1fms",
+            entry.duration_ms,
+            extra={
+                "statement": entry.statement,
+                "parameters": entry.parameters,
+                "duration_ms": entry.duration_ms,
+                "route": entry.route,
+                "explained": entry.plan is not None,
+            },
+        )
+
+    def recent(self) -> list[dict[str, Any]]:
+        """Return buffered slow queries, newest first."""
+
+        with self._lock:
+            entries = list(self._entries)
+        return [asdict(entry) for entry in reversed(entries)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _should_explain(self, dialect_name: str, statement: str, executemany: bool) -> bool:
+        # EXPLAIN ANALYZE executes the statement again, so only ever re-run plain reads.
+        return (
+            self.explain_sample_rate > 0
+            and dialect_name == "postgresql"
+            and not executemany
+            and statement.lstrip().upper().startswith("SELECT")
+            and random.random() < self.explain_sample_rate
+        )
+
+    def _explain(self, cursor: Any, statement: str, parameters: Any) -> str | None:
+        # Runs on the raw DBAPI connection to avoid re-entering engine events; the savepoint keeps
+        # a failing EXPLAIN from aborting the caller's transaction.
+        explain_cursor = cursor.connection.cursor()
+        try:
+            explain_cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            try:
+                explain_cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            except Exception:
+                explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                logger.debug("EXPLAIN capture failed", exc_info=True)
+                return None
+            explain_cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            return plan
+        except Exception:
+            logger.debug("EXPLAIN capture unavailable", exc_info=True)
+            return None
+        finally:
+            explain_cursor.close()
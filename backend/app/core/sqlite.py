@@ -0,0 +1,99 @@
+"""Engines for the embedded SQLite deployment mode (``DATABASE_URL=sqlite:///path/to/todo.db``).
+
+SQLite allows one writer at a time per database file, so writes go through an engine holding a
+single connection: concurrent writers in a process queue for it on the pool instead of failing
+with ``database is locked``. Its transactions start with ``BEGIN IMMEDIATE`` so the file lock is
+taken up front, where the busy timeout applies, rather than on the first write of a read-then-write
+transaction. Reads use a separate pool of ``query_only`` connections which, in WAL mode, read a
+consistent snapshot without blocking the writer or each other.
+
+Every connection enables foreign keys (the schema relies on ``ON DELETE CASCADE``) and applies the
+WAL, ``synchronous=NORMAL``, memory-map and page-cache pragmas. ``synchronous=NORMAL`` in WAL mode
+keeps the database consistent after a crash but may lose the last commits on power loss.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from .settings import Settings
+
+
+def is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def is_in_memory(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def connection_pragmas(settings: Settings, *, read_only: bool) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        # A negative cache_size is in KiB rather than pages.
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def create_sqlite_engines(settings: Settings) -> tuple[Engine, Engine]:
+    """Return ``(writer, reader)`` engines for ``settings.database_url``.
+
+    An in-memory database exists only inside its one connection, so there both are the same
+    single-connection engine.
+    """
+
+    connect_args = {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout}
+    if is_in_memory(settings.database_url):
+        engine = create_engine(
+            settings.database_url, connect_args=connect_args, poolclass=StaticPool
+        )
+        _configure(engine, settings, read_only=False)
+        return engine, engine
+
+    writer = create_engine(
+        settings.database_url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.sqlite_busy_timeout,
+    )
+    _configure(writer, settings, read_only=False)
+    reader = create_engine(
+        settings.database_url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+    )
+    _configure(reader, settings, read_only=True)
+    return writer, reader
+
+
+def _configure(engine: Engine, settings: Settings, *, read_only: bool) -> None:
+    pragmas = connection_pragmas(settings, read_only=read_only)
+    begin = "BEGIN" if read_only else "BEGIN IMMEDIATE"
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        # Stop the sqlite3 module from issuing its own BEGIN so the "begin" hook below decides
+        # how transactions start; pragmas such as journal_mode cannot run inside one anyway.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection) -> None:
+        connection.exec_driver_sql(begin)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(app: FastAPI, engine: Engine, *, connections: int) -> None:
+    """Do the lazy first-request work up front so the first real request is not the slow one.
+
+    Configures ORM mappers, builds the OpenAPI schema (which walks every route's Pydantic
+    models) and opens ``connections`` pooled database connections. A database that is not
+    reachable yet is logged rather than raised; readiness probes report it separately.
+    """
+
+    started = time.perf_counter()
+    configure_mappers()
+    app.openapi()
+
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    except Exception:
+        logger.warning("Database connection warm-up failed", exc_info=True)
+    finally:
+        for connection in opened:
+            connection.close()
+
+    logger.info(
+        "Warm-up complete",
+        extra={
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "pooled_connections": len(opened),
+        },
+    )
@@ -1,8 +1,23 @@
 """Database shortcuts maintained for Alembic compatibility."""
 
-from app.core.database import SessionLocal, engine, get_session  # noqa: F401
+from typing import Any
 
 # Import models so SQLModel metadata is registered when Alembic runs.
-from . import models  # noqa: F401,E402
+from . import models  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first use, so migration runs that only need the models do not load the
+    # application's engine setup.
+    from app.core import database
+
+    if name == "engine":
+        return database.get_engine()
+    if name == "SessionLocal":
+        return database.get_sessionmaker()
+    if name == "get_session":
+        return database.get_session
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["engine", "SessionLocal", "get_session"]
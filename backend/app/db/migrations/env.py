@@ -3,9 +3,10 @@ from __future__ import annotations
 from logging.config import fileConfig
 
 from alembic import context
+from sqlalchemy import create_engine, pool
 from sqlmodel import SQLModel
 
-from app.core.database import engine as app_engine
+from app.core.settings import get_settings
 from app.db.models import *  # noqa: F401,F403 - ensure metadata registration
 
 config = context.config
@@ -15,11 +16,14 @@ if config.config_file_name is not None:
 
 target_metadata = SQLModel.metadata
 
+# Only settings and models are needed here; the application engine, pool tuning and query
+# instrumentation stay out of migration runs.
+database_url = get_settings().database_url
+
 
 def run_migrations_offline() -> None:
-    url = str(app_engine.url)
     context.configure(
-        url=url,
+        url=database_url,
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
@@ -30,7 +34,7 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
-    connectable = app_engine
+    connectable = create_engine(database_url, poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
         context.configure(connection=connection, target_metadata=target_metadata)
@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import sqlalchemy as sa
 from alembic import op
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = "0001_create_todo_schema"
@@ -17,7 +16,8 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
-UUID = postgresql.UUID(as_uuid=True)
+# Native uuid on Postgres, CHAR(32) elsewhere (SQLite).
+UUID = sa.Uuid()
 STATUS_ENUM = sa.Enum(
     "todo",
     "in_progress",
@@ -0,0 +1,29 @@
+"""Add todo summary aggregate index.
+
+Revision ID: 0002_add_todo_summary_index
+Revises: 0001_create_todo_schema
+Create Date: 2025-01-15 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_add_todo_summary_index"
+down_revision = "0001_create_todo_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_todo_items_list_status_due",
+        "todo_items",
+        ["list_id", "status", "due_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_list_status_due", table_name="todo_items")
@@ -0,0 +1,32 @@
+"""Add partial index for open items by due date.
+
+Revision ID: 0003_add_open_due_date_index
+Revises: 0002_add_todo_summary_index
+Create Date: 2025-01-22 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_add_open_due_date_index"
+down_revision = "0002_add_todo_summary_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_todo_items_open_due_date",
+        "todo_items",
+        ["due_date", "id"],
+        postgresql_where=sa.text("status <> 'done'"),
+        sqlite_where=sa.text("status <> 'done'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_open_due_date", table_name="todo_items")
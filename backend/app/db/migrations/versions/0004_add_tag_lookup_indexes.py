@@ -0,0 +1,33 @@
+"""Add tag autocomplete and usage indexes.
+
+Revision ID: 0004_add_tag_lookup_indexes
+Revises: 0003_add_open_due_date_index
+Create Date: 2025-01-29 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_add_tag_lookup_indexes"
+down_revision = "0003_add_open_due_date_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # text_pattern_ops keeps LIKE 'abc%' indexable under any Postgres collation; SQLite has no
+    # operator classes.
+    expression = "lower(name)"
+    if op.get_context().dialect.name == "postgresql":
+        expression += " text_pattern_ops"
+    op.create_index("ix_todo_tags_name_pattern", "todo_tags", [sa.text(expression)])
+    op.create_index("ix_todo_item_tags_tag_id", "todo_item_tags", ["tag_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_item_tags_tag_id", table_name="todo_item_tags")
+    op.drop_index("ix_todo_tags_name_pattern", table_name="todo_tags")
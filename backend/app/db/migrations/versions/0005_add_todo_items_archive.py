@@ -0,0 +1,71 @@
+"""Add cold-storage table for archived todo items.
+
+Revision ID: 0005_add_todo_items_archive
+Revises: 0004_add_tag_lookup_indexes
+Create Date: 2025-02-12 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_add_todo_items_archive"
+down_revision = "0004_add_tag_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+# Native uuid on Postgres, CHAR(32) elsewhere (SQLite).
+UUID = sa.Uuid()
+STATUS_ENUM = sa.Enum(
+    "todo",
+    "in_progress",
+    "blocked",
+    "done",
+    name="todo_status",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_items_archive",
+        sa.Column("id", UUID, primary_key=True, nullable=False),
+        sa.Column(
+            "list_id", UUID, sa.ForeignKey("todo_lists.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text, nullable=True),
+        sa.Column("notes", sa.Text, nullable=True),
+        sa.Column("status", STATUS_ENUM, nullable=False),
+        sa.Column("due_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("tags", sa.JSON, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.create_index(
+        "ix_todo_items_archive_list_completed",
+        "todo_items_archive",
+        ["list_id", "completed_at", "id"],
+    )
+    op.create_index("ix_todo_items_archive_completed", "todo_items_archive", ["completed_at", "id"])
+    op.create_index(
+        "ix_todo_items_done_completed_at",
+        "todo_items",
+        ["completed_at"],
+        postgresql_where=sa.text("status = 'done'"),
+        sqlite_where=sa.text("status = 'done'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_done_completed_at", table_name="todo_items")
+    op.drop_index("ix_todo_items_archive_completed", table_name="todo_items_archive")
+    op.drop_index("ix_todo_items_archive_list_completed", table_name="todo_items_archive")
+    op.drop_table("todo_items_archive")
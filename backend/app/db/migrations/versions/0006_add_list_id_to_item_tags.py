@@ -0,0 +1,37 @@
+"""Copy the item's list_id onto todo_item_tags.
+
+Revision ID: 0006_add_list_id_to_item_tags
+Revises: 0005_add_todo_items_archive
+Create Date: 2025-02-20 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_add_list_id_to_item_tags"
+down_revision = "0005_add_todo_items_archive"
+branch_labels = None
+depends_on = None
+
+# Native uuid on Postgres, CHAR(32) elsewhere (SQLite).
+UUID = sa.Uuid()
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("todo_item_tags") as batch_op:
+        batch_op.add_column(sa.Column("list_id", UUID, nullable=True))
+    op.execute(
+        "UPDATE todo_item_tags SET list_id = "
+        "(SELECT todo_items.list_id FROM todo_items WHERE todo_items.id = todo_item_tags.item_id)"
+    )
+    with op.batch_alter_table("todo_item_tags") as batch_op:
+        batch_op.alter_column("list_id", existing_type=UUID, nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("todo_item_tags") as batch_op:
+        batch_op.drop_column("list_id")
@@ -0,0 +1,50 @@
+"""Optionally hash-partition todo_items and todo_item_tags by list_id.
+
+Only runs on Postgres when a partition count is configured, via TODO_ITEM_PARTITIONS or
+``alembic -x todo_item_partitions=N upgrade head``; otherwise the revision is a no-op and the
+plain tables stay in place. See ``app.db.partitioning`` for the resulting layout; databases already
+past this revision are converted with ``python -m app.db.partitioning``.
+
+Revision ID: 0007_partition_todo_items
+Revises: 0006_add_list_id_to_item_tags
+Create Date: 2025-02-20 00:10:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import context, op
+
+from app.core.settings import get_settings
+from app.db.partitioning import is_partitioned, partition_statements, unpartition_statements
+
+# revision identifiers, used by Alembic.
+revision = "0007_partition_todo_items"
+down_revision = "0006_add_list_id_to_item_tags"
+branch_labels = None
+depends_on = None
+
+
+def _partition_count() -> int:
+    override = context.get_x_argument(as_dictionary=True).get("todo_item_partitions")
+    return int(override) if override is not None else get_settings().todo_item_partitions
+
+
+def upgrade() -> None:
+    partitions = _partition_count()
+    if context.get_context().dialect.name != "postgresql" or partitions <= 0:
+        return
+    for statement in partition_statements(partitions):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if context.get_context().dialect.name != "postgresql":
+        return
+    if context.is_offline_mode():
+        partitioned = _partition_count() > 0
+    else:
+        partitioned = is_partitioned(op.get_bind())
+    if partitioned:
+        for statement in unpartition_statements():
+            op.execute(statement)
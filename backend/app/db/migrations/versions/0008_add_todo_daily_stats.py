@@ -0,0 +1,46 @@
+"""Add the daily completion rollup and its refresh watermark.
+
+Revision ID: 0008_add_todo_daily_stats
+Revises: 0007_partition_todo_items
+Create Date: 2025-03-05 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008_add_todo_daily_stats"
+down_revision = "0007_partition_todo_items"
+branch_labels = None
+depends_on = None
+
+# Native uuid on Postgres, CHAR(32) elsewhere (SQLite).
+UUID = sa.Uuid()
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_daily_stats",
+        sa.Column(
+            "list_id", UUID, sa.ForeignKey("todo_lists.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("created_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("completed_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("completion_histogram", sa.JSON, nullable=False),
+    )
+    op.create_table(
+        "todo_stats_watermarks",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_todo_items_created_at", "todo_items", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_created_at", table_name="todo_items")
+    op.drop_table("todo_stats_watermarks")
+    op.drop_table("todo_daily_stats")
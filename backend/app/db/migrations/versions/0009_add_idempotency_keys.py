@@ -0,0 +1,38 @@
+"""Add stored responses for idempotent writes.
+
+Revision ID: 0009_add_idempotency_keys
+Revises: 0008_add_todo_daily_stats
+Create Date: 2025-03-12 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0009_add_idempotency_keys"
+down_revision = "0008_add_todo_daily_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_idempotency_keys",
+        sa.Column("key", sa.String(length=255), primary_key=True),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("status_code", sa.Integer, nullable=False),
+        sa.Column("response_body", sa.Text, nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_todo_idempotency_keys_expires_at", "todo_idempotency_keys", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_idempotency_keys_expires_at", table_name="todo_idempotency_keys")
+    op.drop_table("todo_idempotency_keys")
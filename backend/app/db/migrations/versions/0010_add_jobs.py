@@ -0,0 +1,74 @@
+"""Add the durable background job queue.
+
+Revision ID: 0010_add_jobs
+Revises: 0009_add_idempotency_keys
+Create Date: 2025-03-19 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0010_add_jobs"
+down_revision = "0009_add_idempotency_keys"
+branch_labels = None
+depends_on = None
+
+# INTEGER PRIMARY KEY is SQLite's rowid alias, which is what autoincrements there.
+JOB_ID = sa.BigInteger().with_variant(sa.Integer(), "sqlite")
+QUEUED = sa.text("status = 'queued'")
+RUNNING = sa.text("status = 'running'")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", JOB_ID, primary_key=True, autoincrement=True),
+        sa.Column("kind", sa.String(length=100), nullable=False),
+        sa.Column("payload", sa.JSON, nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("dedupe_key", sa.String(length=255), nullable=True),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer, nullable=False),
+        sa.Column(
+            "run_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.create_index(
+        "ix_jobs_queued_run_at",
+        "jobs",
+        ["run_at", "id"],
+        postgresql_where=QUEUED,
+        sqlite_where=QUEUED,
+    )
+    op.create_index(
+        "ix_jobs_running_locked_at",
+        "jobs",
+        ["locked_at"],
+        postgresql_where=RUNNING,
+        sqlite_where=RUNNING,
+    )
+    op.create_index(
+        "ux_jobs_queued_dedupe_key",
+        "jobs",
+        ["dedupe_key"],
+        unique=True,
+        postgresql_where=QUEUED,
+        sqlite_where=QUEUED,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_jobs_queued_dedupe_key", table_name="jobs")
+    op.drop_index("ix_jobs_running_locked_at", table_name="jobs")
+    op.drop_index("ix_jobs_queued_run_at", table_name="jobs")
+    op.drop_table("jobs")
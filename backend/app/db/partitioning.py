@@ -0,0 +1,218 @@
+"""DDL for the optional hash-partitioned layout of ``todo_items`` and ``todo_item_tags``.
+
+Both tables are partitioned by ``HASH (list_id)`` with the same modulus, so an item and its tag
+links always live in partitions with the same remainder. Postgres requires unique constraints on a
+partitioned table to include the partition key, which shapes the differences from the plain
+layout:
+
+* ``todo_items`` is keyed by ``(list_id, id)``; a plain index on ``id`` serves lookups by item id,
+  which probe every partition since they carry no ``list_id``.
+* ``uq_todo_items_list_position`` already leads with ``list_id`` and is unchanged.
+* ``todo_item_tags`` is keyed by ``(list_id, item_id, tag_id)`` and references
+  ``todo_items (list_id, id)``.
+
+The statements use unqualified names and therefore act on the first schema in ``search_path``.
+Tables are rebuilt with ``CREATE TABLE ... (LIKE ...)`` and a bulk copy, which holds an exclusive
+lock on both tables for the duration; plan a maintenance window for large deployments.
+
+Migration ``0007`` applies the layout while a database is migrated past it. Databases already
+beyond that revision are converted in place, in one transaction, with
+``python -m app.db.partitioning --partitions N`` (``0`` restores the plain tables); re-running it
+with the current layout does nothing.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from app.core.settings import get_settings
+
+# (name, table, column list, partial index predicate)
+_INDEXES: tuple[tuple[str, str, str, str | None], ...] = (
+    ("ix_todo_items_list_id", "todo_items", "list_id", None),
+    ("ix_todo_items_status", "todo_items", "status", None),
+    ("ix_todo_items_list_status_due", "todo_items", "list_id, status, due_date", None),
+    ("ix_todo_items_open_due_date", "todo_items", "due_date, id", "status <> 'done'"),
+    ("ix_todo_items_done_completed_at", "todo_items", "completed_at", "status = 'done'"),
+    ("ix_todo_item_tags_tag_id", "todo_item_tags", "tag_id", None),
+)
+_PARTITIONED_ONLY_INDEXES: tuple[tuple[str, str, str, str | None], ...] = (
+    ("ix_todo_items_id", "todo_items", "id", None),
+)
+
+
+def partition_statements(partitions: int) -> list[str]:
+    """Statements converting the plain tables into ``partitions`` hash partitions each."""
+
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1")
+
+    statements: list[str] = []
+    for table in ("todo_items", "todo_item_tags"):
+        statements.append(
+            f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS) "
+            "PARTITION BY HASH (list_id)"
+        )
+        statements.extend(
+            f"CREATE TABLE {table}_p{remainder} PARTITION OF {table}_partitioned "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            for remainder in range(partitions)
+        )
+    statements.extend(_swap_statements("partitioned"))
+    statements.extend(_constraint_statements(partitioned=True))
+    statements.extend(_index_statements(partitioned=True))
+    return statements
+
+
+def unpartition_statements() -> list[str]:
+    """Statements converting the partitioned tables back into plain tables."""
+
+    statements = [
+        f"CREATE TABLE {table}_plain (LIKE {table} INCLUDING DEFAULTS)"
+        for table in ("todo_items", "todo_item_tags")
+    ]
+    statements.extend(_swap_statements("plain"))
+    statements.extend(_constraint_statements(partitioned=False))
+    statements.extend(_index_statements(partitioned=False))
+    return statements
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether ``todo_items`` in the current schema is a partitioned table."""
+
+    relkind = connection.execute(
+        text(
+            "SELECT c.relkind FROM pg_class c "
+            "WHERE c.relname = 'todo_items' AND c.relnamespace = current_schema()::regnamespace"
+        )
+    ).scalar_one_or_none()
+    return relkind == "p"
+
+
+def partition_count(connection: Connection) -> int:
+    """Number of partitions of ``todo_items`` in the current schema; 0 for the plain table."""
+
+    return connection.execute(
+        text(
+            "SELECT count(*) FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhparent "
+            "WHERE c.relname = 'todo_items' AND c.relnamespace = current_schema()::regnamespace"
+        )
+    ).scalar_one()
+
+
+def conversion_statements(connection: Connection, partitions: int) -> list[str]:
+    """Statements bringing the tables to ``partitions`` hash partitions (0: plain tables).
+
+    Empty when the tables already have that layout. Indexes created on the tables by later
+    migrations are recreated on the new tables.
+    """
+
+    if partitions < 0:
+        raise ValueError("partitions must not be negative")
+    current = partition_count(connection) if is_partitioned(connection) else 0
+    if current == partitions:
+        return []
+    statements: list[str] = []
+    if current:
+        statements.extend(unpartition_statements())
+    if partitions:
+        statements.extend(partition_statements(partitions))
+    statements.extend(_additional_index_statements(connection))
+    return statements
+
+
+def _additional_index_statements(connection: Connection) -> list[str]:
+    known = {name for name, *_ in _INDEXES + _PARTITIONED_ONLY_INDEXES} | {
+        "todo_items_pkey",
+        "uq_todo_items_list_position",
+        "todo_item_tags_pkey",
+    }
+    rows = connection.execute(
+        text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename IN ('todo_items', 'todo_item_tags')"
+        )
+    )
+    # Indexes of a partitioned table are reported as ``ON ONLY``, which would skip the partitions.
+    return [
+        definition.replace(" ON ONLY ", " ON ", 1) for name, definition in rows if name not in known
+    ]
+
+
+def _swap_statements(suffix: str) -> list[str]:
+    # Copy while the old tables still exist, then drop them (links first) and take over the names;
+    # constraints and indexes are created afterwards so their canonical names are free.
+    return [
+        f"INSERT INTO todo_items_{suffix} SELECT * FROM todo_items",
+        f"INSERT INTO todo_item_tags_{suffix} SELECT * FROM todo_item_tags",
+        "DROP TABLE todo_item_tags",
+        "DROP TABLE todo_items",
+        f"ALTER TABLE todo_items_{suffix} RENAME TO todo_items",
+        f"ALTER TABLE todo_item_tags_{suffix} RENAME TO todo_item_tags",
+    ]
+
+
+def _constraint_statements(*, partitioned: bool) -> list[str]:
+    item_key = "list_id, id" if partitioned else "id"
+    link_key = "list_id, item_id, tag_id" if partitioned else "item_id, tag_id"
+    link_item_columns = "list_id, item_id" if partitioned else "item_id"
+    return [
+        f"ALTER TABLE todo_items ADD CONSTRAINT todo_items_pkey PRIMARY KEY ({item_key})",
+        "ALTER TABLE todo_items ADD CONSTRAINT uq_todo_items_list_position UNIQUE (list_id, position)",
+        "ALTER TABLE todo_items ADD CONSTRAINT todo_items_list_id_fkey "
+        "FOREIGN KEY (list_id) REFERENCES todo_lists (id) ON DELETE CASCADE",
+        f"ALTER TABLE todo_item_tags ADD CONSTRAINT todo_item_tags_pkey PRIMARY KEY ({link_key})",
+        "ALTER TABLE todo_item_tags ADD CONSTRAINT todo_item_tags_item_id_fkey "
+        f"FOREIGN KEY ({link_item_columns}) REFERENCES todo_items ({item_key}) ON DELETE CASCADE",
+        "ALTER TABLE todo_item_tags ADD CONSTRAINT todo_item_tags_tag_id_fkey "
+        "FOREIGN KEY (tag_id) REFERENCES todo_tags (id) ON DELETE CASCADE",
+    ]
+
+
+def _index_statements(*, partitioned: bool) -> list[str]:
+    indexes = _INDEXES + (_PARTITIONED_ONLY_INDEXES if partitioned else ())
+    statements = []
+    for name, table, columns, where in indexes:
+        statement = f"CREATE INDEX {name} ON {table} ({columns})"
+        if where is not None:
+            statement += f" WHERE {where}"
+        statements.append(statement)
+    return statements
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert todo_items and todo_item_tags to hash partitions by list_id in place."
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        help="Partition count, 0 for plain tables (default TODO_ITEM_PARTITIONS)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Print the statements only")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    partitions = args.partitions if args.partitions is not None else settings.todo_item_partitions
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    if engine.dialect.name != "postgresql":
+        parser.exit(1, "Partitioning needs Postgres.\n")
+    try:
+        with engine.begin() as connection:
+            statements = conversion_statements(connection, partitions)
+            for statement in statements:
+                print(f"{statement};")
+                if not args.dry_run:
+                    connection.exec_driver_sql(statement)
+    finally:
+        engine.dispose()
+    if not statements:
+        print(f"todo_items already has {partitions or 'no'} partitions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Middleware and instrumentation wired into the application in `app.main`."""
+
+from .admission import AdmissionControlMiddleware
+from .middleware import RequestContextMiddleware
+from .profiling import ProfilingMiddleware
+
+__all__ = ["AdmissionControlMiddleware", "ProfilingMiddleware", "RequestContextMiddleware"]
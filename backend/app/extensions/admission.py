@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import MetricsRegistry
+from app.core.metrics import metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class _Budget:
+    name: str
+    limit: int
+    max_queue: int
+    in_flight: int = 0
+    waiting: int = 0
+    semaphore: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(self.limit)
+
+
+class AdmissionControlMiddleware:
+    """Cap concurrent reads and writes separately and shed load once the wait queue is full.
+
+    Requests beyond a budget's concurrency limit wait in a bounded queue for up to
+    ``queue_timeout`` seconds. When the queue is full, or the wait times out, the request is
+    rejected immediately with 503 and ``Retry-After`` so admitted requests keep their latency.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        read_limit: int,
+        write_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int = 1,
+        exempt_paths: Iterable[str] = (),
+        registry: MetricsRegistry = default_metrics,
+    ) -> None:
+        self.app = app
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.exempt_paths = frozenset(exempt_paths)
+        self.registry = registry
+        self._budgets = {
+            "read": _Budget("read", read_limit, max_queue),
+            "write": _Budget("write", write_limit, max_queue),
+        }
+        for budget in self._budgets.values():
+            registry.register_gauge(
+                "admission_in_flight", lambda budget=budget: budget.in_flight, budget=budget.name
+            )
+            registry.register_gauge(
+                "admission_queue_depth", lambda budget=budget: budget.waiting, budget=budget.name
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        budget = self._budgets["read" if scope["method"] in READ_METHODS else "write"]
+
+        if budget.semaphore.locked() and budget.waiting >= budget.max_queue:
+            await self._shed(budget, "queue_full", scope, receive, send)
+            return
+
+        budget.waiting += 1
+        try:
+            await asyncio.wait_for(budget.semaphore.acquire(), timeout=self.queue_timeout)
+        except TimeoutError:
+            await self._shed(budget, "queue_timeout", scope, receive, send)
+            return
+        finally:
+            budget.waiting -= 1
+
+        budget.in_flight += 1
+        self.registry.increment("admission_admitted_total", budget=budget.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            budget.in_flight -= 1
+            budget.semaphore.release()
+
+    async def _shed(
+        self, budget: _Budget, reason: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        self.registry.increment("admission_shed_total", budget=budget.name, reason=reason)
+        logger.warning(
+            "Shedding request",
+            extra={"budget": budget.name, "reason": reason, "path": scope["path"]},
+        )
+        response = JSONResponse(
+            {"detail": "Server is busy, retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import cProfile
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database import track_queries
+from app.core.logging import get_request_id
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class ProfilingMiddleware:
+    """Run selected requests under cProfile and dump the stats alongside route and SQL timings.
+
+    A request is profiled when it carries ``X-Profile: <token>`` matching the configured token, or
+    when it is picked by the sample rate. cProfile observes every thread on Python 3.12+, so only
+    one request is profiled at a time; others proceed unprofiled while a dump is in progress.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        output_dir: str | Path,
+        token: str | None = None,
+        sample_rate: float = 0.0,
+    ) -> None:
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.token = token
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._lock.release()
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            supplied = Headers(scope=scope).get(PROFILE_HEADER)
+            if supplied is not None and hmac.compare_digest(supplied, self.token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_id = get_request_id()
+        profile_id = f"{datetime.now(tz=UTC):%Y%m%dT%H%M%S%f}-{request_id or 'anonymous'}"
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with track_queries() as query_stats:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+                duration = time.perf_counter() - started
+
+        route = scope.get("route")
+        annotation = {
+            "profile_id": profile_id,
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "sql_ms": round(query_stats.duration * 1000, 2),
+            "sql_statements": query_stats.count,
+        }
+        await anyio.to_thread.run_sync(self._write_artifacts, profiler, annotation)
+        logger.info("Wrote request profile %s", profile_id, extra=annotation)
+
+    def _write_artifacts(self, profiler: cProfile.Profile, annotation: dict[str, object]) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.output_dir / str(annotation["profile_id"])
+        profiler.dump_stats(stem.with_suffix(".prof"))
+        stem.with_suffix(".json").write_text(json.dumps(annotation, indent=2))
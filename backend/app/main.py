@@ -1,28 +1,104 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from app.api import api_router
+from app.core.database import dispose_engine, get_engine, get_read_engine
 from app.core.logging import configure_logging
-from app.core.settings import get_settings
+from app.core.periodic import PeriodicTask
+from app.core.settings import Settings, get_settings
+from app.core.warmup import warm_up
+from app.extensions import (
+    AdmissionControlMiddleware,
+    ProfilingMiddleware,
+    RequestContextMiddleware,
+)
+from app.modules import load_job_handlers
+from app.modules.jobs.worker import JobWorker
 
-settings = get_settings()
-configure_logging(settings)
 
-app = FastAPI(title=settings.project_name, version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Startup side effects live here rather than at import time: importing the app only builds
+    # the route table, so tooling and tests that never serve requests do not pay for them.
+    settings: Settings = app.state.settings
+    configure_logging(settings)
+    app.state.ready = False
+    engine = get_engine()
+    # Requests mostly read; with SQLite the writer is a single connection opened on first write.
+    await run_in_threadpool(
+        warm_up, app, get_read_engine(), connections=settings.warmup_connections
+    )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    # Maintenance, scheduled runs included, goes through the job queue. Unless a separate
+    # ``python -m app.worker`` runs it, each API worker polls the queue.
+    job_worker: JobWorker | None = None
+    job_task: PeriodicTask | None = None
+    if settings.job_run_in_app:
+        load_job_handlers()
+        job_worker = JobWorker.from_settings(engine, settings)
+        job_task = PeriodicTask("jobs", job_worker.drain, interval=settings.job_poll_interval)
+        job_task.start()
+
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        if job_task is not None:
+            await job_task.stop()
+        if job_worker is not None:
+            await run_in_threadpool(job_worker.close)
+        await run_in_threadpool(dispose_engine)
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    settings = settings or get_settings()
+    app = FastAPI(title=settings.project_name, version="1.0.0", lifespan=lifespan)
+    app.state.settings = settings
+    app.state.ready = False
+
+    # Middleware added later wraps earlier ones: request context is outermost, then CORS (so shed
+    # responses still carry CORS headers), then admission control, then the optional profiler.
+    if settings.profiling_enabled:
+        app.add_middleware(
+            ProfilingMiddleware,
+            output_dir=settings.profiling_dir,
+            token=settings.profiling_token,
+            sample_rate=settings.profiling_sample_rate,
+        )
+    if settings.admission_enabled:
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            read_limit=settings.admission_read_limit,
+            write_limit=settings.admission_write_limit,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout,
+            retry_after=settings.admission_retry_after,
+            exempt_paths={f"{settings.api_prefix}/healthz", f"{settings.api_prefix}/readyz"},
+        )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[settings.request_id_header, "X-Profile-Id", "Idempotent-Replayed"],
+    )
+    app.add_middleware(RequestContextMiddleware, header_name=settings.request_id_header)
+
+    app.include_router(api_router)
+
+    @app.get("/")
+    async def root() -> dict[str, str]:  # pragma: no cover - simple smoke endpoint
+        return {"status": "ok", "service": settings.project_name}
 
-app.include_router(api_router)
+    return app
 
 
-@app.get("/")
-async def root() -> dict[str, str]:  # pragma: no cover - simple smoke endpoint
-    return {"status": "ok", "service": settings.project_name}
+app = create_app()
@@ -5,7 +5,14 @@ def load_all_modules() -> None:
     """Import modules with SQLModel metadata to register tables."""
 
     # Import domain modules to ensure SQLModel metadata is attached
+    from app.modules.jobs import models as job_models  # noqa: F401
     from app.modules.todos import models as todo_models  # noqa: F401
 
 
-__all__ = ["load_all_modules"]
+def load_job_handlers() -> None:
+    """Import the modules that register background job handlers."""
+
+    from app.modules.todos import jobs as todo_jobs  # noqa: F401
+
+
+__all__ = ["load_all_modules", "load_job_handlers"]
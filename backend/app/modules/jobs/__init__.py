@@ -0,0 +1,3 @@
+"""Durable background jobs: a database-backed queue and the handlers registered for it."""
+
+__all__: list[str] = []
@@ -0,0 +1,69 @@
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Index, Integer, String, Text, func, text
+from sqlmodel import Field, SQLModel
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    failed = "failed"
+
+
+# Finished jobs are deleted, so the table only holds pending, in-flight and dead jobs.
+class Job(SQLModel, table=True):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claims scan runnable jobs in run_at order; only queued rows are indexed.
+        Index(
+            "ix_jobs_queued_run_at",
+            "run_at",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+        Index(
+            "ix_jobs_running_locked_at",
+            "locked_at",
+            postgresql_where=text("status = 'running'"),
+            sqlite_where=text("status = 'running'"),
+        ),
+        # At most one queued job per dedupe key; enqueueing a duplicate is a no-op.
+        Index(
+            "ux_jobs_queued_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+    )
+
+    # INTEGER PRIMARY KEY is SQLite's rowid alias, which is what autoincrements there.
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True),
+    )
+    kind: str = Field(sa_column=Column(String(100), nullable=False))
+    payload: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    status: JobStatus = Field(
+        default=JobStatus.queued,
+        sa_column=Column(String(20), nullable=False, server_default=JobStatus.queued.value),
+    )
+    dedupe_key: Optional[str] = Field(default=None, sa_column=Column(String(255), nullable=True))
+    attempts: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    max_attempts: int = Field(sa_column=Column(Integer, nullable=False))
+    run_at: datetime = Field(
+        default_factory=lambda: datetime.now(tz=UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now()),
+    )
+    locked_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    locked_by: Optional[str] = Field(default=None, sa_column=Column(String(100), nullable=True))
+    last_error: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(tz=UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now()),
+    )
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlmodel import Session
+
+from app.api.dependencies import get_db_session, require_admin
+
+from . import service
+from .schemas import JobQueueStatsRead
+
+router = APIRouter(prefix="/admin", tags=["jobs"], dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/jobs",
+    response_model=list[JobQueueStatsRead],
+    summary="Queued, running and failed jobs per kind",
+)
+def job_queue_stats(session: Session = Depends(get_db_session)) -> list[JobQueueStatsRead]:
+    return [
+        JobQueueStatsRead(
+            kind=entry.kind,
+            status=entry.status,
+            count=entry.count,
+            oldest_run_at=entry.oldest_run_at,
+        )
+        for entry in service.queue_stats(session)
+    ]
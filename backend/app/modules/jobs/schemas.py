@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class JobQueueStatsRead(BaseModel):
+    kind: str
+    status: str
+    count: int
+    oldest_run_at: datetime | None
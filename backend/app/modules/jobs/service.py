@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session
+
+from app.core.settings import Settings, get_settings
+
+from .models import Job, JobStatus
+
+JobHandler = Callable[[Engine | Connection, dict[str, Any]], object]
+
+_handlers: dict[str, JobHandler] = {}
+_schedules: dict[str, Callable[[Settings], float]] = {}
+
+
+def job_handler(
+    kind: str, *, every: Callable[[Settings], float] | None = None
+) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated function as the handler of jobs of ``kind``.
+
+    Handlers get the worker's engine and the job payload, run outside the enqueuing request and
+    may run more than once (retries, a worker lost mid-job), so they must be idempotent. With
+    ``every``, workers also queue the job themselves every ``every(settings)`` seconds (``0``
+    disables the schedule).
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        if every is not None:
+            _schedules[kind] = every
+        return handler
+
+    return register
+
+
+def get_handler(kind: str) -> JobHandler | None:
+    return _handlers.get(kind)
+
+
+def recurring_jobs(settings: Settings) -> dict[str, float]:
+    """Interval in seconds of every enabled recurring job kind."""
+
+    intervals = {kind: every(settings) for kind, every in _schedules.items()}
+    return {kind: interval for kind, interval in intervals.items() if interval > 0}
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+@dataclass
+class QueueStats:
+    kind: str
+    status: str
+    count: int
+    oldest_run_at: datetime | None
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    dedupe_key: str | None = None,
+    delay: timedelta | None = None,
+    max_attempts: int | None = None,
+) -> None:
+    """Add a job to the session's transaction; workers see it once the caller commits.
+
+    With ``dedupe_key`` the job is dropped when a job with that key is already queued, so a
+    burst of writes asking for the same maintenance produces a single run.
+    """
+
+    values = {
+        "kind": kind,
+        "payload": payload or {},
+        "status": JobStatus.queued.value,
+        "dedupe_key": dedupe_key,
+        "attempts": 0,
+        "max_attempts": max_attempts or get_settings().job_max_attempts,
+        "run_at": datetime.now(tz=UTC) + (delay or timedelta(0)),
+    }
+    dialect = session.get_bind().dialect.name
+    if dedupe_key is not None and dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = (
+            dialect_insert(Job)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[Job.dedupe_key],
+                index_where=Job.status == JobStatus.queued.value,
+            )
+        )
+    else:
+        statement = insert(Job).values(**values)
+    session.execute(statement)
+
+
+def enqueue_recurring(session: Session, kind: str, *, interval: float) -> None:
+    """Queue the next run of the recurring job ``kind`` unless one is already queued or running.
+
+    Runs are due at multiples of ``interval`` since the epoch, so every worker scheduling the same
+    kind agrees on the next slot and the job runs at most once per slot however many workers
+    there are.
+    """
+
+    pending = session.execute(
+        select(
+            exists().where(
+                Job.kind == kind,
+                Job.status.in_([JobStatus.queued.value, JobStatus.running.value]),
+            )
+        )
+    ).scalar_one()
+    if pending:
+        return
+    now = datetime.now(tz=UTC)
+    next_slot = (now.timestamp() // interval + 1) * interval
+    delay = datetime.fromtimestamp(next_slot, tz=UTC) - now
+    enqueue(session, kind, dedupe_key=kind, delay=delay)
+
+
+def claim_jobs(session: Session, *, worker_id: str, limit: int) -> list[ClaimedJob]:
+    """Mark up to ``limit`` due jobs as running for ``worker_id`` and commit.
+
+    ``FOR UPDATE SKIP LOCKED`` lets concurrent workers claim disjoint batches without waiting on
+    each other (SQLite serializes writers instead and ignores the clause).
+    """
+
+    now = datetime.now(tz=UTC)
+    due = (
+        select(Job.id)
+        .where(Job.status == JobStatus.queued.value, Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(Job)
+        .where(Job.id.in_(due.scalar_subquery()))
+        .values(
+            status=JobStatus.running.value,
+            attempts=Job.attempts + 1,
+            locked_at=now,
+            locked_by=worker_id,
+            # A claimed job no longer stands in for new requests of the same work.
+            dedupe_key=None,
+        )
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+    )
+    claimed = [ClaimedJob(*row) for row in session.execute(statement)]
+    session.commit()
+    return sorted(claimed, key=lambda job: job.id)
+
+
+def _held_by(job_id: int, worker_id: str) -> tuple:
+    # A job whose lease expired may have been claimed again; only its current holder may settle it.
+    return (Job.id == job_id, Job.status == JobStatus.running.value, Job.locked_by == worker_id)
+
+
+def renew_leases(session: Session, job_ids: list[int], *, worker_id: str) -> int:
+    """Extend the leases of the running jobs ``job_ids`` held by ``worker_id`` and commit."""
+
+    if not job_ids:
+        return 0
+    result = session.execute(
+        update(Job)
+        .where(
+            Job.id.in_(job_ids),
+            Job.status == JobStatus.running.value,
+            Job.locked_by == worker_id,
+        )
+        .values(locked_at=datetime.now(tz=UTC))
+    )
+    session.commit()
+    return result.rowcount
+
+
+def complete_job(session: Session, job_id: int, *, worker_id: str) -> bool:
+    """Delete a finished job; False if ``worker_id`` no longer holds it."""
+
+    result = session.execute(delete(Job).where(*_held_by(job_id, worker_id)))
+    session.commit()
+    return result.rowcount == 1
+
+
+def fail_job(
+    session: Session,
+    job: ClaimedJob,
+    error: str,
+    *,
+    worker_id: str,
+    backoff: float,
+    backoff_max: float,
+) -> bool | None:
+    """Schedule a retry of ``job`` after an exponential backoff, or bury it.
+
+    Returns whether the job was retried, or None if ``worker_id`` no longer holds it.
+    """
+
+    retry = job.attempts < job.max_attempts
+    values: dict[str, Any] = {"last_error": error, "locked_at": None, "locked_by": None}
+    if retry:
+        delay = retry_delay(job.attempts, base=backoff, cap=backoff_max)
+        values.update(
+            status=JobStatus.queued.value,
+            run_at=datetime.now(tz=UTC) + timedelta(seconds=delay),
+        )
+    else:
+        values.update(status=JobStatus.failed.value)
+    result = session.execute(update(Job).where(*_held_by(job.id, worker_id)).values(**values))
+    session.commit()
+    return retry if result.rowcount == 1 else None
+
+
+def retry_delay(attempts: int, *, base: float, cap: float) -> float:
+    """Exponential backoff with jitter: half the delay is fixed, the other half random."""
+
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def requeue_stale_jobs(session: Session, *, lease_timeout: timedelta) -> int:
+    """Return jobs whose worker stopped reporting back within ``lease_timeout`` to the queue.
+
+    The lost run counts as an attempt; jobs out of attempts are buried instead.
+    """
+
+    cutoff = datetime.now(tz=UTC) - lease_timeout
+    stale = (
+        Job.status == JobStatus.running.value,
+        Job.locked_at < cutoff,
+    )
+    error = "Lease expired before the job reported back"
+    buried = session.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.failed.value, last_error=error, locked_at=None, locked_by=None)
+    ).rowcount
+    requeued = session.execute(
+        update(Job)
+        .where(*stale)
+        .values(status=JobStatus.queued.value, last_error=error, locked_at=None, locked_by=None)
+    ).rowcount
+    session.commit()
+    return buried + requeued
+
+
+def queue_stats(session: Session) -> list[QueueStats]:
+    """Job counts per kind and status with the oldest ``run_at`` of each group."""
+
+    statement = (
+        select(Job.kind, Job.status, func.count(), func.min(Job.run_at))
+        .group_by(Job.kind, Job.status)
+        .order_by(Job.kind, Job.status)
+    )
+    return [
+        QueueStats(kind=kind, status=status, count=count, oldest_run_at=oldest)
+        for kind, status, count, oldest in session.execute(statement)
+    ]
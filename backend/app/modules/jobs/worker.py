@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.core.metrics import metrics
+from app.core.settings import Settings
+
+from . import service
+from .service import ClaimedJob
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claim due jobs from the jobs table and run them on a thread pool.
+
+    Each claim takes at most as many jobs as there are idle threads, so jobs are never held by a
+    worker that cannot start them yet. Leases of running jobs are renewed every third of the lease
+    timeout, so only jobs of a worker that stopped polling are re-queued. ``schedules`` maps
+    recurring job kinds to their interval in seconds; the worker queues their next runs. Results are recorded in
+    their own transactions: success deletes the job, failure schedules a retry with backoff or
+    leaves it ``failed``.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        concurrency: int,
+        batch_size: int,
+        poll_interval: float,
+        lease_timeout: float,
+        backoff: float,
+        backoff_max: float,
+        schedules: dict[str, float] | None = None,
+    ) -> None:
+        self.engine = engine
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.schedules = schedules or {}
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+        self._running: dict[Future[None], ClaimedJob] = {}
+        self._lock = threading.Lock()
+        self._last_requeue = 0.0
+        self._last_renewal = time.monotonic()
+        self._last_scheduled: dict[str, float] = {}
+        metrics.register_gauge("jobs_in_flight", lambda: len(self._running))
+
+    @classmethod
+    def from_settings(cls, engine: Engine, settings: Settings) -> JobWorker:
+        return cls(
+            engine,
+            concurrency=settings.job_concurrency,
+            batch_size=settings.job_claim_batch_size,
+            poll_interval=settings.job_poll_interval,
+            lease_timeout=settings.job_lease_timeout,
+            backoff=settings.job_retry_backoff,
+            backoff_max=settings.job_retry_backoff_max,
+            schedules=service.recurring_jobs(settings),
+        )
+
+    def poll(self) -> int:
+        """Start as many due jobs as there are idle threads; return how many were started."""
+
+        self._requeue_stale_jobs()
+        self._renew_leases()
+        self._enqueue_recurring_jobs()
+        with self._lock:
+            idle = self.concurrency - len(self._running)
+        if idle <= 0:
+            return 0
+        with Session(self.engine) as session:
+            jobs = service.claim_jobs(
+                session, worker_id=self.worker_id, limit=min(idle, self.batch_size)
+            )
+        for job in jobs:
+            metrics.increment("jobs_claimed_total", kind=job.kind)
+            future = self._executor.submit(self._execute, job)
+            with self._lock:
+                self._running[future] = job
+            future.add_done_callback(self._forget)
+        return len(jobs)
+
+    def drain(self) -> None:
+        """Run due jobs until none are left; used by the in-app runner and in tests."""
+
+        while True:
+            started = self.poll()
+            if started == 0 and not self._running:
+                return
+            self._wait_for_a_slot()
+
+    def run(self, stop: threading.Event) -> None:
+        """Poll until ``stop`` is set, then let the running jobs finish."""
+
+        logger.info(
+            "Job worker started",
+            extra={"worker_id": self.worker_id, "concurrency": self.concurrency},
+        )
+        while not stop.is_set():
+            try:
+                started = self.poll()
+            except Exception:
+                logger.exception("Claiming jobs failed")
+                metrics.increment("job_poll_failures_total")
+                started = 0
+            if started == 0 and len(self._running) < self.concurrency:
+                stop.wait(self.poll_interval)
+            else:
+                self._wait_for_a_slot()
+        self.close()
+        logger.info("Job worker stopped", extra={"worker_id": self.worker_id})
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _wait_for_a_slot(self) -> None:
+        with self._lock:
+            running = set(self._running)
+        if running:
+            wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+
+    def _forget(self, future: Future[None]) -> None:
+        with self._lock:
+            self._running.pop(future, None)
+        if future.exception() is not None:
+            # Recording the outcome failed; the job is retried once its lease expires.
+            logger.error("Recording a job result failed", exc_info=future.exception())
+
+    def _renew_leases(self) -> None:
+        now = time.monotonic()
+        if now - self._last_renewal < self.lease_timeout / 3:
+            return
+        self._last_renewal = now
+        with self._lock:
+            job_ids = [job.id for job in self._running.values()]
+        with Session(self.engine) as session:
+            service.renew_leases(session, job_ids, worker_id=self.worker_id)
+
+    def _enqueue_recurring_jobs(self) -> None:
+        now = time.monotonic()
+        due = [
+            (kind, interval)
+            for kind, interval in self.schedules.items()
+            # Checking twice per interval queues the next run soon after the previous one ends.
+            if now - self._last_scheduled.get(kind, -interval) >= interval / 2
+        ]
+        if not due:
+            return
+        with Session(self.engine) as session:
+            for kind, interval in due:
+                service.enqueue_recurring(session, kind, interval=interval)
+                self._last_scheduled[kind] = now
+            session.commit()
+
+    def _requeue_stale_jobs(self) -> None:
+        now = time.monotonic()
+        if now - self._last_requeue < self.lease_timeout / 2:
+            return
+        self._last_requeue = now
+        with Session(self.engine) as session:
+            requeued = service.requeue_stale_jobs(
+                session, lease_timeout=timedelta(seconds=self.lease_timeout)
+            )
+        if requeued:
+            logger.warning("Re-queued jobs with expired leases", extra={"jobs": requeued})
+            metrics.increment("jobs_lease_expired_total", requeued)
+
+    def _execute(self, job: ClaimedJob) -> None:
+        started = time.perf_counter()
+        try:
+            handler = service.get_handler(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            handler(self.engine, job.payload)
+        except Exception as error:
+            self._record_failure(job, error)
+        else:
+            with Session(self.engine) as session:
+                held = service.complete_job(session, job.id, worker_id=self.worker_id)
+            if held:
+                metrics.increment("jobs_completed_total", kind=job.kind)
+            else:
+                self._lease_lost(job)
+        finally:
+            metrics.increment("job_run_seconds_total", time.perf_counter() - started, kind=job.kind)
+
+    def _record_failure(self, job: ClaimedJob, error: Exception) -> None:
+        with Session(self.engine) as session:
+            retried = service.fail_job(
+                session,
+                job,
+                f"{type(error).__name__}: {error}",
+                worker_id=self.worker_id,
+                backoff=self.backoff,
+                backoff_max=self.backoff_max,
+            )
+        if retried is None:
+            self._lease_lost(job)
+            return
+        logger.warning(
+            "Job failed",
+            exc_info=error,
+            extra={
+                "job_id": job.id,
+                "job_kind": job.kind,
+                "attempt": job.attempts,
+                "retrying": retried,
+            },
+        )
+        metrics.increment("jobs_retried_total" if retried else "jobs_failed_total", kind=job.kind)
+
+    def _lease_lost(self, job: ClaimedJob) -> None:
+        # The job was re-queued while it ran; whoever holds it now records the outcome.
+        logger.warning(
+            "Job lease was lost before it finished",
+            extra={"job_id": job.id, "job_kind": job.kind},
+        )
+        metrics.increment("jobs_lease_lost_total", kind=job.kind)
@@ -1,12 +1,73 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request, Response, status
+from starlette.concurrency import run_in_threadpool
 
-from .schemas import HealthCheck
+from app.api.dependencies import get_settings_dependency, require_admin
+from app.core import database
+from app.core.metrics import metrics
+from app.core.settings import Settings
+
+from . import service
+from .schemas import HealthCheck, ReadinessCheck, SlowQueryRead
 
 router = APIRouter(tags=["system"])
 
 
 @router.get("/healthz", response_model=HealthCheck, summary="Service health check")
-async def healthz() -> HealthCheck:
+async def healthz(request: Request, response: Response) -> HealthCheck:
+    # Only report healthy once the lifespan warm-up has finished.
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return HealthCheck(status="starting")
     return HealthCheck()
+
+
+@router.get("/readyz", response_model=ReadinessCheck, summary="Deep readiness probe")
+async def readyz(
+    request: Request,
+    response: Response,
+    settings: Settings = Depends(get_settings_dependency),
+) -> ReadinessCheck:
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessCheck(status="starting")
+
+    def run_checks() -> service.ReadinessReport:
+        return service.check_readiness(
+            # The pool requests draw from; SQLite's single writer connection is exempt.
+            database.get_read_engine(),
+            expected_heads=service.migration_heads(),
+            pool_capacity=settings.database_pool_size + settings.database_max_overflow,
+            pool_saturation_threshold=settings.readiness_pool_saturation,
+        )
+
+    report = await run_in_threadpool(service.readiness_checks.do, "readiness", run_checks)
+    if not report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessCheck(
+        status="ready" if report.ready else "not_ready",
+        checked_at=report.checked_at,
+        duration_ms=report.duration_ms,
+        checks=report.checks,
+    )
+
+
+@router.get(
+    "/admin/slow-queries",
+    response_model=list[SlowQueryRead],
+    summary="Recent slow queries with sampled plans",
+    dependencies=[Depends(require_admin)],
+)
+async def slow_queries() -> list[SlowQueryRead]:
+    return [SlowQueryRead(**entry) for entry in database.get_slow_query_log().recent()]
+
+
+@router.get(
+    "/admin/metrics",
+    response_model=dict[str, float],
+    summary="In-process counters and gauges",
+    dependencies=[Depends(require_admin)],
+)
+async def metrics_snapshot() -> dict[str, float]:
+    return metrics.snapshot()
@@ -1,9 +1,27 @@
 from __future__ import annotations
 
-from typing import Literal
+from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
 
 class HealthCheck(BaseModel):
-    status: Literal["ok"] = "ok"
+    status: Literal["ok", "starting"] = "ok"
+
+
+class ReadinessCheck(BaseModel):
+    status: Literal["ready", "not_ready", "starting"]
+    checked_at: datetime | None = None
+    duration_ms: float = 0.0
+    checks: dict[str, dict[str, Any]] = {}
+
+
+class SlowQueryRead(BaseModel):
+    recorded_at: datetime
+    statement: str
+    parameters: Any
+    duration_ms: float
+    route: str | None
+    request_id: str | None
+    plan: str | None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.settings import get_settings
+from app.core.singleflight import SingleFlight
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "db" / "migrations"
+
+# Orchestrators probe often; concurrent and back-to-back probes share one check.
+readiness_checks = SingleFlight(ttl=get_settings().readiness_cache_ttl, max_entries=1)
+
+
+@dataclass
+class ReadinessReport:
+    ready: bool
+    checked_at: datetime
+    checks: dict[str, dict[str, Any]] = field(default_factory=dict)
+    duration_ms: float = 0.0
+
+
+@cache
+def migration_heads() -> frozenset[str]:
+    from alembic.script import ScriptDirectory  # deferred: alembic is only needed by the probe
+
+    return frozenset(ScriptDirectory(str(MIGRATIONS_DIR)).get_heads())
+
+
+def check_readiness(
+    engine: Engine,
+    *,
+    expected_heads: frozenset[str],
+    pool_capacity: int,
+    pool_saturation_threshold: float,
+) -> ReadinessReport:
+    """Probe database connectivity, schema revision and pool headroom."""
+
+    started = time.perf_counter()
+    checks: dict[str, dict[str, Any]] = {}
+
+    try:
+        with engine.connect() as connection:
+            query_started = time.perf_counter()
+            connection.execute(text("SELECT 1"))
+            checks["database"] = {
+                "status": "ok",
+                "latency_ms": _elapsed_ms(query_started),
+            }
+
+            revision_started = time.perf_counter()
+            current = {
+                row[0]
+                for row in connection.execute(text("SELECT version_num FROM alembic_version"))
+            }
+            checks["migrations"] = {
+                "status": "ok" if current == expected_heads else "error",
+                "current": sorted(current),
+                "head": sorted(expected_heads),
+                "latency_ms": _elapsed_ms(revision_started),
+            }
+    except Exception as error:
+        checks.setdefault("database", {"status": "error", "error": type(error).__name__})
+        checks.setdefault(
+            "migrations",
+            {"status": "error", "error": type(error).__name__, "head": sorted(expected_heads)},
+        )
+
+    checks["pool"] = _pool_check(engine, pool_capacity, pool_saturation_threshold)
+
+    return ReadinessReport(
+        ready=all(check["status"] == "ok" for check in checks.values()),
+        checked_at=datetime.now(tz=UTC),
+        checks=checks,
+        duration_ms=_elapsed_ms(started),
+    )
+
+
+def _pool_check(engine: Engine, capacity: int, threshold: float) -> dict[str, Any]:
+    pool = engine.pool
+    checked_out = getattr(pool, "checkedout", None)
+    if checked_out is None:
+        return {"status": "ok", "checked_out": None, "capacity": None, "saturation": None}
+
+    in_use = checked_out()
+    saturation = in_use / capacity if capacity else 0.0
+    return {
+        "status": "ok" if saturation < threshold else "error",
+        "checked_out": in_use,
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
@@ -0,0 +1,122 @@
+"""Response caching and read coalescing for the todo read endpoints.
+
+Cache keys embed version counters held by the cache backend. Mutations bump the affected versions
+after commit, which retires every cached body built from the previous state at once; stale entries
+simply age out of the backend.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from uuid import UUID
+
+from app.core.cache import CacheBackend, build_cache_backend, resolve_read_coalescing_ttl
+from app.core.metrics import metrics
+from app.core.settings import get_settings
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_settings = get_settings()
+
+LISTS_VERSION_KEY = "todo:lists:version"
+
+# Built on first use so importing the router does not load (or connect) an optional client.
+backend: CacheBackend | None = None
+_backend_lock = threading.Lock()
+read_flight = SingleFlight(
+    ttl=resolve_read_coalescing_ttl(_settings),
+    max_entries=_settings.read_coalescing_max_entries,
+)
+
+
+def get_backend() -> CacheBackend:
+    global backend
+    if backend is None:
+        with _backend_lock:
+            if backend is None:
+                backend = build_cache_backend(_settings)
+    return backend
+
+
+def summaries_key() -> str:
+    return f"todo:lists:v{get_backend().get_version(LISTS_VERSION_KEY)}"
+
+
+def detail_key(list_id: UUID, *, include_items: bool) -> str:
+    version = get_backend().get_version(_list_version_key(list_id))
+    return f"todo:list:{list_id}:v{version}:items={int(include_items)}"
+
+
+def cached_response(
+    namespace: str,
+    build_key: Callable[[], str],
+    load: Callable[[], bytes],
+) -> bytes:
+    """Serve the body from the cache, or coalesce concurrent misses into one ``load`` call.
+
+    If the backend cannot provide the current versions the cache is bypassed entirely, since a
+    key built from a stale version could serve pre-mutation data.
+    """
+
+    try:
+        key = build_key()
+    except Exception:
+        logger.warning("Cache version lookup failed; bypassing cache", exc_info=True)
+        metrics.increment("cache_errors_total", operation="get_version")
+        return load()
+
+    def read_through() -> bytes:
+        body = _safe_get(key)
+        if body is not None:
+            metrics.increment("cache_requests_total", cache=namespace, result="hit")
+            return body
+        metrics.increment("cache_requests_total", cache=namespace, result="miss")
+        body = load()
+        _safe_set(key, body)
+        return body
+
+    return read_flight.do(key, read_through)
+
+
+def invalidate_list(list_id: UUID) -> None:
+    """Retire cached reads of a list and of the list index; call after commit."""
+
+    _bump(_list_version_key(list_id), LISTS_VERSION_KEY)
+
+
+def invalidate_lists() -> None:
+    """Retire cached reads of the list index; call after commit."""
+
+    _bump(LISTS_VERSION_KEY)
+
+
+def _list_version_key(list_id: UUID) -> str:
+    return f"todo:list:{list_id}:version"
+
+
+def _bump(*keys: str) -> None:
+    try:
+        get_backend().bump_versions(*keys)
+    except Exception:
+        logger.error("Cache invalidation failed for %s", keys, exc_info=True)
+        metrics.increment("cache_errors_total", operation="bump_versions")
+
+
+def _safe_get(key: str) -> bytes | None:
+    try:
+        return get_backend().get(key)
+    except Exception:
+        logger.warning("Cache read failed", exc_info=True)
+        metrics.increment("cache_errors_total", operation="get")
+        return None
+
+
+def _safe_set(key: str, body: bytes) -> None:
+    try:
+        get_backend().set(key, body, _settings.cache_ttl)
+    except Exception:
+        logger.warning("Cache write failed", exc_info=True)
+        metrics.increment("cache_errors_total", operation="set")
@@ -0,0 +1,50 @@
+"""Handlers for the background jobs of the todo module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.settings import get_settings
+from app.modules.jobs.service import job_handler
+
+from . import service
+
+
+@job_handler(service.TAG_COLLECTION_JOB)
+def collect_orphan_tags(bind: Engine | Connection, payload: dict[str, Any]) -> None:
+    service.collect_orphan_tags(bind, batch_size=get_settings().tag_gc_batch_size)
+
+
+@job_handler(service.STATS_REFRESH_JOB, every=lambda settings: settings.stats_refresh_interval)
+def refresh_daily_stats(bind: Engine | Connection, payload: dict[str, Any]) -> None:
+    settings = get_settings()
+    service.refresh_daily_stats(
+        bind,
+        lag=timedelta(seconds=settings.stats_refresh_lag),
+        window=timedelta(days=settings.stats_refresh_window_days),
+    )
+
+
+@job_handler(service.ARCHIVE_JOB, every=lambda settings: settings.archive_interval)
+def archive_completed_items(bind: Engine | Connection, payload: dict[str, Any]) -> None:
+    settings = get_settings()
+    # The rollup only reads live items, so catch it up before items leave for the archive.
+    if settings.stats_refresh_interval > 0:
+        refresh_daily_stats(bind, payload)
+    service.archive_completed_items(
+        bind,
+        older_than=timedelta(days=settings.archive_after_days),
+        batch_size=settings.archive_batch_size,
+    )
+
+
+@job_handler(
+    service.IDEMPOTENCY_PURGE_JOB, every=lambda settings: settings.idempotency_purge_interval
+)
+def purge_idempotency_keys(bind: Engine | Connection, payload: dict[str, Any]) -> None:
+    service.collect_expired_idempotency_keys(
+        bind, batch_size=get_settings().idempotency_purge_batch_size
+    )
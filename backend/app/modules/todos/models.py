@@ -1,9 +1,21 @@
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint, func
+from sqlalchemy import (
+    JSON,
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy import Enum as SQLEnum
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -35,7 +47,19 @@ class TodoItemTagLink(SQLModel, table=True):
     tag_id: uuid.UUID = Field(
         foreign_key="todo_tags.id",
         primary_key=True,
+        index=True,
     )
+    # Copy of the item's list_id (filled in through the relationship joins below) so link rows can
+    # share the item's hash partition when todo_items is partitioned by list_id.
+    list_id: uuid.UUID = Field(nullable=False)
+
+
+# Link rows are joined on (list_id, item_id) so queries scoped to one list prune to one partition.
+_ITEM_LINK_JOIN = (
+    "and_(TodoItem.id == foreign(TodoItemTagLink.item_id), "
+    "TodoItem.list_id == foreign(TodoItemTagLink.list_id))"
+)
+_TAG_LINK_JOIN = "TodoTag.id == foreign(TodoItemTagLink.tag_id)"
 
 
 class TodoList(SQLModel, table=True):
@@ -64,13 +88,42 @@ class TodoTag(SQLModel, table=True):
     items: List["TodoItem"] = Relationship(
         back_populates="tags",
         link_model=TodoItemTagLink,
+        sa_relationship_kwargs={"primaryjoin": _TAG_LINK_JOIN, "secondaryjoin": _ITEM_LINK_JOIN},
     )
 
 
+# Prefix autocomplete matches on lower(name); text_pattern_ops keeps LIKE 'abc%' indexable
+# regardless of the database collation.
+Index(
+    "ix_todo_tags_name_pattern",
+    func.lower(TodoTag.__table__.c.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"},
+)
+
+
 class TodoItem(SQLModel, table=True):
     __tablename__ = "todo_items"
     __table_args__ = (
         UniqueConstraint("list_id", "position", name="uq_todo_items_list_position"),
+        # Covers the per-list status/overdue aggregates used by list summaries.
+        Index("ix_todo_items_list_status_due", "list_id", "status", "due_date"),
+        # Serves cross-list due-date range scans and the calendar rollup for open items.
+        Index(
+            "ix_todo_items_open_due_date",
+            "due_date",
+            "id",
+            postgresql_where=text("status <> 'done'"),
+            sqlite_where=text("status <> 'done'"),
+        ),
+        # Lets the stats refresh read only the items created since its watermark.
+        Index("ix_todo_items_created_at", "created_at"),
+        # Finds archival candidates without scanning open items.
+        Index(
+            "ix_todo_items_done_completed_at",
+            "completed_at",
+            postgresql_where=text("status = 'done'"),
+            sqlite_where=text("status = 'done'"),
+        ),
     )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -88,8 +141,88 @@ class TodoItem(SQLModel, table=True):
     created_at: datetime = _timestamp_column()
     updated_at: datetime = _timestamp_column(onupdate=True)
 
+    # Identify items by (id, list_id), matching the primary key of the partitioned layout, so the
+    # UPDATE/DELETE/refresh statements the ORM emits carry the partition key.
+    __mapper_args__ = {"primary_key": ["id", "list_id"]}
+
     list: Optional["TodoList"] = Relationship(back_populates="items")
     tags: List["TodoTag"] = Relationship(
         back_populates="items",
         link_model=TodoItemTagLink,
+        sa_relationship_kwargs={"primaryjoin": _ITEM_LINK_JOIN, "secondaryjoin": _TAG_LINK_JOIN},
+    )
+
+
+class TodoItemArchive(SQLModel, table=True):
+    """Cold storage for items that stayed done past the archive age.
+
+    Rows keep the original item id so they can be restored in place. Tags are stored by name
+    rather than linked, so tag garbage collection and usage counts only consider live items.
+    """
+
+    __tablename__ = "todo_items_archive"
+    __table_args__ = (
+        Index("ix_todo_items_archive_list_completed", "list_id", "completed_at", "id"),
+        Index("ix_todo_items_archive_completed", "completed_at", "id"),
+    )
+
+    id: uuid.UUID = Field(primary_key=True)
+    list_id: uuid.UUID = Field(foreign_key="todo_lists.id", ondelete="CASCADE", nullable=False)
+    title: str = Field(sa_column=Column(String(200), nullable=False))
+    description: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
+    notes: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
+    status: TodoStatus = Field(
+        default=TodoStatus.done,
+        sa_column=Column(SQLEnum(TodoStatus, name="todo_status", native_enum=False), nullable=False),
     )
+    due_date: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    completed_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    tags: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    updated_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    archived_at: datetime = _timestamp_column()
+
+
+class TodoDailyStats(SQLModel, table=True):
+    """Per-list rollup of item creations and completions by UTC day.
+
+    Maintained incrementally by ``service.refresh_daily_stats``; rows record events, so later
+    deletes or reopenings do not change past days. ``completion_histogram`` maps log-scale
+    time-to-complete buckets (see ``service._duration_bucket``) to counts, which merge across
+    days into an approximate median.
+    """
+
+    __tablename__ = "todo_daily_stats"
+
+    list_id: uuid.UUID = Field(foreign_key="todo_lists.id", ondelete="CASCADE", primary_key=True)
+    day: date = Field(sa_column=Column(Date, primary_key=True))
+    created_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    completed_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    completion_histogram: dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+
+
+class TodoStatsWatermark(SQLModel, table=True):
+    """How far each incremental rollup has consumed item events; the row is locked while refreshing."""
+
+    __tablename__ = "todo_stats_watermarks"
+
+    name: str = Field(sa_column=Column(String(50), primary_key=True))
+    watermark: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+
+
+class TodoIdempotencyKey(SQLModel, table=True):
+    """Response of a write sent with an ``Idempotency-Key``, stored in the write's transaction.
+
+    ``fingerprint`` hashes the route and payload so a key reused for a different request is
+    rejected instead of answered with an unrelated response.
+    """
+
+    __tablename__ = "todo_idempotency_keys"
+    __table_args__ = (Index("ix_todo_idempotency_keys_expires_at", "expires_at"),)
+
+    key: str = Field(sa_column=Column(String(255), primary_key=True))
+    fingerprint: str = Field(sa_column=Column(String(64), nullable=False))
+    status_code: int = Field(sa_column=Column(Integer, nullable=False))
+    response_body: str = Field(sa_column=Column(Text, nullable=False))
+    created_at: datetime = _timestamp_column()
+    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
@@ -1,45 +1,173 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from pydantic import BaseModel, TypeAdapter
 from sqlmodel import Session
 
-from app.api.dependencies import get_db_session
+from app.api.dependencies import get_db_session, get_settings_dependency
+from app.core.settings import Settings
 
-from . import service
+from . import cache, service
 from .models import TodoStatus
 from .schemas import (
+    TodoArchivedItemPage,
+    TodoArchivedItemRead,
+    TodoCalendar,
+    TodoCalendarDay,
+    TodoDailyStatsRead,
     TodoItemCreate,
+    TodoItemPage,
     TodoItemRead,
     TodoItemUpdate,
     TodoListCreate,
     TodoListDetail,
     TodoListRead,
+    TodoListStats,
     TodoListSummary,
     TodoListUpdate,
+    TodoStatusCounts,
+    TodoTagUsageRead,
 )
 
 router = APIRouter(prefix="/todo", tags=["todo"])
 
+_MAX_STATS_DAYS = 366
+
+
+def _write_conflict() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Todo list is busy with concurrent updates, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _idempotency_key(
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Retries sent with the same key get the first response instead of a new write",
+    ),
+) -> str | None:
+    return idempotency_key
+
+
+def _idempotent_write(
+    key: str | None,
+    request: Request,
+    settings: Settings,
+    *,
+    status_code: int,
+    payload: BaseModel | None = None,
+    render: Callable[[Any], str] = lambda _: "",
+) -> service.IdempotentWrite | None:
+    """Describe a keyed write; the fingerprint ties the key to this exact method, path and body."""
+
+    if key is None:
+        return None
+    body = payload.model_dump_json(exclude_unset=True) if payload is not None else ""
+    fingerprint = hashlib.sha256(
+        f"{request.method} {request.url.path}\n{body}".encode()
+    ).hexdigest()
+    return service.IdempotentWrite(
+        key=key,
+        fingerprint=fingerprint,
+        status_code=status_code,
+        render=render,
+        ttl=timedelta(seconds=settings.idempotency_key_ttl),
+    )
+
+
+def _replayed(replay: service.IdempotentReplay) -> Response:
+    headers = {"Idempotent-Replayed": "true"}
+    if not replay.body:
+        return Response(status_code=replay.status_code, headers=headers)
+    return Response(
+        content=replay.body,
+        status_code=replay.status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _key_reused() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Idempotency-Key was already used for a different request",
+    )
+
+
+def _render_list(todo_list: Any) -> str:
+    return TodoListRead.model_validate(todo_list).model_dump_json()
+
+
+def _render_item(item: Any) -> str:
+    return TodoItemRead.model_validate(item).model_dump_json()
+
+
+_summaries_adapter = TypeAdapter(list[TodoListSummary])
+
 
 @router.get("/lists", response_model=list[TodoListSummary])
-def list_todo_lists(session: Session = Depends(get_db_session)) -> list[TodoListSummary]:
-    lists = service.list_todo_lists(session)
-    summaries: list[TodoListSummary] = []
-    for entry in lists:
-        base = TodoListRead.model_validate(entry.todo_list).model_dump()
-        base["item_count"] = entry.item_count
-        summaries.append(TodoListSummary(**base))
-    return summaries
+def list_todo_lists(session: Session = Depends(get_db_session)) -> Response:
+    def load() -> bytes:
+        summaries: list[TodoListSummary] = []
+        for entry in service.list_todo_lists(session):
+            base = TodoListRead.model_validate(entry.todo_list).model_dump()
+            base["item_count"] = entry.item_count
+            base["status_counts"] = TodoStatusCounts(
+                **{todo_status.value: count for todo_status, count in entry.status_counts.items()}
+            )
+            base["overdue_count"] = entry.overdue_count
+            base["next_due_date"] = entry.next_due_date
+            summaries.append(TodoListSummary(**base))
+        return _summaries_adapter.dump_json(summaries)
+
+    body = cache.cached_response("todo_lists", cache.summaries_key, load)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/lists", response_model=TodoListRead, status_code=status.HTTP_201_CREATED)
 def create_todo_list(
     payload: TodoListCreate,
+    request: Request,
     session: Session = Depends(get_db_session),
-) -> TodoListRead:
-    todo_list = service.create_todo_list(session, payload)
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
+) -> TodoListRead | Response:
+    idempotency = _idempotent_write(
+        idempotency_key,
+        request,
+        settings,
+        status_code=status.HTTP_201_CREATED,
+        payload=payload,
+        render=_render_list,
+    )
+    try:
+        todo_list = service.create_todo_list(session, payload, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
     return TodoListRead.model_validate(todo_list)
 
 
@@ -48,42 +176,78 @@ def get_todo_list(
     list_id: UUID,
     include_items: bool = Query(False, description="Include list items in the response"),
     session: Session = Depends(get_db_session),
-) -> TodoListDetail:
-    try:
+) -> Response:
+    def load() -> bytes:
         todo_list = service.get_todo_list(session, list_id, include_items=include_items)
+        base = TodoListRead.model_validate(todo_list).model_dump()
+        if include_items:
+            items = [TodoItemRead.model_validate(item) for item in todo_list.items]
+        else:
+            items = []
+        return TodoListDetail(**base, items=items).model_dump_json().encode()
+
+    try:
+        body = cache.cached_response(
+            "todo_list_detail",
+            lambda: cache.detail_key(list_id, include_items=include_items),
+            load,
+        )
     except service.TodoListNotFoundError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
-
-    base = TodoListRead.model_validate(todo_list).model_dump()
-    if include_items:
-        items = [TodoItemRead.model_validate(item) for item in todo_list.items]
-    else:
-        items = []
-    return TodoListDetail(**base, items=items)
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/lists/{list_id}", response_model=TodoListRead)
 def update_todo_list(
     list_id: UUID,
     payload: TodoListUpdate,
+    request: Request,
     session: Session = Depends(get_db_session),
-) -> TodoListRead:
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
+) -> TodoListRead | Response:
+    idempotency = _idempotent_write(
+        idempotency_key,
+        request,
+        settings,
+        status_code=status.HTTP_200_OK,
+        payload=payload,
+        render=_render_list,
+    )
     try:
-        todo_list = service.update_todo_list(session, list_id, payload)
+        todo_list = service.update_todo_list(session, list_id, payload, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
     except service.TodoListNotFoundError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
     return TodoListRead.model_validate(todo_list)
 
 
 @router.delete("/lists/{list_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_todo_list(
     list_id: UUID,
+    request: Request,
     session: Session = Depends(get_db_session),
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
 ) -> Response:
+    idempotency = _idempotent_write(
+        idempotency_key, request, settings, status_code=status.HTTP_204_NO_CONTENT
+    )
     try:
-        service.delete_todo_list(session, list_id)
+        service.delete_todo_list(session, list_id, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
     except service.TodoListNotFoundError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -117,12 +281,167 @@ def list_items(
 def create_item(
     list_id: UUID,
     payload: TodoItemCreate,
+    request: Request,
     session: Session = Depends(get_db_session),
-) -> TodoItemRead:
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
+) -> TodoItemRead | Response:
+    idempotency = _idempotent_write(
+        idempotency_key,
+        request,
+        settings,
+        status_code=status.HTTP_201_CREATED,
+        payload=payload,
+        render=_render_item,
+    )
+    try:
+        item = service.create_item(session, list_id, payload, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
+    except service.TodoListNotFoundError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
+    return TodoItemRead.model_validate(item)
+
+
+@router.get("/lists/{list_id}/stats", response_model=TodoListStats)
+def get_list_stats(
+    list_id: UUID,
+    day_from: date = Query(..., alias="from", description="First day (UTC) of the range"),
+    day_to: date = Query(..., alias="to", description="Exclusive last day (UTC) of the range"),
+    session: Session = Depends(get_db_session),
+) -> TodoListStats:
+    span = (day_to - day_from).days
+    if span <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="`to` must be after `from`")
+    if span > _MAX_STATS_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range must not exceed {_MAX_STATS_DAYS} days",
+        )
+    try:
+        stats = service.get_list_stats(session, list_id, day_from=day_from, day_to=day_to)
+    except service.TodoListNotFoundError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
+
+    return TodoListStats(
+        created=stats.created,
+        completed=stats.completed,
+        median_completion_seconds=stats.median_completion_seconds,
+        refreshed_through=stats.refreshed_through,
+        days=[
+            TodoDailyStatsRead(
+                day=day.day,
+                created=day.created,
+                completed=day.completed,
+                median_completion_seconds=day.median_completion_seconds,
+            )
+            for day in stats.days
+        ],
+    )
+
+
+@router.get("/items/due", response_model=TodoItemPage)
+def list_due_items(
+    due_from: datetime = Query(..., alias="from", description="Inclusive lower bound for due_date"),
+    due_to: datetime = Query(..., alias="to", description="Exclusive upper bound for due_date"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page"),
+    session: Session = Depends(get_db_session),
+) -> TodoItemPage:
+    if due_to <= due_from:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="`to` must be after `from`")
+    try:
+        page = service.list_due_items(
+            session,
+            due_from=due_from,
+            due_to=due_to,
+            limit=limit,
+            cursor=cursor,
+        )
+    except service.InvalidCursorError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from error
+
+    return TodoItemPage(
+        items=[TodoItemRead.model_validate(item) for item in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/calendar", response_model=TodoCalendar)
+def get_due_calendar(
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$", description="Month in YYYY-MM format"),
+    session: Session = Depends(get_db_session),
+) -> TodoCalendar:
     try:
-        item = service.create_item(session, list_id, payload)
+        month_start = date.fromisoformat(f"{month}-01")
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid month") from error
+
+    counts = service.due_calendar(session, month_start)
+    days = [TodoCalendarDay(day=day, count=count) for day, count in counts.items()]
+    return TodoCalendar(month=month, days=days)
+
+
+@router.get("/tags", response_model=list[TodoTagUsageRead])
+def list_tags(
+    prefix: str | None = Query(None, max_length=50, description="Case-insensitive name prefix"),
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_db_session),
+) -> list[TodoTagUsageRead]:
+    tags = service.list_tags(session, prefix=prefix, limit=limit)
+    return [
+        TodoTagUsageRead(id=entry.tag.id, name=entry.tag.name, usage_count=entry.usage_count)
+        for entry in tags
+    ]
+
+
+@router.get("/archive", response_model=TodoArchivedItemPage)
+def list_archived_items(
+    list_id: UUID | None = Query(None, description="Only return items archived from this list"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page"),
+    session: Session = Depends(get_db_session),
+) -> TodoArchivedItemPage:
+    try:
+        page = service.list_archived_items(session, list_id=list_id, limit=limit, cursor=cursor)
     except service.TodoListNotFoundError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
+    except service.InvalidCursorError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from error
+
+    return TodoArchivedItemPage(
+        items=[TodoArchivedItemRead.model_validate(item) for item in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post("/archive/{item_id}/restore", response_model=TodoItemRead)
+def restore_archived_item(
+    item_id: UUID,
+    request: Request,
+    session: Session = Depends(get_db_session),
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
+) -> TodoItemRead | Response:
+    idempotency = _idempotent_write(
+        idempotency_key, request, settings, status_code=status.HTTP_200_OK, render=_render_item
+    )
+    try:
+        item = service.restore_item(session, item_id, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
+    except service.ArchivedItemNotFoundError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Archived item not found") from error
+    except service.TodoListNotFoundError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo list not found") from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
     return TodoItemRead.model_validate(item)
 
 
@@ -142,22 +461,51 @@ def get_item(
 def update_item(
     item_id: UUID,
     payload: TodoItemUpdate,
+    request: Request,
     session: Session = Depends(get_db_session),
-) -> TodoItemRead:
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
+) -> TodoItemRead | Response:
+    idempotency = _idempotent_write(
+        idempotency_key,
+        request,
+        settings,
+        status_code=status.HTTP_200_OK,
+        payload=payload,
+        render=_render_item,
+    )
     try:
-        item = service.update_item(session, item_id, payload)
+        item = service.update_item(session, item_id, payload, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
     except service.TodoItemNotFoundError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo item not found") from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
     return TodoItemRead.model_validate(item)
 
 
 @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_item(
     item_id: UUID,
+    request: Request,
     session: Session = Depends(get_db_session),
+    settings: Settings = Depends(get_settings_dependency),
+    idempotency_key: str | None = Depends(_idempotency_key),
 ) -> Response:
+    idempotency = _idempotent_write(
+        idempotency_key, request, settings, status_code=status.HTTP_204_NO_CONTENT
+    )
     try:
-        service.delete_item(session, item_id)
+        service.delete_item(session, item_id, idempotency=idempotency)
+    except service.IdempotentReplay as replay:
+        return _replayed(replay)
+    except service.IdempotencyKeyReusedError as error:
+        raise _key_reused() from error
     except service.TodoItemNotFoundError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo item not found") from error
+    except service.TodoWriteConflictError as error:
+        raise _write_conflict() from error
     return Response(status_code=status.HTTP_204_NO_CONTENT)
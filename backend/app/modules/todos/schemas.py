@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -15,6 +15,10 @@ class TodoTagRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TodoTagUsageRead(TodoTagRead):
+    usage_count: int
+
+
 class TodoItemBase(BaseModel):
     title: str
     description: str | None = None
@@ -56,6 +60,58 @@ class TodoItemRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TodoItemPage(BaseModel):
+    items: list[TodoItemRead]
+    next_cursor: str | None = None
+
+
+class TodoArchivedItemRead(BaseModel):
+    id: UUID
+    list_id: UUID
+    title: str
+    description: str | None
+    notes: str | None
+    due_date: datetime | None
+    status: TodoStatus
+    completed_at: datetime
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime
+    tags: list[str]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TodoArchivedItemPage(BaseModel):
+    items: list[TodoArchivedItemRead]
+    next_cursor: str | None = None
+
+
+class TodoCalendarDay(BaseModel):
+    day: date
+    count: int
+
+
+class TodoCalendar(BaseModel):
+    month: str
+    days: list[TodoCalendarDay] = Field(default_factory=list)
+
+
+class TodoDailyStatsRead(BaseModel):
+    day: date
+    created: int
+    completed: int
+    median_completion_seconds: float | None = None
+
+
+class TodoListStats(BaseModel):
+    created: int
+    completed: int
+    median_completion_seconds: float | None = None
+    refreshed_through: datetime | None = None
+    days: list[TodoDailyStatsRead] = Field(default_factory=list)
+
+
 class TodoListBase(BaseModel):
     name: str
     description: str | None = None
@@ -80,8 +136,18 @@ class TodoListRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TodoStatusCounts(BaseModel):
+    todo: int = 0
+    in_progress: int = 0
+    blocked: int = 0
+    done: int = 0
+
+
 class TodoListSummary(TodoListRead):
     item_count: int = 0
+    status_counts: TodoStatusCounts = Field(default_factory=TodoStatusCounts)
+    overdue_count: int = 0
+    next_due_date: datetime | None = None
 
 
 class TodoListDetail(TodoListRead):
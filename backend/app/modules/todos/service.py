@@ -1,17 +1,84 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Sequence
+import base64
+import binascii
+import math
+import random
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
+from functools import cache
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import Select, and_, bindparam, delete, exists, func, or_, select, tuple_
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 from sqlmodel import Session
 
-from .models import TodoItem, TodoList, TodoStatus, TodoTag
+from app.modules.jobs import service as jobs
+
+from .cache import invalidate_list, invalidate_lists
+from .models import (
+    TodoDailyStats,
+    TodoIdempotencyKey,
+    TodoItem,
+    TodoItemArchive,
+    TodoItemTagLink,
+    TodoList,
+    TodoStatsWatermark,
+    TodoStatus,
+    TodoTag,
+)
 from .schemas import TodoItemCreate, TodoItemUpdate, TodoListCreate, TodoListUpdate
 
+# Job kinds of this module; their handlers live in ``jobs.py``. The tag collector is enqueued by
+# writes, the others recur on the intervals set in the settings.
+TAG_COLLECTION_JOB = "todo.collect_orphan_tags"
+STATS_REFRESH_JOB = "todo.refresh_daily_stats"
+ARCHIVE_JOB = "todo.archive_completed_items"
+IDEMPOTENCY_PURGE_JOB = "todo.purge_idempotency_keys"
+
+# Serialization failure, deadlock and unique violation: all resolve by re-running the write. A
+# primary key violation on SQLite is a concurrent request that stored the same idempotency key;
+# the re-run replays its response.
+_RETRYABLE_SQLSTATES = frozenset({"40001", "40P01", "23505"})
+_RETRYABLE_SQLITE_ERRORS = frozenset(
+    {"SQLITE_BUSY", "SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY"}
+)
+_WRITE_ATTEMPTS = 4
+_RETRY_BACKOFF_SECONDS = 0.02
+
+# Hot statements are built once and executed with bound parameters: reusing the same construct
+# skips rebuilding it and re-deriving its cache key on every call.
+_LIST_BY_ID = select(TodoList).where(TodoList.id == bindparam("list_id"))
+_LIST_FOR_UPDATE = _LIST_BY_ID.with_for_update()
+_ITEM_BY_ID = select(TodoItem).where(TodoItem.id == bindparam("item_id"))
+_ITEM_WITH_TAGS_BY_ID = _ITEM_BY_ID.options(selectinload(TodoItem.tags))
+_ITEMS_IN_ORDER = (
+    select(TodoItem)
+    .where(TodoItem.list_id == bindparam("list_id"))
+    .order_by(TodoItem.position.asc(), TodoItem.created_at.asc())
+)
+_ITEM_COUNT = select(func.count()).select_from(TodoItem).where(
+    TodoItem.list_id == bindparam("list_id")
+)
+# FOR KEY SHARE keeps a reused tag from being collected until the links to it have committed;
+# the collector skips locked tags.
+_TAGS_BY_NAME_FOR_KEY_SHARE = (
+    select(TodoTag)
+    .where(func.lower(TodoTag.name).in_(bindparam("names", expanding=True)))
+    .with_for_update(read=True, key_share=True)
+)
+
+_DAILY_STATS_WATERMARK = "todo_daily_stats"
+# Completion times are bucketed four buckets per doubling, so medians read back from merged
+# buckets are within about 9% of the exact value.
+_BUCKETS_PER_DOUBLING = 4
+
 
 class TodoListNotFoundError(Exception):
     pass
@@ -21,47 +88,234 @@ class TodoItemNotFoundError(Exception):
     pass
 
 
+class InvalidCursorError(Exception):
+    pass
+
+
+class TodoWriteConflictError(Exception):
+    """A write kept colliding with concurrent writers and exhausted its retries."""
+
+
+class ArchivedItemNotFoundError(Exception):
+    pass
+
+
+class IdempotencyKeyReusedError(Exception):
+    """The Idempotency-Key was already used for a different request."""
+
+
+class IdempotentReplay(Exception):
+    """The request was already processed under its Idempotency-Key; carries the stored response."""
+
+    def __init__(self, status_code: int, body: str) -> None:
+        super().__init__(status_code)
+        self.status_code = status_code
+        self.body = body
+
+
+@dataclass(frozen=True)
+class IdempotentWrite:
+    """A write sent with an ``Idempotency-Key``.
+
+    ``render`` turns the write's result into the response body, which is stored with
+    ``status_code`` in the write's own transaction and replayed to retries for ``ttl``.
+    """
+
+    key: str
+    fingerprint: str
+    status_code: int
+    render: Callable[[Any], str]
+    ttl: timedelta
+
+
 @dataclass
 class TodoListWithCount:
     todo_list: TodoList
     item_count: int
+    status_counts: dict[TodoStatus, int]
+    overdue_count: int
+    next_due_date: datetime | None
 
 
 def list_todo_lists(session: Session) -> list[TodoListWithCount]:
+    now = datetime.now(tz=UTC)
+    is_open = TodoItem.status != TodoStatus.done
+    status_columns = [
+        func.count(TodoItem.id).filter(TodoItem.status == todo_status) for todo_status in TodoStatus
+    ]
     statement = (
-        select(TodoList, func.count(TodoItem.id))
+        select(
+            TodoList,
+            func.count(TodoItem.id),
+            *status_columns,
+            func.count(TodoItem.id).filter(and_(is_open, TodoItem.due_date < now)),
+            func.min(TodoItem.due_date).filter(and_(is_open, TodoItem.due_date >= now)),
+        )
         .join(TodoItem, TodoItem.list_id == TodoList.id, isouter=True)
         .group_by(TodoList.id)
         .order_by(TodoList.created_at.asc())
     )
-    results: Sequence[tuple[TodoList, int]] = session.exec(statement).all()
-    return [TodoListWithCount(todo_list=row[0], item_count=row[1]) for row in results]
+    results = session.exec(statement).all()
+
+    summaries: list[TodoListWithCount] = []
+    for todo_list, item_count, *aggregates in results:
+        counts = aggregates[: len(status_columns)]
+        overdue_count, next_due_date = aggregates[len(status_columns) :]
+        summaries.append(
+            TodoListWithCount(
+                todo_list=todo_list,
+                item_count=item_count,
+                status_counts=dict(zip(TodoStatus, counts, strict=True)),
+                overdue_count=overdue_count,
+                next_due_date=next_due_date,
+            )
+        )
+    return summaries
 
 
-def create_todo_list(session: Session, data: TodoListCreate) -> TodoList:
+@dataclass
+class TodoItemPage:
+    items: list[TodoItem]
+    next_cursor: str | None
+
+
+def list_due_items(
+    session: Session,
+    *,
+    due_from: datetime,
+    due_to: datetime,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> TodoItemPage:
+    """Return open items due in ``[due_from, due_to)`` across all lists, keyset paginated."""
+
+    statement = (
+        select(TodoItem)
+        .where(
+            TodoItem.status != TodoStatus.done,
+            TodoItem.due_date >= due_from,
+            TodoItem.due_date < due_to,
+        )
+        .options(selectinload(TodoItem.tags))
+        .order_by(TodoItem.due_date.asc(), TodoItem.id.asc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        after_due_date, after_id = _decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(TodoItem.due_date, TodoItem.id) > tuple_(after_due_date, after_id)
+        )
+
+    items = list(session.exec(statement).scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = _encode_cursor(last.due_date, last.id)
+    return TodoItemPage(items=items, next_cursor=next_cursor)
+
+
+def due_calendar(session: Session, month_start: date) -> dict[date, int]:
+    """Count open items per due day for the month starting at ``month_start``."""
+
+    range_start = datetime(month_start.year, month_start.month, 1, tzinfo=UTC)
+    if month_start.month == 12:
+        range_end = range_start.replace(year=month_start.year + 1, month=1)
+    else:
+        range_end = range_start.replace(month=month_start.month + 1)
+
+    if session.get_bind().dialect.name == "postgresql":
+        # Bucket by the UTC day like the range bounds and SQLite; date_trunc on a timestamptz would
+        # use the session TimeZone.
+        day = func.date_trunc("day", func.timezone("UTC", TodoItem.due_date))
+    else:
+        day = func.date(TodoItem.due_date)
+
+    statement = (
+        select(day, func.count(TodoItem.id))
+        .where(
+            TodoItem.status != TodoStatus.done,
+            TodoItem.due_date >= range_start,
+            TodoItem.due_date < range_end,
+        )
+        .group_by(day)
+        .order_by(day)
+    )
+    counts: dict[date, int] = {}
+    for bucket, count in session.exec(statement).all():
+        if isinstance(bucket, datetime):
+            bucket = bucket.date()
+        elif isinstance(bucket, str):
+            bucket = date.fromisoformat(bucket)
+        counts[bucket] = count
+    return counts
+
+
+def create_todo_list(
+    session: Session, data: TodoListCreate, *, idempotency: IdempotentWrite | None = None
+) -> TodoList:
+    return _retry_on_conflict(session, lambda: _create_todo_list(session, data, idempotency))
+
+
+def _create_todo_list(
+    session: Session, data: TodoListCreate, idempotency: IdempotentWrite | None
+) -> TodoList:
+    _replay_if_recorded(session, idempotency)
     payload = data.model_dump(exclude_unset=True)
     todo_list = TodoList(**payload)
     session.add(todo_list)
+    _record_response(session, idempotency, todo_list)
     session.commit()
+    invalidate_lists()
     session.refresh(todo_list)
     return todo_list
 
 
 def _get_todo_list(session: Session, list_id: UUID) -> TodoList:
-    todo_list = session.get(TodoList, list_id)
+    # Request sessions start empty, so session.get would miss its identity map and build a query.
+    todo_list = session.exec(_LIST_BY_ID, params={"list_id": list_id}).scalar_one_or_none()
     if not todo_list:
         raise TodoListNotFoundError(str(list_id))
     return todo_list
 
 
+def _lock_todo_list(session: Session, list_id: UUID) -> TodoList:
+    """Load the list row FOR UPDATE so position changes within one list run one at a time."""
+
+    todo_list = session.exec(_LIST_FOR_UPDATE, params={"list_id": list_id}).scalar_one_or_none()
+    if not todo_list:
+        raise TodoListNotFoundError(str(list_id))
+    return todo_list
+
+
+def _retry_on_conflict[T](session: Session, operation: Callable[[], T]) -> T:
+    attempt = 1
+    while True:
+        try:
+            return operation()
+        except DBAPIError as error:
+            session.rollback()
+            if not _is_retryable(error):
+                raise
+            if attempt >= _WRITE_ATTEMPTS:
+                raise TodoWriteConflictError(str(error.orig)) from error
+            time.sleep(_RETRY_BACKOFF_SECONDS * attempt * (1 + random.random()))
+            attempt += 1
+
+
+def _is_retryable(error: DBAPIError) -> bool:
+    original = error.orig
+    if getattr(original, "sqlstate", None) in _RETRYABLE_SQLSTATES:
+        return True
+    return getattr(original, "sqlite_errorname", None) in _RETRYABLE_SQLITE_ERRORS
+
+
 def get_todo_list(session: Session, list_id: UUID, *, include_items: bool = False) -> TodoList:
     if include_items:
-        statement = (
-            select(TodoList)
-            .where(TodoList.id == list_id)
-            .options(selectinload(TodoList.items).selectinload(TodoItem.tags))
+        statement = _LIST_BY_ID.options(
+            selectinload(TodoList.items).options(_load_tags_in_list(list_id))
         )
-        todo_list = session.exec(statement).scalar_one_or_none()
+        todo_list = session.exec(statement, params={"list_id": list_id}).scalar_one_or_none()
         if not todo_list:
             raise TodoListNotFoundError(str(list_id))
         _sort_items(todo_list)
@@ -70,21 +324,57 @@ def get_todo_list(session: Session, list_id: UUID, *, include_items: bool = Fals
     return _get_todo_list(session, list_id)
 
 
-def update_todo_list(session: Session, list_id: UUID, data: TodoListUpdate) -> TodoList:
+def update_todo_list(
+    session: Session,
+    list_id: UUID,
+    data: TodoListUpdate,
+    *,
+    idempotency: IdempotentWrite | None = None,
+) -> TodoList:
+    return _retry_on_conflict(
+        session, lambda: _update_todo_list(session, list_id, data, idempotency)
+    )
+
+
+def _update_todo_list(
+    session: Session, list_id: UUID, data: TodoListUpdate, idempotency: IdempotentWrite | None
+) -> TodoList:
+    _replay_if_recorded(session, idempotency)
     todo_list = _get_todo_list(session, list_id)
     updates = data.model_dump(exclude_unset=True)
     for field, value in updates.items():
         setattr(todo_list, field, value)
     session.add(todo_list)
+    _record_response(session, idempotency, todo_list)
     session.commit()
+    invalidate_list(list_id)
     session.refresh(todo_list)
     return todo_list
 
 
-def delete_todo_list(session: Session, list_id: UUID) -> None:
-    todo_list = _get_todo_list(session, list_id)
-    session.delete(todo_list)
+def delete_todo_list(
+    session: Session, list_id: UUID, *, idempotency: IdempotentWrite | None = None
+) -> None:
+    _retry_on_conflict(session, lambda: _delete_todo_list(session, list_id, idempotency))
+
+
+def _delete_todo_list(
+    session: Session, list_id: UUID, idempotency: IdempotentWrite | None
+) -> None:
+    _replay_if_recorded(session, idempotency)
+    _get_todo_list(session, list_id)
+    # Set-based deletes: the ORM cascade would load every item and tag link of the list into the
+    # request first. Archived items and the daily rollup go through ON DELETE CASCADE.
+    for statement in (
+        delete(TodoItemTagLink).where(TodoItemTagLink.list_id == list_id),
+        delete(TodoItem).where(TodoItem.list_id == list_id),
+        delete(TodoList).where(TodoList.id == list_id),
+    ):
+        session.execute(statement, execution_options={"synchronize_session": False})
+    _schedule_tag_collection(session)
+    _record_response(session, idempotency, None)
     session.commit()
+    invalidate_list(list_id)
 
 
 def list_items(
@@ -97,37 +387,60 @@ def list_items(
 ) -> list[TodoItem]:
     _get_todo_list(session, list_id)
 
-    statement = (
-        select(TodoItem)
-        .where(TodoItem.list_id == list_id)
-        .options(selectinload(TodoItem.tags))
-        .order_by(TodoItem.position.asc(), TodoItem.created_at.asc())
-    )
-
+    params: dict[str, object] = {"list_id": list_id}
     if status is not None:
-        statement = statement.where(TodoItem.status == status)
-
+        params["status"] = status
     if tag is not None:
-        statement = (
-            statement.join(TodoItem.tags)
-            .where(func.lower(TodoTag.name) == tag.lower())
-        )
+        params["tag"] = tag.lower()
+    if search:
+        params["pattern"] = f"%{search.lower()}%"
 
+    statement = _item_list_statement(
+        status=status is not None, tag=tag is not None, search=bool(search)
+    ).options(_load_tags_in_list(list_id))
+    return session.exec(statement, params=params).scalars().all()
+
+
+@cache
+def _item_list_statement(*, status: bool, tag: bool, search: bool) -> Select:
+    """The item list query for one combination of filters, with bound parameters for the values."""
+
+    statement = _ITEMS_IN_ORDER
+    if status:
+        statement = statement.where(TodoItem.status == bindparam("status"))
+    if tag:
+        statement = statement.join(TodoItem.tags).where(
+            func.lower(TodoTag.name) == bindparam("tag")
+        )
     if search:
-        pattern = f"%{search.lower()}%"
         statement = statement.where(
             or_(
-                func.lower(TodoItem.title).like(pattern),
-                func.lower(TodoItem.description).like(pattern),
-                func.lower(TodoItem.notes).like(pattern),
+                func.lower(TodoItem.title).like(bindparam("pattern")),
+                func.lower(TodoItem.description).like(bindparam("pattern")),
+                func.lower(TodoItem.notes).like(bindparam("pattern")),
             )
         )
+    return statement
+
 
-    return session.exec(statement).scalars().all()
+def create_item(
+    session: Session,
+    list_id: UUID,
+    data: TodoItemCreate,
+    *,
+    idempotency: IdempotentWrite | None = None,
+) -> TodoItem:
+    return _retry_on_conflict(session, lambda: _create_item(session, list_id, data, idempotency))
 
 
-def create_item(session: Session, list_id: UUID, data: TodoItemCreate) -> TodoItem:
-    todo_list = _get_todo_list(session, list_id)
+def _create_item(
+    session: Session,
+    list_id: UUID,
+    data: TodoItemCreate,
+    idempotency: IdempotentWrite | None = None,
+) -> TodoItem:
+    _replay_if_recorded(session, idempotency)
+    todo_list = _lock_todo_list(session, list_id)
 
     payload = data.model_dump(exclude_unset=True, exclude={"position", "tags"})
     item = TodoItem(list_id=todo_list.id, **payload)
@@ -139,31 +452,45 @@ def create_item(session: Session, list_id: UUID, data: TodoItemCreate) -> TodoIt
     _resequence_item(session, item, desired_position=data.position)
     _synchronize_tags(session, item, data.tags)
 
+    _record_response(session, idempotency, item)
     session.commit()
+    invalidate_list(list_id)
     session.refresh(item)
     return item
 
 
 def _get_item(session: Session, item_id: UUID) -> TodoItem:
-    item = session.get(TodoItem, item_id)
+    # Items are identified by (id, list_id); a bare id needs a query rather than session.get.
+    item = session.exec(_ITEM_BY_ID, params={"item_id": item_id}).scalar_one_or_none()
     if not item:
         raise TodoItemNotFoundError(str(item_id))
     return item
 
 
 def get_item(session: Session, item_id: UUID) -> TodoItem:
-    statement = (
-        select(TodoItem)
-        .where(TodoItem.id == item_id)
-        .options(selectinload(TodoItem.tags))
-    )
-    item = session.exec(statement).scalar_one_or_none()
+    item = session.exec(_ITEM_WITH_TAGS_BY_ID, params={"item_id": item_id}).scalar_one_or_none()
     if not item:
         raise TodoItemNotFoundError(str(item_id))
     return item
 
 
-def update_item(session: Session, item_id: UUID, data: TodoItemUpdate) -> TodoItem:
+def update_item(
+    session: Session,
+    item_id: UUID,
+    data: TodoItemUpdate,
+    *,
+    idempotency: IdempotentWrite | None = None,
+) -> TodoItem:
+    return _retry_on_conflict(session, lambda: _update_item(session, item_id, data, idempotency))
+
+
+def _update_item(
+    session: Session,
+    item_id: UUID,
+    data: TodoItemUpdate,
+    idempotency: IdempotentWrite | None = None,
+) -> TodoItem:
+    _replay_if_recorded(session, idempotency)
     item = _get_item(session, item_id)
 
     updates = data.model_dump(exclude_unset=True)
@@ -180,32 +507,519 @@ def update_item(session: Session, item_id: UUID, data: TodoItemUpdate) -> TodoIt
         _update_completion_timestamp(item)
 
     if position is not None:
+        _lock_todo_list(session, item.list_id)
         _resequence_item(session, item, desired_position=position)
 
     if tags is not None:
         _synchronize_tags(session, item, tags)
+        _schedule_tag_collection(session)
 
     session.add(item)
+    _record_response(session, idempotency, item)
     session.commit()
     session.refresh(item)
+    invalidate_list(item.list_id)
     return item
 
 
-def delete_item(session: Session, item_id: UUID) -> None:
+def delete_item(
+    session: Session, item_id: UUID, *, idempotency: IdempotentWrite | None = None
+) -> None:
+    _retry_on_conflict(session, lambda: _delete_item(session, item_id, idempotency))
+
+
+def _delete_item(
+    session: Session, item_id: UUID, idempotency: IdempotentWrite | None = None
+) -> None:
+    _replay_if_recorded(session, idempotency)
     item = _get_item(session, item_id)
     list_id = item.list_id
+    _lock_todo_list(session, list_id)
     session.delete(item)
     session.flush()
     _resequence_all(session, list_id)
+    _schedule_tag_collection(session)
+    _record_response(session, idempotency, None)
     session.commit()
+    invalidate_list(list_id)
 
 
-def _resequence_item(session: Session, item: TodoItem, desired_position: int | None) -> None:
+@dataclass
+class TodoTagUsage:
+    tag: TodoTag
+    usage_count: int
+
+
+def list_tags(session: Session, *, prefix: str | None = None, limit: int = 20) -> list[TodoTagUsage]:
+    """Return tags ordered by how many items use them, optionally filtered by name prefix."""
+
+    usage_count = func.count(TodoItemTagLink.item_id)
+    statement = (
+        select(TodoTag, usage_count)
+        .join(TodoItemTagLink, TodoItemTagLink.tag_id == TodoTag.id, isouter=True)
+        .group_by(TodoTag.id)
+        .order_by(usage_count.desc(), TodoTag.name.asc())
+        .limit(limit)
+    )
+    if prefix:
+        pattern = _escape_like(_normalize_tag(prefix)) + "%"
+        statement = statement.where(func.lower(TodoTag.name).like(pattern, escape="\\"))
+
+    return [TodoTagUsage(tag=tag, usage_count=count) for tag, count in session.exec(statement).all()]
+
+
+def purge_orphan_tags(session: Session, *, batch_size: int) -> int:
+    """Delete up to ``batch_size`` tags no longer linked to any item and commit."""
+
+    orphaned = ~exists().where(TodoItemTagLink.tag_id == TodoTag.id)
+    # Lock the candidates first, skipping tags a writer is attaching right now. The delete runs
+    # as a second statement so its orphan re-check sees every link committed before the locks.
+    batch = session.execute(
+        select(TodoTag.id).where(orphaned).limit(batch_size).with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not batch:
+        session.commit()
+        return 0
+    result = session.execute(delete(TodoTag).where(TodoTag.id.in_(batch), orphaned))
+    session.commit()
+    return result.rowcount
+
+
+def _schedule_tag_collection(session: Session) -> None:
+    # Unlinking tags may orphan them. The collector runs as a job after the commit; the dedupe
+    # key folds a burst of deletes into a single run.
+    jobs.enqueue(session, TAG_COLLECTION_JOB, dedupe_key=TAG_COLLECTION_JOB)
+
+
+def collect_orphan_tags(bind: Engine | Connection, *, batch_size: int) -> int:
+    """Purge orphaned tags batch by batch until none remain; intended for background tasks."""
+
+    removed = 0
+    with Session(bind) as session:
+        while True:
+            deleted = purge_orphan_tags(session, batch_size=batch_size)
+            removed += deleted
+            if deleted < batch_size:
+                return removed
+
+
+def archive_completed_batch(session: Session, *, completed_before: datetime, batch_size: int) -> int:
+    """Move up to ``batch_size`` items done since before ``completed_before`` into the archive.
+
+    Affected lists are locked in id order, candidates are re-checked under the locks, and the
+    remaining items of each list are resequenced before the single commit.
+    """
+
+    done_before = and_(TodoItem.status == TodoStatus.done, TodoItem.completed_at < completed_before)
+    candidates = session.exec(
+        select(TodoItem.id, TodoItem.list_id)
+        .where(done_before)
+        .order_by(TodoItem.completed_at.asc())
+        .limit(batch_size)
+    ).all()
+    if not candidates:
+        return 0
+
+    # One statement locks every affected list in a stable order; lists deleted meanwhile drop out.
+    list_ids = session.exec(
+        select(TodoList.id)
+        .where(TodoList.id.in_({list_id for _, list_id in candidates}))
+        .order_by(TodoList.id)
+        .with_for_update()
+    ).scalars().all()
+
     items = session.exec(
         select(TodoItem)
-        .where(TodoItem.list_id == item.list_id)
-        .order_by(TodoItem.position.asc(), TodoItem.created_at.asc())
+        .where(TodoItem.id.in_([item_id for item_id, _ in candidates]), done_before)
+        .options(selectinload(TodoItem.tags))
     ).scalars().all()
+    for item in items:
+        session.add(
+            TodoItemArchive(
+                id=item.id,
+                list_id=item.list_id,
+                title=item.title,
+                description=item.description,
+                notes=item.notes,
+                status=item.status,
+                due_date=item.due_date,
+                completed_at=item.completed_at,
+                tags=sorted(tag.name for tag in item.tags),
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+            )
+        )
+        session.delete(item)
+    session.flush()
+
+    for list_id in list_ids:
+        _resequence_all(session, list_id)
+    # Tags used only by archived items are orphaned now.
+    _schedule_tag_collection(session)
+    session.commit()
+    for list_id in list_ids:
+        invalidate_list(list_id)
+    return len(items)
+
+
+def archive_completed_items(
+    bind: Engine | Connection, *, older_than: timedelta, batch_size: int
+) -> int:
+    """Archive items done for longer than ``older_than`` batch by batch; intended for background jobs."""
+
+    completed_before = datetime.now(tz=UTC) - older_than
+    archived = 0
+    with Session(bind) as session:
+        while True:
+            moved = _retry_on_conflict(
+                session,
+                lambda: archive_completed_batch(
+                    session, completed_before=completed_before, batch_size=batch_size
+                ),
+            )
+            archived += moved
+            if moved < batch_size:
+                return archived
+
+
+@dataclass
+class ArchivedItemPage:
+    items: list[TodoItemArchive]
+    next_cursor: str | None
+
+
+def list_archived_items(
+    session: Session,
+    *,
+    list_id: UUID | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> ArchivedItemPage:
+    """Return archived items, most recently completed first, keyset paginated."""
+
+    statement = (
+        select(TodoItemArchive)
+        .order_by(TodoItemArchive.completed_at.desc(), TodoItemArchive.id.desc())
+        .limit(limit + 1)
+    )
+    if list_id is not None:
+        _get_todo_list(session, list_id)
+        statement = statement.where(TodoItemArchive.list_id == list_id)
+    if cursor is not None:
+        before_completed_at, before_id = _decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(TodoItemArchive.completed_at, TodoItemArchive.id)
+            < tuple_(before_completed_at, before_id)
+        )
+
+    items = list(session.exec(statement).scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = _encode_cursor(last.completed_at, last.id)
+    return ArchivedItemPage(items=items, next_cursor=next_cursor)
+
+
+def restore_item(
+    session: Session, item_id: UUID, *, idempotency: IdempotentWrite | None = None
+) -> TodoItem:
+    return _retry_on_conflict(session, lambda: _restore_item(session, item_id, idempotency))
+
+
+def _restore_item(
+    session: Session, item_id: UUID, idempotency: IdempotentWrite | None = None
+) -> TodoItem:
+    _replay_if_recorded(session, idempotency)
+    archived = session.get(TodoItemArchive, item_id)
+    if not archived:
+        raise ArchivedItemNotFoundError(str(item_id))
+    list_id = archived.list_id
+    _lock_todo_list(session, list_id)
+
+    item = TodoItem(
+        id=archived.id,
+        list_id=list_id,
+        title=archived.title,
+        description=archived.description,
+        notes=archived.notes,
+        status=archived.status,
+        due_date=archived.due_date,
+        completed_at=archived.completed_at,
+        created_at=archived.created_at,
+        position=_next_position(session, list_id),
+    )
+    tags = list(archived.tags)
+    session.delete(archived)
+    session.flush()
+    session.add(item)
+    session.flush()
+    _synchronize_tags(session, item, tags)
+
+    _record_response(session, idempotency, item)
+    session.commit()
+    invalidate_list(list_id)
+    session.refresh(item)
+    return item
+
+
+def purge_expired_idempotency_keys(session: Session, *, batch_size: int) -> int:
+    """Delete up to ``batch_size`` idempotency keys past their expiry and commit."""
+
+    expired = TodoIdempotencyKey.expires_at <= datetime.now(tz=UTC)
+    batch = select(TodoIdempotencyKey.key).where(expired).limit(batch_size)
+    result = session.execute(delete(TodoIdempotencyKey).where(TodoIdempotencyKey.key.in_(batch)))
+    session.commit()
+    return result.rowcount
+
+
+def collect_expired_idempotency_keys(bind: Engine | Connection, *, batch_size: int) -> int:
+    """Purge expired idempotency keys batch by batch until none remain; intended for background jobs."""
+
+    removed = 0
+    with Session(bind) as session:
+        while True:
+            deleted = purge_expired_idempotency_keys(session, batch_size=batch_size)
+            removed += deleted
+            if deleted < batch_size:
+                return removed
+
+
+def _replay_if_recorded(session: Session, idempotency: IdempotentWrite | None) -> None:
+    """Raise ``IdempotentReplay`` when this request's response is already stored.
+
+    Runs at the start of every attempt: a request that lost the race to store the same key
+    fails on the key's primary key, is retried and then replays the winner's response.
+    """
+
+    if idempotency is None:
+        return
+    recorded = session.get(TodoIdempotencyKey, idempotency.key)
+    if recorded is None:
+        return
+    if _as_utc(recorded.expires_at) <= datetime.now(tz=UTC):
+        session.delete(recorded)
+        session.flush()
+        return
+    if recorded.fingerprint != idempotency.fingerprint:
+        raise IdempotencyKeyReusedError(idempotency.key)
+    raise IdempotentReplay(recorded.status_code, recorded.response_body)
+
+
+def _record_response(session: Session, idempotency: IdempotentWrite | None, result: object) -> None:
+    if idempotency is None:
+        return
+    # Render what the row reads back as (server-side updated_at, database-normalized timestamps),
+    # so a replay matches the original response.
+    session.flush()
+    if result is not None:
+        session.refresh(result)
+    session.add(
+        TodoIdempotencyKey(
+            key=idempotency.key,
+            fingerprint=idempotency.fingerprint,
+            status_code=idempotency.status_code,
+            response_body=idempotency.render(result),
+            expires_at=datetime.now(tz=UTC) + idempotency.ttl,
+        )
+    )
+
+
+@dataclass
+class DailyStats:
+    day: date
+    created: int
+    completed: int
+    median_completion_seconds: float | None
+
+
+@dataclass
+class ListStats:
+    days: list[DailyStats]
+    created: int
+    completed: int
+    median_completion_seconds: float | None
+    refreshed_through: datetime | None
+
+
+def refresh_daily_stats_batch(session: Session, *, until: datetime, window: timedelta) -> bool:
+    """Fold item events after the watermark, up to ``until`` and at most ``window`` of them, into
+    ``todo_daily_stats`` and advance the watermark in the same commit.
+
+    The watermark row is locked first, so concurrent refreshes (one per worker) queue and each
+    event is counted once. Returns False when the rollup was already up to date.
+    """
+
+    state = session.exec(
+        select(TodoStatsWatermark)
+        .where(TodoStatsWatermark.name == _DAILY_STATS_WATERMARK)
+        .with_for_update()
+    ).scalar_one_or_none()
+    if state is None:
+        # First run: start just before the oldest item so the whole history is backfilled.
+        earliest = session.exec(select(func.min(TodoItem.created_at))).scalar_one()
+        start = _as_utc(earliest) - timedelta(microseconds=1) if earliest is not None else until
+        state = TodoStatsWatermark(name=_DAILY_STATS_WATERMARK, watermark=start)
+        session.add(state)
+    watermark = _as_utc(state.watermark)
+    if watermark >= until:
+        session.commit()
+        return False
+    window_end = min(until, watermark + window)
+
+    rollup: dict[tuple[UUID, date], TodoDailyStats] = {}
+
+    def row(list_id: UUID, moment: datetime) -> TodoDailyStats:
+        key = (list_id, _as_utc(moment).date())
+        if key not in rollup:
+            rollup[key] = TodoDailyStats(list_id=list_id, day=key[1])
+        return rollup[key]
+
+    created = session.exec(
+        select(TodoItem.list_id, TodoItem.created_at).where(
+            TodoItem.created_at > watermark, TodoItem.created_at <= window_end
+        )
+    ).all()
+    for list_id, created_at in created:
+        row(list_id, created_at).created_count += 1
+
+    completed = session.exec(
+        select(TodoItem.list_id, TodoItem.created_at, TodoItem.completed_at).where(
+            TodoItem.status == TodoStatus.done,
+            TodoItem.completed_at > watermark,
+            TodoItem.completed_at <= window_end,
+        )
+    ).all()
+    for list_id, created_at, completed_at in completed:
+        stats = row(list_id, completed_at)
+        stats.completed_count += 1
+        seconds = (_as_utc(completed_at) - _as_utc(created_at)).total_seconds()
+        bucket = str(_duration_bucket(seconds))
+        stats.completion_histogram[bucket] = stats.completion_histogram.get(bucket, 0) + 1
+
+    if rollup:
+        existing = session.exec(
+            select(TodoDailyStats).where(
+                tuple_(TodoDailyStats.list_id, TodoDailyStats.day).in_(list(rollup))
+            )
+        ).scalars()
+        for current in existing:
+            delta = rollup.pop((current.list_id, current.day))
+            current.created_count += delta.created_count
+            current.completed_count += delta.completed_count
+            current.completion_histogram = _merge_histograms(
+                [current.completion_histogram, delta.completion_histogram]
+            )
+            session.add(current)
+        session.add_all(rollup.values())
+
+    state.watermark = window_end
+    session.add(state)
+    session.commit()
+    return True
+
+
+def refresh_daily_stats(bind: Engine | Connection, *, lag: timedelta, window: timedelta) -> int:
+    """Bring the daily rollup up to ``lag`` before now; intended for background jobs.
+
+    Returns the number of windows folded in. Events stay out of the rollup until ``lag`` has
+    passed, by which time the transactions that wrote them have committed.
+    """
+
+    until = datetime.now(tz=UTC) - lag
+    refreshed = 0
+    with Session(bind) as session:
+        while _retry_on_conflict(
+            session, lambda: refresh_daily_stats_batch(session, until=until, window=window)
+        ):
+            refreshed += 1
+    return refreshed
+
+
+def get_list_stats(session: Session, list_id: UUID, *, day_from: date, day_to: date) -> ListStats:
+    """Daily created/completed counts for ``day_from`` up to (excluding) ``day_to``, zero-filled.
+
+    Reads only the rollup, so the cost depends on the number of days, not on the list's history.
+    """
+
+    _get_todo_list(session, list_id)
+    rows = {
+        stats.day: stats
+        for stats in session.exec(
+            select(TodoDailyStats).where(
+                TodoDailyStats.list_id == list_id,
+                TodoDailyStats.day >= day_from,
+                TodoDailyStats.day < day_to,
+            )
+        ).scalars()
+    }
+    refreshed_through = session.exec(
+        select(TodoStatsWatermark.watermark).where(
+            TodoStatsWatermark.name == _DAILY_STATS_WATERMARK
+        )
+    ).scalar_one_or_none()
+
+    days = []
+    for offset in range((day_to - day_from).days):
+        day = day_from + timedelta(days=offset)
+        stats = rows.get(day)
+        days.append(
+            DailyStats(
+                day=day,
+                created=stats.created_count if stats else 0,
+                completed=stats.completed_count if stats else 0,
+                median_completion_seconds=(
+                    _histogram_median(stats.completion_histogram) if stats else None
+                ),
+            )
+        )
+    return ListStats(
+        days=days,
+        created=sum(stats.created_count for stats in rows.values()),
+        completed=sum(stats.completed_count for stats in rows.values()),
+        median_completion_seconds=_histogram_median(
+            _merge_histograms(stats.completion_histogram for stats in rows.values())
+        ),
+        refreshed_through=_as_utc(refreshed_through) if refreshed_through else None,
+    )
+
+
+def _duration_bucket(seconds: float) -> int:
+    """Bucket ``i`` holds durations in [2 ** (i / 4), 2 ** ((i + 1) / 4)) seconds."""
+
+    return int(_BUCKETS_PER_DOUBLING * math.log2(max(seconds, 1.0)))
+
+
+def _merge_histograms(histograms: Iterable[dict[str, int]]) -> dict[str, int]:
+    merged: dict[str, int] = {}
+    for histogram in histograms:
+        for bucket, count in histogram.items():
+            merged[bucket] = merged.get(bucket, 0) + count
+    return merged
+
+
+def _histogram_median(histogram: dict[str, int]) -> float | None:
+    total = sum(histogram.values())
+    if not total:
+        return None
+    target = total / 2
+    seen = 0
+    for bucket, count in sorted((int(bucket), count) for bucket, count in histogram.items()):
+        if seen + count >= target:
+            # Interpolate geometrically within the bucket.
+            fraction = (target - seen) / count
+            return round(2 ** ((bucket + fraction) / _BUCKETS_PER_DOUBLING), 1)
+        seen += count
+    return None
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they were stored as UTC.
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _resequence_item(session: Session, item: TodoItem, desired_position: int | None) -> None:
+    items = _ordered_items(session, item.list_id)
 
     others = [existing for existing in items if existing.id != item.id]
 
@@ -219,13 +1033,11 @@ def _resequence_item(session: Session, item: TodoItem, desired_position: int | N
 
 
 def _resequence_all(session: Session, list_id: UUID) -> None:
-    items = session.exec(
-        select(TodoItem)
-        .where(TodoItem.list_id == list_id)
-        .order_by(TodoItem.position.asc(), TodoItem.created_at.asc())
-    ).scalars().all()
+    _apply_ordered_positions(session, _ordered_items(session, list_id))
+
 
-    _apply_ordered_positions(session, items)
+def _ordered_items(session: Session, list_id: UUID) -> list[TodoItem]:
+    return session.exec(_ITEMS_IN_ORDER, params={"list_id": list_id}).scalars().all()
 
 
 def _synchronize_tags(session: Session, item: TodoItem, tags: Iterable[str] | None) -> None:
@@ -249,9 +1061,7 @@ def _synchronize_tags(session: Session, item: TodoItem, tags: Iterable[str] | No
     normalized_lower = [tag.lower() for tag in normalized]
 
     existing_tags = (
-        session.exec(
-            select(TodoTag).where(func.lower(TodoTag.name).in_(normalized_lower))
-        )
+        session.exec(_TAGS_BY_NAME_FOR_KEY_SHARE, params={"names": normalized_lower})
         .scalars()
         .all()
     )
@@ -275,6 +1085,17 @@ def _normalize_tag(tag: str) -> str:
     return tag.strip().lower()
 
 
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _load_tags_in_list(list_id: UUID) -> LoaderOption:
+    # Pinning the link rows to the list lets a hash-partitioned layout prune both tables. The
+    # criterion is a literal rather than a bound parameter because the separate selectin query
+    # does not receive the parent statement's parameters, so the option is added per call.
+    return selectinload(TodoItem.tags.and_(TodoItemTagLink.list_id == list_id))
+
+
 def _sort_items(todo_list: TodoList) -> None:
     todo_list.items.sort(key=lambda item: (item.position, item.created_at))
 
@@ -287,19 +1108,31 @@ def _update_completion_timestamp(item: TodoItem) -> None:
 
 
 def _next_position(session: Session, list_id: UUID) -> int:
-    result = session.exec(
-        select(func.count()).select_from(TodoItem).where(TodoItem.list_id == list_id)
-    ).one()
-    return int(result[0]) if result is not None else 0
+    return session.exec(_ITEM_COUNT, params={"list_id": list_id}).scalar_one()
+
+
+def _encode_cursor(due_date: datetime, item_id: UUID) -> str:
+    raw = f"{due_date.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        due_date_raw, item_id_raw = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(due_date_raw), UUID(item_id_raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise InvalidCursorError(cursor) from error
 
 
 def _apply_ordered_positions(session: Session, items: list[TodoItem]) -> None:
     if not items:
         return
 
-    placeholder_base = 1000
+    # Park rows on negative placeholders first so no interim position collides with
+    # uq_todo_items_list_position, however long the list is.
     for index, current in enumerate(items):
-        placeholder = placeholder_base + index
+        placeholder = -(index + 1)
         if current.position != placeholder:
             current.position = placeholder
             session.add(current)
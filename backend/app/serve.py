@@ -0,0 +1,75 @@
+"""Production entrypoint: ``python -m app.serve``.
+
+Starts a multi-process uvicorn server sized from the CPU count (or ``WEB_CONCURRENCY``) using the
+uvloop event loop and httptools parser when available. Each worker finishes the application
+lifespan warm-up before it accepts connections, and SIGTERM drains in-flight requests for up to
+``GRACEFUL_SHUTDOWN_TIMEOUT`` seconds.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+
+import uvicorn
+
+from app.core.cache import resolve_cache_backend, resolve_read_coalescing_ttl
+from app.core.logging import configure_logging
+from app.core.settings import Settings, get_settings
+
+
+def default_worker_count() -> int:
+    """Return the CPUs this process may run on, honouring affinity masks in containers."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def server_options(settings: Settings) -> dict[str, object]:
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    return {
+        "host": settings.server_host,
+        "port": settings.server_port,
+        "workers": settings.web_concurrency or default_worker_count(),
+        "loop": "uvloop" if has_uvloop else "asyncio",
+        "http": "httptools" if has_httptools else "h11",
+        "lifespan": "on",
+        "timeout_graceful_shutdown": settings.graceful_shutdown_timeout,
+        "proxy_headers": True,
+        # Leave logging to configure_logging; access lines come from RequestContextMiddleware.
+        "log_config": None,
+        "access_log": False,
+    }
+
+
+def check_worker_settings(settings: Settings, workers: int) -> None:
+    """Reject settings that are only correct within a single worker process."""
+
+    if workers > 1 and resolve_cache_backend(settings) == "memory":
+        # Version counters live in each worker, so a write would only retire its own worker's
+        # cached bodies and the others would serve stale data for up to CACHE_TTL.
+        raise SystemExit(
+            "CACHE_BACKEND=memory only invalidates within one process; "
+            "use CACHE_BACKEND=redis or none, or WEB_CONCURRENCY=1"
+        )
+    no_backend = resolve_cache_backend(settings) == "none"
+    if workers > 1 and no_backend and resolve_read_coalescing_ttl(settings) > 0:
+        # Without a backend the versions keying coalesced reads are per worker as well.
+        raise SystemExit(
+            "READ_COALESCING_TTL > 0 needs a shared version store with several workers; "
+            "set CACHE_URL, READ_COALESCING_TTL=0 or WEB_CONCURRENCY=1"
+        )
+
+
+def main() -> None:
+    settings = get_settings()
+    configure_logging(settings)
+    options = server_options(settings)
+    check_worker_settings(settings, options["workers"])
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
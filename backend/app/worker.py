@@ -0,0 +1,55 @@
+"""Background job worker: ``python -m app.worker``.
+
+Claims due jobs from the ``jobs`` table in batches with ``FOR UPDATE SKIP LOCKED``, so any number
+of worker processes can share the queue, and runs them on ``JOB_CONCURRENCY`` threads. Failed jobs
+are retried with exponential backoff up to ``JOB_MAX_ATTEMPTS`` times. SIGTERM stops claiming and
+lets running jobs finish. Counters are logged every minute and at shutdown.
+"""
+
+from __future__ import annotations
+
+import logging
+import signal
+import threading
+
+from app.core.database import dispose_engine, get_engine
+from app.core.logging import configure_logging
+from app.core.metrics import metrics
+from app.core.settings import get_settings
+from app.modules import load_all_modules, load_job_handlers
+from app.modules.jobs.worker import JobWorker
+
+logger = logging.getLogger("app.worker")
+
+METRICS_LOG_INTERVAL = 60.0
+
+
+def _log_metrics() -> None:
+    counters = {name: value for name, value in metrics.snapshot().items() if name.startswith("job")}
+    logger.info("Job worker metrics", extra={"metrics": counters})
+
+
+def main() -> None:
+    settings = get_settings()
+    configure_logging(settings)
+    load_all_modules()
+    load_job_handlers()
+
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+
+    def report() -> None:
+        while not stop.wait(METRICS_LOG_INTERVAL):
+            _log_metrics()
+
+    threading.Thread(target=report, name="job-metrics", daemon=True).start()
+    try:
+        JobWorker.from_settings(get_engine(), settings).run(stop)
+    finally:
+        _log_metrics()
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Embedded SQLite vs Postgres throughput: ``python -m benchmarks.embedded`` from ``backend/``.
+
+Runs the same request-shaped workload against the tuned SQLite mode (a fresh database file under
+a temporary directory, one writer connection plus a reader pool, see ``app.core.sqlite``) and
+against Postgres (a throwaway ``bench_embedded`` schema in ``--postgres-url``, default
+``DATABASE_URL``). Each backend gets the same seeded lists, then ``--threads`` threads issue
+operations for ``--duration`` seconds, each in a fresh session as a request would: reads (list
+items, list detail, item lookup) on the read engine and, with probability ``--write-ratio``,
+writes (create an item, change an item's status) on the write engine.
+
+Reported per backend: operations per second overall and split into reads and writes, p50/p95
+latency of each kind, and failed operations. Results are appended to
+``benchmarks/results/embedded.jsonl``. Pass ``--skip-postgres`` to measure SQLite alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel
+
+from app.core.settings import Settings, get_settings
+from app.core.sqlite import create_sqlite_engines
+from app.modules import load_all_modules
+from app.modules.todos import service
+from app.modules.todos.models import TodoStatus
+from app.modules.todos.schemas import TodoItemCreate, TodoItemUpdate, TodoListCreate
+
+from .history import RESULTS_DIR, append_result, previous_result, run_metadata
+
+DEFAULT_OUTPUT = RESULTS_DIR / "embedded.jsonl"
+POSTGRES_SCHEMA = "bench_embedded"
+
+Operation = Callable[[Session, random.Random], object]
+
+
+def seed(engine: Engine, *, lists: int, items_per_list: int) -> dict[UUID, list[UUID]]:
+    """Create the lists through the service and return the item ids of each."""
+
+    items: dict[UUID, list[UUID]] = {}
+    with Session(engine) as session:
+        for index in range(lists):
+            list_id = service.create_todo_list(session, TodoListCreate(name=f"list {index}")).id
+            items[list_id] = [
+                service.create_item(
+                    session,
+                    list_id,
+                    TodoItemCreate(title=f"item {position}", tags=[f"tag{position % 5}"]),
+                ).id
+                for position in range(items_per_list)
+            ]
+    return items
+
+
+def workload(items: dict[UUID, list[UUID]]) -> tuple[list[Operation], list[Operation]]:
+    list_ids = list(items)
+    statuses = list(TodoStatus)
+
+    def list_items(session: Session, rng: random.Random) -> object:
+        return service.list_items(session, rng.choice(list_ids))
+
+    def list_detail(session: Session, rng: random.Random) -> object:
+        return service.get_todo_list(session, rng.choice(list_ids), include_items=True)
+
+    def get_item(session: Session, rng: random.Random) -> object:
+        return service.get_item(session, rng.choice(items[rng.choice(list_ids)]))
+
+    def create_item(session: Session, rng: random.Random) -> object:
+        return service.create_item(
+            session, rng.choice(list_ids), TodoItemCreate(title="benchmark", tags=["bench"])
+        )
+
+    def change_status(session: Session, rng: random.Random) -> object:
+        item_id = rng.choice(items[rng.choice(list_ids)])
+        return service.update_item(session, item_id, TodoItemUpdate(status=rng.choice(statuses)))
+
+    return [list_items, list_detail, get_item], [create_item, change_status]
+
+
+def run(
+    writer: Engine,
+    reader: Engine,
+    items: dict[UUID, list[UUID]],
+    *,
+    threads: int,
+    duration: float,
+    write_ratio: float,
+    seed: int,
+) -> dict[str, Any]:
+    reads, writes = workload(items)
+    latencies: dict[str, list[float]] = {"read": [], "write": []}
+    failures = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        nonlocal failures
+        rng = random.Random(seed + index)
+        local: dict[str, list[float]] = {"read": [], "write": []}
+        local_failures = 0
+        while time.perf_counter() < deadline:
+            kind = "write" if rng.random() < write_ratio else "read"
+            operation = rng.choice(writes if kind == "write" else reads)
+            started = time.perf_counter()
+            try:
+                with Session(writer if kind == "write" else reader) as session:
+                    operation(session, rng)
+            except Exception:
+                local_failures += 1
+                continue
+            local[kind].append((time.perf_counter() - started) * 1000)
+        with lock:
+            for kind, samples in local.items():
+                latencies[kind].extend(samples)
+            failures += local_failures
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    result: dict[str, Any] = {
+        "ops_per_s": round((len(latencies["read"]) + len(latencies["write"])) / elapsed, 1),
+        "failed": failures,
+    }
+    for kind, samples in latencies.items():
+        result[f"{kind}s_per_s"] = round(len(samples) / elapsed, 1)
+        result[f"{kind}_p50_ms"] = round(statistics.median(samples), 2) if samples else None
+        result[f"{kind}_p95_ms"] = (
+            round(statistics.quantiles(samples, n=20)[-1], 2) if len(samples) > 1 else None
+        )
+    return result
+
+
+def sqlite_engines(directory: Path, *, threads: int) -> tuple[Engine, Engine]:
+    settings = Settings(
+        database_url=f"sqlite:///{directory / 'embedded.db'}",
+        database_pool_size=threads,
+        database_max_overflow=0,
+        sqlite_busy_timeout=30.0,
+    )
+    writer, reader = create_sqlite_engines(settings)
+    SQLModel.metadata.create_all(writer)
+    return writer, reader
+
+
+def postgres_engine(url: str, *, threads: int) -> Engine:
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {POSTGRES_SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {POSTGRES_SCHEMA}"))
+    admin.dispose()
+    engine = create_engine(
+        url,
+        pool_size=threads,
+        max_overflow=0,
+        connect_args={"options": f"-csearch_path={POSTGRES_SCHEMA}"},
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def drop_postgres_schema(url: str) -> None:
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f"DROP SCHEMA {POSTGRES_SCHEMA} CASCADE"))
+    admin.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lists", type=int, default=20)
+    parser.add_argument("--items-per-list", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent request threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per backend")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of writes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--postgres-url", help="Postgres to compare against (default DATABASE_URL)")
+    parser.add_argument("--skip-postgres", action="store_true", help="Only measure SQLite")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--no-record", action="store_true", help="Print results without saving")
+    args = parser.parse_args(argv)
+
+    postgres_url = args.postgres_url or get_settings().database_url
+    if not args.skip_postgres and not postgres_url.startswith("postgresql"):
+        parser.exit(1, "Pass --postgres-url (or a Postgres DATABASE_URL), or --skip-postgres.\n")
+
+    load_all_modules()
+    options = {
+        "threads": args.threads,
+        "duration": args.duration,
+        "write_ratio": args.write_ratio,
+        "seed": args.seed,
+    }
+    result: dict[str, Any] = {
+        **run_metadata(),
+        "lists": args.lists,
+        "items_per_list": args.items_per_list,
+        **options,
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer, reader = sqlite_engines(Path(directory), threads=args.threads)
+        try:
+            items = seed(writer, lists=args.lists, items_per_list=args.items_per_list)
+            result["sqlite"] = run(writer, reader, items, **options)
+        finally:
+            writer.dispose()
+            reader.dispose()
+
+    if not args.skip_postgres:
+        engine = postgres_engine(postgres_url, threads=args.threads)
+        try:
+            items = seed(engine, lists=args.lists, items_per_list=args.items_per_list)
+            result["postgres"] = run(engine, engine, items, **options)
+        finally:
+            engine.dispose()
+            drop_postgres_schema(postgres_url)
+
+    _print_comparison(result, previous_result(args.output))
+    if not args.no_record:
+        append_result(args.output, result)
+
+
+def _print_comparison(result: dict[str, Any], previous: dict[str, Any] | None) -> None:
+    backends = [name for name in ("sqlite", "postgres") if name in result]
+    print(f"{'':<16}" + "".join(f"{name:>12}" for name in backends))
+    for metric in result["sqlite"]:
+        print(f"{metric:<16}" + "".join(f"{result[name][metric]!s:>12}" for name in backends))
+    if previous:
+        print(f"\nprevious run: {previous.get('commit')} at {previous.get('measured_at')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Append-only JSONL result history shared by the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+
+
+def run_metadata() -> dict[str, Any]:
+    """When and on which commit (and whether ``app/`` had local changes) a result was measured."""
+
+    return {
+        "measured_at": datetime.now(tz=UTC).isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--", "app")),
+        "python": platform.python_version(),
+    }
+
+
+def previous_result(output: Path) -> dict[str, Any] | None:
+    if not output.exists():
+        return None
+    lines = [line for line in output.read_text().splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def append_result(output: Path, result: dict[str, Any]) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a") as handle:
+        handle.write(json.dumps(result) + "\n")
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
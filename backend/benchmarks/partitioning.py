@@ -0,0 +1,284 @@
+"""Plain vs hash-partitioned ``todo_items``: ``python -m benchmarks.partitioning`` from ``backend/``.
+
+Builds both layouts side by side in throwaway schemas (``bench_plain`` and ``bench_hash``) of the
+Postgres database in ``DATABASE_URL``, loads the same generated data into each and then compares:
+
+* bulk load time and total index size of ``todo_items`` + ``todo_item_tags``;
+* ``VACUUM (ANALYZE)`` time on both tables;
+* latency of the real ``service.py`` operations (list items, list detail, insert at the head of a
+  list, move, delete, item lookup by id) on random lists;
+* partition pruning, read from ``EXPLAIN`` of every SELECT/UPDATE/DELETE those operations ran:
+  the most partitions one statement touched and how many statements touched more than one. Only
+  the lookup of an item by bare id (the first step of move/delete) has to probe every partition.
+
+Medians are appended to ``benchmarks/results/partitioning.jsonl``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel
+
+from app.core.settings import get_settings
+from app.db.partitioning import partition_statements
+from app.modules import load_all_modules
+from app.modules.todos import service
+from app.modules.todos.schemas import TodoItemCreate, TodoItemUpdate
+
+from .history import RESULTS_DIR, append_result, previous_result, run_metadata
+
+DEFAULT_OUTPUT = RESULTS_DIR / "partitioning.jsonl"
+LAYOUTS = ("plain", "hash")
+_PARTITION_NAME = re.compile(r"^(todo_items|todo_item_tags)_p\d+$")
+
+_LOAD_STATEMENTS = (
+    "INSERT INTO todo_lists (id, name, created_at, updated_at) "
+    "SELECT gen_random_uuid(), 'list ' || g, now(), now() FROM generate_series(1, :lists) g",
+    "INSERT INTO todo_tags (id, name, created_at, updated_at) "
+    "SELECT gen_random_uuid(), 'tag' || g, now(), now() FROM generate_series(1, :tags) g",
+    "INSERT INTO todo_items "
+    "(id, list_id, title, status, due_date, completed_at, position, created_at, updated_at) "
+    "SELECT gen_random_uuid(), l.id, 'item ' || p, "
+    "(ARRAY['todo', 'in_progress', 'blocked', 'done'])[1 + p % 4], "
+    "now() + (p % 60) * interval '1 day', CASE WHEN p % 4 = 3 THEN now() END, p, now(), now() "
+    "FROM todo_lists l CROSS JOIN generate_series(0, :items_per_list - 1) p",
+    "INSERT INTO todo_item_tags (item_id, tag_id, list_id) "
+    "SELECT i.id, t.id, i.list_id FROM todo_items i "
+    "JOIN todo_tags t ON t.name = 'tag' || (1 + abs(hashtext(i.id::text)) % :tags)",
+)
+
+
+def build_layout(
+    url: str, layout: str, *, partitions: int, lists: int, items_per_list: int, tags: int
+) -> tuple[Engine, dict[str, float]]:
+    schema = f"bench_{layout}"
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    admin.dispose()
+
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as connection:
+        SQLModel.metadata.create_all(connection)
+        if layout == "hash":
+            for statement in partition_statements(partitions):
+                connection.execute(text(statement))
+
+    params = {"lists": lists, "items_per_list": items_per_list, "tags": tags}
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for statement in _LOAD_STATEMENTS:
+            connection.execute(text(statement), params)
+    load_s = time.perf_counter() - started
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+        started = time.perf_counter()
+        connection.execute(text("VACUUM (ANALYZE) todo_items, todo_item_tags"))
+        vacuum_s = time.perf_counter() - started
+        index_bytes = connection.execute(
+            text(
+                "SELECT sum(pg_indexes_size(relid)) FROM ("
+                "SELECT relid FROM pg_partition_tree('todo_items') UNION ALL "
+                "SELECT relid FROM pg_partition_tree('todo_item_tags')) tables"
+            )
+        ).scalar_one()
+
+    return engine, {
+        "load_s": round(load_s, 2),
+        "vacuum_s": round(vacuum_s, 2),
+        "index_mb": round(int(index_bytes) / 1024 / 1024, 1),
+    }
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[list[tuple[str, Any]]]:
+    captured: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany and statement.lstrip().upper().startswith(
+            ("SELECT", "UPDATE", "DELETE")
+        ):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def partitions_touched(engine: Engine, statements: list[tuple[str, Any]]) -> list[int]:
+    """Number of partitions each statement's plan reads from or writes to."""
+
+    touched = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            ).scalar_one()
+            relations = set(_relation_names(plan[0]["Plan"]))
+            touched.append(sum(1 for name in relations if _PARTITION_NAME.match(name)))
+        connection.rollback()
+    return touched
+
+
+def _relation_names(node: dict[str, Any]) -> Iterator[str]:
+    if "Relation Name" in node:
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from _relation_names(child)
+
+
+def operations() -> dict[str, Callable[[Session, UUID], object]]:
+    def lookup_item(session: Session, list_id: UUID) -> object:
+        item_id = session.execute(
+            text("SELECT id FROM todo_items WHERE list_id = :list_id LIMIT 1"), {"list_id": list_id}
+        ).scalar_one()
+        return service.get_item(session, item_id)
+
+    def move_last_to_head(session: Session, list_id: UUID) -> object:
+        item_id = session.execute(
+            text(
+                "SELECT id FROM todo_items WHERE list_id = :list_id ORDER BY position DESC LIMIT 1"
+            ),
+            {"list_id": list_id},
+        ).scalar_one()
+        return service.update_item(session, item_id, TodoItemUpdate(position=0))
+
+    def delete_head(session: Session, list_id: UUID) -> object:
+        item_id = session.execute(
+            text("SELECT id FROM todo_items WHERE list_id = :list_id AND position = 0"),
+            {"list_id": list_id},
+        ).scalar_one()
+        return service.delete_item(session, item_id)
+
+    return {
+        "list_items": lambda session, list_id: service.list_items(session, list_id),
+        "list_detail": lambda session, list_id: service.get_todo_list(
+            session, list_id, include_items=True
+        ),
+        "list_items_by_tag": lambda session, list_id: service.list_items(
+            session, list_id, tag="tag1"
+        ),
+        "create_item_at_head": lambda session, list_id: service.create_item(
+            session, list_id, TodoItemCreate(title="benchmark", position=0, tags=["tag1"])
+        ),
+        "move_item": move_last_to_head,
+        "delete_item": delete_head,
+        "get_item_by_id": lookup_item,
+    }
+
+
+def measure(engine: Engine, *, iterations: int, seed: int) -> dict[str, dict[str, float]]:
+    with engine.connect() as connection:
+        list_ids = list(connection.execute(text("SELECT id FROM todo_lists")).scalars())
+    rng = random.Random(seed)
+    results: dict[str, dict[str, float]] = {}
+    for name, operation in operations().items():
+        samples: list[float] = []
+        widest = unpruned = 0
+        for _ in range(iterations):
+            list_id = rng.choice(list_ids)
+            with Session(engine) as session, capture_statements(engine) as statements:
+                started = time.perf_counter()
+                operation(session, list_id)
+                samples.append((time.perf_counter() - started) * 1000)
+                session.rollback()
+            touched = partitions_touched(engine, statements)
+            widest = max(widest, *touched, 0)
+            unpruned = max(unpruned, sum(1 for count in touched if count > 1))
+        results[name] = {
+            "p50_ms": round(statistics.median(samples), 2),
+            "p95_ms": round(statistics.quantiles(samples, n=20)[-1], 2)
+            if len(samples) > 1
+            else None,
+            "partitions": widest,
+            "unpruned_statements": unpruned,
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lists", type=int, default=2000)
+    parser.add_argument("--items-per-list", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=500)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=50, help="Samples per operation")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark schemas")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--no-record", action="store_true", help="Print results without saving")
+    args = parser.parse_args(argv)
+
+    url = get_settings().database_url
+    if not url.startswith("postgresql"):
+        parser.exit(1, "DATABASE_URL must point at Postgres; partitioning is Postgres-only.\n")
+
+    load_all_modules()
+    result: dict[str, Any] = {
+        **run_metadata(),
+        "lists": args.lists,
+        "items_per_list": args.items_per_list,
+        "partitions": args.partitions,
+        "iterations": args.iterations,
+    }
+    for layout in LAYOUTS:
+        engine, storage = build_layout(
+            url,
+            layout,
+            partitions=args.partitions,
+            lists=args.lists,
+            items_per_list=args.items_per_list,
+            tags=args.tags,
+        )
+        try:
+            timings = measure(engine, iterations=args.iterations, seed=args.seed)
+            result[layout] = {**storage, "operations": timings}
+        finally:
+            engine.dispose()
+        if not args.keep:
+            admin = create_engine(url, isolation_level="AUTOCOMMIT")
+            with admin.connect() as connection:
+                connection.execute(text(f"DROP SCHEMA bench_{layout} CASCADE"))
+            admin.dispose()
+
+    _print_comparison(result, previous_result(args.output))
+    if not args.no_record:
+        append_result(args.output, result)
+
+
+def _print_comparison(result: dict[str, Any], previous: dict[str, Any] | None) -> None:
+    plain, hashed = result["plain"], result["hash"]
+    print(f"{'':<22}{'plain':>12}{'hash':>12}")
+    for metric in ("load_s", "vacuum_s", "index_mb"):
+        print(f"{metric:<22}{plain[metric]:>12}{hashed[metric]:>12}")
+    print(
+        f"\n{'operation (p50 ms)':<22}{'plain':>12}{'hash':>12}{'partitions':>12}{'unpruned':>10}"
+    )
+    for name, stats in plain["operations"].items():
+        hashed_stats = hashed["operations"][name]
+        print(
+            f"{name:<22}{stats['p50_ms']:>12}{hashed_stats['p50_ms']:>12}"
+            f"{hashed_stats['partitions']:>12}{hashed_stats['unpruned_statements']:>10}"
+        )
+    if previous:
+        print(f"\nprevious run: {previous.get('commit')} at {previous.get('measured_at')}")
+
+
+if __name__ == "__main__":
+    main()
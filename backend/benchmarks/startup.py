@@ -0,0 +1,98 @@
+"""Cold-start benchmark: ``python -m benchmarks.startup`` from ``backend/``.
+
+Each run starts a fresh interpreter and measures how long ``import app.main`` takes, how long the
+application lifespan (warm-up) takes, and how long the first ``/api/healthz`` request takes after
+that. Medians across runs are appended to ``benchmarks/results/startup.jsonl`` together with the
+commit they were measured on, so regressions show up when the file is compared over time.
+
+The database used during warm-up comes from the usual settings (``DATABASE_URL``); an unreachable
+database is tolerated by the warm-up, but point it at a real one for numbers comparable to
+production.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .history import BACKEND_DIR, RESULTS_DIR, append_result, previous_result, run_metadata
+
+DEFAULT_OUTPUT = RESULTS_DIR / "startup.jsonl"
+METRICS = ("import_ms", "lifespan_ms", "first_request_ms", "time_to_first_request_ms", "process_ms")
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(app.main.app)
+client_ready = time.perf_counter()
+with client:
+    lifespan_done = time.perf_counter()
+    response = client.get("/api/healthz")
+    answered = time.perf_counter()
+import_ms = (imported - started) * 1000
+lifespan_ms = (lifespan_done - client_ready) * 1000
+first_request_ms = (answered - lifespan_done) * 1000
+print(json.dumps({
+    "status": response.status_code,
+    "import_ms": import_ms,
+    "lifespan_ms": lifespan_ms,
+    "first_request_ms": first_request_ms,
+    "time_to_first_request_ms": import_ms + lifespan_ms + first_request_ms,
+}))
+"""
+
+
+def run_once() -> dict[str, float]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    sample = json.loads(completed.stdout.strip().splitlines()[-1])
+    if sample.pop("status") != 200:
+        raise RuntimeError("First request did not return 200; is the lifespan warm-up failing?")
+    sample["process_ms"] = elapsed_ms
+    return sample
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters to measure")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSONL history file")
+    parser.add_argument("--no-record", action="store_true", help="Print results without saving")
+    args = parser.parse_args(argv)
+
+    run_once()  # populate bytecode caches so every measured run starts equally warm on disk
+    samples = [run_once() for _ in range(args.runs)]
+
+    result: dict[str, object] = {**run_metadata(), "runs": args.runs}
+    for metric in METRICS:
+        values = [sample[metric] for sample in samples]
+        result[metric] = round(statistics.median(values), 1)
+        result[f"{metric}_min"] = round(min(values), 1)
+
+    previous = previous_result(args.output)
+    for metric in METRICS:
+        line = f"{metric:<26}{result[metric]:>9.1f} ms"
+        if previous and metric in previous:
+            line += f"  ({result[metric] - previous[metric]:+.1f} vs {previous.get('commit')})"
+        print(line)
+
+    if not args.no_record:
+        append_result(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
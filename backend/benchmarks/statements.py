@@ -0,0 +1,183 @@
+"""Per-call overhead of the hot todo queries: ``python -m benchmarks.statements`` from ``backend/``.
+
+Runs the read paths of ``service.py`` (the item list with each filter combination, item lookups,
+list detail, the next-position count and a resequence) against a small in-memory SQLite database,
+where the database work is a few microseconds and the time measured is mostly Python: building
+statements, SQLAlchemy's cache lookups and ORM loading. Each call gets a fresh session, as a
+request does. The best of several samples (the least disturbed by other load, as with ``timeit``)
+is appended to ``benchmarks/results/statements.jsonl`` in microseconds per call.
+
+Timings drift between runs on shared machines, so for a before/after comparison pass
+``--baseline <git ref>``: ``service.py`` from that ref is loaded alongside the working tree's and
+the two are sampled in turn within one process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.modules import load_all_modules
+from app.modules.todos import service
+from app.modules.todos.models import TodoStatus
+from app.modules.todos.schemas import TodoItemCreate, TodoListCreate
+
+from .history import BACKEND_DIR, RESULTS_DIR, append_result, previous_result, run_metadata
+
+DEFAULT_OUTPUT = RESULTS_DIR / "statements.jsonl"
+
+
+def build_database(*, items: int) -> tuple[Engine, UUID, UUID]:
+    load_all_modules()
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="bench")).id
+        for index in range(items):
+            item = service.create_item(
+                session,
+                list_id,
+                TodoItemCreate(
+                    title=f"item {index}",
+                    status=list(TodoStatus)[index % len(TodoStatus)],
+                    tags=["home", f"tag{index % 3}"],
+                ),
+            )
+        item_id = item.id
+    return engine, list_id, item_id
+
+
+def load_service_at(ref: str) -> ModuleType:
+    """``app.modules.todos.service`` as of git ``ref``, loaded next to the current one."""
+
+    source = subprocess.run(
+        ["git", "show", f"{ref}:./app/modules/todos/service.py"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    name = "app.modules.todos._service_at_" + re.sub(r"\W", "_", ref)
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader(name, loader=None))
+    module.__package__ = "app.modules.todos"
+    sys.modules[name] = module  # dataclasses look their module up while processing the class
+    exec(compile(source, f"{ref}:service.py", "exec"), module.__dict__)
+    return module
+
+
+def operations(
+    service: ModuleType, list_id: UUID, item_id: UUID
+) -> dict[str, Callable[[Session], object]]:
+    def resequence(session: Session) -> None:
+        service._resequence_all(session, list_id)
+        session.flush()
+        session.rollback()
+
+    return {
+        "list_items": lambda session: service.list_items(session, list_id),
+        "list_items_status": lambda session: service.list_items(
+            session, list_id, status=TodoStatus.todo
+        ),
+        "list_items_tag": lambda session: service.list_items(session, list_id, tag="Home"),
+        "list_items_search": lambda session: service.list_items(session, list_id, search="item 1"),
+        "list_items_all_filters": lambda session: service.list_items(
+            session, list_id, status=TodoStatus.todo, tag="home", search="item"
+        ),
+        "list_detail": lambda session: service.get_todo_list(session, list_id, include_items=True),
+        "get_item": lambda session: service.get_item(session, item_id),
+        "lookup_item": lambda session: service._get_item(session, item_id),
+        "next_position": lambda session: service._next_position(session, list_id),
+        "resequence": resequence,
+    }
+
+
+def measure(
+    engine: Engine,
+    variants: dict[str, dict[str, Callable[[Session], object]]],
+    *,
+    calls: int,
+    repeats: int,
+) -> dict[str, dict[str, float]]:
+    """Best over ``repeats`` of the mean microseconds per call, each call in a fresh session.
+
+    Samples rotate through every operation of every variant so slow drift in machine speed
+    affects them all alike.
+    """
+
+    samples: dict[str, dict[str, list[float]]] = {
+        variant: {name: [] for name in operations} for variant, operations in variants.items()
+    }
+    for operations in variants.values():
+        for operation in operations.values():
+            with Session(engine) as session:
+                operation(session)  # compile once so the statement cache is warm
+    for _ in range(repeats):
+        for variant, operations in variants.items():
+            for name, operation in operations.items():
+                started = time.perf_counter()
+                for _ in range(calls):
+                    with Session(engine) as session:
+                        operation(session)
+                elapsed = time.perf_counter() - started
+                samples[variant][name].append(elapsed / calls * 1_000_000)
+    return {
+        variant: {name: round(min(values), 1) for name, values in timings.items()}
+        for variant, timings in samples.items()
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20, help="Items in the benchmark list")
+    parser.add_argument("--calls", type=int, default=500, help="Calls per sample")
+    parser.add_argument("--repeats", type=int, default=7, help="Samples per operation")
+    parser.add_argument("--baseline", help="Git ref whose service.py to compare against")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSONL history file")
+    parser.add_argument("--no-record", action="store_true", help="Print results without saving")
+    args = parser.parse_args(argv)
+
+    engine, list_id, item_id = build_database(items=args.items)
+    variants = {"current": operations(service, list_id, item_id)}
+    if args.baseline:
+        variants["baseline"] = operations(load_service_at(args.baseline), list_id, item_id)
+    timings = measure(engine, variants, calls=args.calls, repeats=args.repeats)
+    engine.dispose()
+
+    result: dict[str, Any] = {**run_metadata(), "items": args.items, "calls": args.calls}
+    result["us_per_call"] = timings["current"]
+    if args.baseline:
+        result["baseline"] = args.baseline
+        result["baseline_us_per_call"] = timings["baseline"]
+        reference, label = timings["baseline"], args.baseline
+    else:
+        previous = previous_result(args.output) or {}
+        reference, label = previous.get("us_per_call", {}), previous.get("commit")
+
+    for name, value in timings["current"].items():
+        line = f"{name:<26}{value:>9.1f} us"
+        if name in reference:
+            change = (value - reference[name]) / reference[name] * 100
+            line += f"  ({change:+.0f}% vs {label}: {reference[name]:.1f} us)"
+        print(line)
+
+    if not args.no_record:
+        append_result(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
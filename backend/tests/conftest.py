@@ -0,0 +1,252 @@
+"""Postgres fixtures for the tests that need real Postgres behaviour.
+
+One server serves the whole run: the one ``TEST_POSTGRES_URL`` points at (any database on a server
+where that user may create databases), or else a throwaway container started with testcontainers.
+A template database is migrated once with Alembic and every pytest process gets its own clone of
+it. Nothing is started or cloned until a test asks for Postgres. Under pytest-xdist the first
+worker that does starts the server and migrates the template, recording them in a state directory
+the controller hands out, and the controller tears them down after the run. Tests using these
+fixtures are skipped when neither Docker nor ``TEST_POSTGRES_URL`` is available.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel
+
+from app.modules import load_all_modules
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+POSTGRES_IMAGE = "postgres:17"
+TEMPLATE_DATABASE = "todo_test_template"
+
+
+class PostgresHarness:
+    """Starts the server on first use, migrates the template and hands out per-process clones."""
+
+    def __init__(self) -> None:
+        self.unavailable: str | None = None
+        self._admin_url: URL | None = None
+        self._container = None
+        self._databases: list[str] = []
+        # An xdist worker shares the server with the other workers and leaves it to the controller.
+        self._shared = False
+
+    def clone(self, name: str) -> str | None:
+        """URL of a fresh database ``name`` copied from the template; None if there is no server."""
+
+        if self._admin_url is None and self.unavailable is None:
+            self._start()
+        if self._admin_url is None:
+            return None
+        self._execute(
+            f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)',
+            f'CREATE DATABASE "{name}" TEMPLATE "{TEMPLATE_DATABASE}"',
+        )
+        self._databases.append(name)
+        return self._admin_url.set(database=name).render_as_string(hide_password=False)
+
+    def clone_shared(self, name: str, state_dir: Path) -> str | None:
+        """Like ``clone``, on the server of the xdist run recorded in ``state_dir``.
+
+        The first worker to get here starts the server and migrates the template; the lock keeps
+        the others waiting until the state is written and serializes the clones of the template.
+        """
+
+        self._shared = True
+        state_file = state_dir / "server.json"
+        with _locked(state_dir / "lock"):
+            if state_file.exists():
+                state = json.loads(state_file.read_text())
+                self.unavailable = state["unavailable"]
+                if state["admin_url"] is not None:
+                    self._admin_url = make_url(state["admin_url"])
+            else:
+                self._start()
+                state_file.write_text(json.dumps(self._state()))
+            return self.clone(name)
+
+    def stop(self) -> None:
+        if self._shared:
+            if self._admin_url is not None and self._container is None:
+                self._execute(
+                    *(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)' for name in self._databases)
+                )
+        elif self._container is not None:
+            self._container.stop()
+        elif self._admin_url is not None:
+            self._execute(
+                *(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)' for name in self._databases),
+                f'DROP DATABASE IF EXISTS "{TEMPLATE_DATABASE}" WITH (FORCE)',
+            )
+        self._admin_url = self._container = None
+
+    @classmethod
+    def stop_shared(cls, state_dir: Path) -> None:
+        """Controller side of ``clone_shared``: stop the container or drop the template."""
+
+        state_file = state_dir / "server.json"
+        if state_file.exists():
+            state = json.loads(state_file.read_text())
+            if state["container_id"] is not None:
+                import docker
+                from docker.errors import NotFound
+
+                with contextlib.suppress(NotFound):
+                    docker.from_env().containers.get(state["container_id"]).stop()
+            elif state["admin_url"] is not None:
+                harness = cls()
+                harness._admin_url = make_url(state["admin_url"])
+                harness._execute(f'DROP DATABASE IF EXISTS "{TEMPLATE_DATABASE}" WITH (FORCE)')
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    def _state(self) -> dict[str, str | None]:
+        return {
+            "admin_url": (
+                None
+                if self._admin_url is None
+                else self._admin_url.render_as_string(hide_password=False)
+            ),
+            "unavailable": self.unavailable,
+            "container_id": (
+                None if self._container is None else self._container.get_wrapped_container().id
+            ),
+        }
+
+    def _start(self) -> None:
+        url = os.environ.get("TEST_POSTGRES_URL")
+        if url is None:
+            try:
+                from testcontainers.postgres import PostgresContainer
+            except ImportError:
+                self.unavailable = "testcontainers is not installed and TEST_POSTGRES_URL is unset"
+                return
+            try:
+                # Durability is pointless for a throwaway server and costs most of the write time.
+                container = PostgresContainer(POSTGRES_IMAGE, driver="psycopg").with_command(
+                    "postgres -c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+                )
+                container.start()
+            except Exception as error:  # no Docker daemon, image pull failed, ...
+                self.unavailable = f"Docker is not available: {error}"
+                return
+            self._container = container
+            url = container.get_connection_url()
+
+        self._admin_url = make_url(url)
+        self._execute(
+            f'DROP DATABASE IF EXISTS "{TEMPLATE_DATABASE}" WITH (FORCE)',
+            f'CREATE DATABASE "{TEMPLATE_DATABASE}"',
+        )
+        template_url = self._admin_url.set(database=TEMPLATE_DATABASE)
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "DATABASE_URL": template_url.render_as_string(hide_password=False)},
+            check=True,
+        )
+
+    def _execute(self, *statements: str) -> None:
+        engine = create_engine(self._admin_url, isolation_level="AUTOCOMMIT", poolclass=NullPool)
+        with engine.connect() as connection:
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+        engine.dispose()
+
+
+@contextlib.contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    with path.open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+_harness = PostgresHarness()
+_shared_state_dir: Path | None = None
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node) -> None:
+    """pytest-xdist controller: tell the workers where the run's Postgres state is kept."""
+
+    global _shared_state_dir
+    if _shared_state_dir is None:
+        _shared_state_dir = Path(tempfile.mkdtemp(prefix="todo-test-postgres-"))
+    node.workerinput["postgres_state_dir"] = str(_shared_state_dir)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    _harness.stop()
+    if _shared_state_dir is not None:
+        PostgresHarness.stop_shared(_shared_state_dir)
+
+
+@pytest.fixture(scope="session")
+def postgres_url(request: pytest.FixtureRequest) -> str:
+    workerinput = getattr(request.config, "workerinput", None)
+    if workerinput is not None:
+        url = _harness.clone_shared(
+            f"todo_test_{workerinput['workerid']}", Path(workerinput["postgres_state_dir"])
+        )
+    else:
+        url = _harness.clone("todo_test_main")
+    if url is None:
+        pytest.skip(f"Postgres tests need Docker or TEST_POSTGRES_URL ({_harness.unavailable})")
+    return url
+
+
+@pytest.fixture(scope="session")
+def postgres_engine(postgres_url: str) -> Iterator[Engine]:
+    load_all_modules()
+    engine = create_engine(postgres_url)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def postgres_session(postgres_engine: Engine) -> Iterator[Session]:
+    """A session whose work, commits included, is rolled back after the test.
+
+    The test runs inside one outer transaction; the session's commits and rollbacks only release
+    or roll back SAVEPOINTs within it, so the service code behaves as it does in production.
+    """
+
+    with postgres_engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+@pytest.fixture
+def committing_postgres_engine(postgres_engine: Engine) -> Iterator[Engine]:
+    """For tests whose connections must see each other's commits; tables are emptied afterwards."""
+
+    try:
+        yield postgres_engine
+    finally:
+        tables = ", ".join(table.name for table in SQLModel.metadata.sorted_tables)
+        with postgres_engine.begin() as connection:
+            connection.exec_driver_sql(f"TRUNCATE {tables} CASCADE")
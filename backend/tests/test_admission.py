@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
+
+from app.core.metrics import MetricsRegistry
+from app.core.settings import Settings
+from app.extensions import AdmissionControlMiddleware
+
+
+def _build_app(registry: MetricsRegistry, release: asyncio.Event, **limits) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict[str, str]:
+        await release.wait()
+        return {"status": "done"}
+
+    @app.post("/slow")
+    async def slow_write() -> dict[str, str]:
+        await release.wait()
+        return {"status": "written"}
+
+    @app.get("/healthz")
+    async def healthz() -> dict[str, str]:
+        return {"status": "ok"}
+
+    options = {"read_limit": 1, "write_limit": 1, "max_queue": 1, "queue_timeout": 5.0}
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        exempt_paths={"/healthz"},
+        registry=registry,
+        **(options | limits),
+    )
+    return app
+
+
+async def _wait_for(predicate) -> None:
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_is_full_and_keeps_budgets_separate():
+    registry = MetricsRegistry()
+    release = asyncio.Event()
+    app = _build_app(registry, release)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        running = asyncio.create_task(client.get("/slow"))
+        queued = asyncio.create_task(client.get("/slow"))
+        await _wait_for(
+            lambda: registry.snapshot().get('admission_queue_depth{budget="read"}') == 1
+        )
+
+        shed = await client.get("/slow")
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "1"
+
+        # Writes have their own budget and health checks bypass admission entirely.
+        writing = asyncio.create_task(client.post("/slow"))
+        assert (await client.get("/healthz")).status_code == 200
+
+        release.set()
+        responses = await asyncio.gather(running, queued, writing)
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    snapshot = registry.snapshot()
+    assert snapshot['admission_shed_total{budget="read",reason="queue_full"}'] == 1
+    assert snapshot['admission_admitted_total{budget="read"}'] == 2
+    assert snapshot['admission_admitted_total{budget="write"}'] == 1
+    assert snapshot['admission_in_flight{budget="read"}'] == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_wait_times_out():
+    registry = MetricsRegistry()
+    release = asyncio.Event()
+    app = _build_app(registry, release, queue_timeout=0.05)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        running = asyncio.create_task(client.get("/slow"))
+        await _wait_for(lambda: registry.snapshot().get('admission_in_flight{budget="read"}') == 1)
+
+        timed_out = await client.get("/slow")
+        release.set()
+        await running
+
+    assert timed_out.status_code == 503
+    assert registry.snapshot()['admission_shed_total{budget="read",reason="queue_timeout"}'] == 1
+
+
+def test_default_budgets_fit_the_connection_pool():
+    settings = Settings(database_pool_size=5, database_max_overflow=10, job_run_in_app=False)
+    assert (settings.admission_read_limit, settings.admission_write_limit) == (12, 3)
+    # In-app jobs hold pool connections too.
+    settings = Settings(database_pool_size=5, database_max_overflow=10, job_concurrency=3)
+    assert settings.admission_read_limit + settings.admission_write_limit == 12
+
+    with pytest.raises(ValidationError, match="must not exceed"):
+        Settings(database_pool_size=5, database_max_overflow=0, admission_read_limit=8)
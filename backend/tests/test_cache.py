@@ -0,0 +1,101 @@
+import time
+
+from app.core.cache import (
+    InMemoryCache,
+    RedisCache,
+    resolve_cache_backend,
+    resolve_read_coalescing_ttl,
+)
+from app.core.settings import Settings
+
+
+class FakeRedis:
+    """Just enough of the redis-py client surface for RedisCache."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.expiry_ms: dict[str, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    def set(self, key: str, value: bytes, px: int | None = None) -> None:
+        self.data[key] = value
+        if px is not None:
+            self.expiry_ms[key] = px
+
+    def incr(self, key: str) -> int:
+        value = int(self.data.get(key, b"0")) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.commands: list[str] = []
+
+    def incr(self, key: str) -> None:
+        self.commands.append(key)
+
+    def execute(self) -> list[int]:
+        return [self.client.incr(key) for key in self.commands]
+
+
+def test_in_memory_cache_evicts_least_recently_used_by_size():
+    cache = InMemoryCache(max_bytes=10)
+    cache.set("a", b"aaaa", ttl=60)
+    cache.set("b", b"bbbb", ttl=60)
+    assert cache.get("a") == b"aaaa"  # touch "a" so "b" becomes the eviction candidate
+
+    cache.set("c", b"cccc", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.size == 8
+
+
+def test_in_memory_cache_expires_entries_and_skips_oversized_values():
+    cache = InMemoryCache(max_bytes=4)
+    cache.set("big", b"too large", ttl=60)
+    assert cache.get("big") is None
+
+    cache.set("short", b"x", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.size == 0
+
+
+def test_version_counters_start_at_zero_and_bump_together():
+    for cache in (InMemoryCache(max_bytes=1024), RedisCache(FakeRedis())):
+        assert cache.get_version("list") == 0
+        cache.bump_versions("list", "lists")
+        cache.bump_versions("lists")
+        assert (cache.get_version("list"), cache.get_version("lists")) == (1, 2)
+
+
+def test_redis_cache_sets_millisecond_ttl():
+    client = FakeRedis()
+    cache = RedisCache(client)
+
+    cache.set("key", b"body", ttl=1.5)
+
+    assert cache.get("key") == b"body"
+    assert client.expiry_ms["key"] == 1500
+
+
+def test_auto_backend_uses_redis_only_when_configured():
+    assert resolve_cache_backend(Settings()) == "none"
+    assert resolve_cache_backend(Settings(cache_url="redis://cache:6379/0")) == "redis"
+    assert resolve_cache_backend(Settings(cache_backend="memory")) == "memory"
+
+
+def test_coalesced_reads_are_only_reused_with_a_cache_backend():
+    assert resolve_read_coalescing_ttl(Settings()) == 0.0
+    assert resolve_read_coalescing_ttl(Settings(cache_url="redis://cache:6379/0")) == 1.0
+    assert resolve_read_coalescing_ttl(Settings(cache_backend="memory")) == 1.0
+    assert resolve_read_coalescing_ttl(Settings(read_coalescing_ttl=0.5)) == 0.5
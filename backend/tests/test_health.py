@@ -1,11 +1,80 @@
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
 
+from app.core import database
 from app.main import app
+from app.modules.system import service as system_service
 
 
 def test_healthz_ok():
-    client = TestClient(app)
-    r = client.get("/api/healthz")
+    with TestClient(app) as client:
+        r = client.get("/api/healthz")
     assert r.status_code == 200
     assert r.json() == {"status": "ok"}
 
+
+def test_healthz_reports_starting_until_warm_up_completes():
+    client = TestClient(app)  # lifespan (and therefore warm-up) has not run
+    r = client.get("/api/healthz")
+    assert r.status_code == 503
+    assert r.json() == {"status": "starting"}
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ready.db'}")
+    monkeypatch.setattr(database, "get_engine", lambda: engine)
+    monkeypatch.setattr(database, "get_read_engine", lambda: engine)
+    system_service.readiness_checks.clear()
+    yield engine
+    system_service.readiness_checks.clear()
+    engine.dispose()
+
+
+def _stamp(engine, revisions) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num TEXT)"))
+        connection.execute(text("DELETE FROM alembic_version"))
+        for revision in revisions:
+            connection.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+
+def test_readyz_reports_checks_with_latency(sqlite_engine):
+    _stamp(sqlite_engine, system_service.migration_heads())
+
+    with TestClient(app) as client:
+        r = client.get("/api/readyz")
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["database"]["latency_ms"] >= 0
+    assert body["checks"]["migrations"]["current"] == body["checks"]["migrations"]["head"]
+    assert body["checks"]["pool"]["status"] == "ok"
+
+
+def test_readyz_fails_on_outdated_schema_and_caches_result(sqlite_engine):
+    _stamp(sqlite_engine, ["0001_create_todo_schema"])
+
+    with TestClient(app) as client:
+        first = client.get("/api/readyz")
+        _stamp(sqlite_engine, system_service.migration_heads())
+        second = client.get("/api/readyz")
+
+    assert first.status_code == 503
+    assert first.json()["checks"]["migrations"]["status"] == "error"
+    # Within the cache interval the probe is answered without re-checking the database.
+    assert second.json()["checked_at"] == first.json()["checked_at"]
+
+
+def test_readiness_reports_unreachable_database():
+    engine = create_engine("sqlite:////nonexistent-dir/launchpad.db")
+    report = system_service.check_readiness(
+        engine,
+        expected_heads=frozenset({"head"}),
+        pool_capacity=15,
+        pool_saturation_threshold=0.9,
+    )
+    assert report.ready is False
+    assert report.checks["database"]["status"] == "error"
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select, update
+
+from app.core.metrics import metrics
+from app.core.settings import Settings
+from app.modules import load_all_modules
+from app.modules.jobs import service
+from app.modules.jobs.models import Job, JobStatus
+from app.modules.jobs.worker import JobWorker
+
+calls: list[dict] = []
+
+
+def record(bind, payload: dict) -> None:
+    calls.append(payload)
+
+
+def flaky(bind, payload: dict) -> None:
+    raise RuntimeError("still broken")
+
+
+@pytest.fixture(autouse=True)
+def test_handlers(monkeypatch):
+    """Register the test job kinds for one test only."""
+
+    monkeypatch.setitem(service._handlers, "test.record", record)
+    monkeypatch.setitem(service._handlers, "test.flaky", flaky)
+    calls.clear()
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    load_all_modules()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(name="counted")
+def counted_fixture():
+    """Counter increments since the test started; the global registry is left untouched."""
+
+    before = metrics.snapshot()
+    return lambda key: metrics.snapshot().get(key, 0) - before.get(key, 0)
+
+
+def _worker(engine, **options) -> JobWorker:
+    defaults = {
+        "concurrency": 2,
+        "batch_size": 10,
+        "poll_interval": 0.05,
+        "lease_timeout": 60.0,
+        "backoff": 0.0,
+        "backoff_max": 0.0,
+    }
+    return JobWorker(engine, **{**defaults, **options})
+
+
+def _jobs(engine) -> list[Job]:
+    with Session(engine) as session:
+        return list(session.exec(select(Job).order_by(Job.id)).all())
+
+
+def test_enqueued_jobs_run_once_and_duplicates_are_folded(engine, counted):
+    with Session(engine) as session:
+        service.enqueue(session, "test.record", {"n": 1})
+        service.enqueue(session, "test.record", {"n": 2}, dedupe_key="same")
+        service.enqueue(session, "test.record", {"n": 3}, dedupe_key="same")
+        service.enqueue(session, "test.record", {"n": 4}, delay=timedelta(hours=1))
+        session.rollback()
+        assert _jobs(engine) == []  # nothing is visible before the enqueuing transaction commits
+
+        service.enqueue(session, "test.record", {"n": 1})
+        service.enqueue(session, "test.record", {"n": 2}, dedupe_key="same")
+        service.enqueue(session, "test.record", {"n": 3}, dedupe_key="same")
+        service.enqueue(session, "test.record", {"n": 4}, delay=timedelta(hours=1))
+        session.commit()
+
+    worker = _worker(engine)
+    worker.drain()
+    worker.close()
+
+    assert sorted(call["n"] for call in calls) == [1, 2]
+    assert [job.payload for job in _jobs(engine)] == [{"n": 4}]  # not due yet
+    assert counted('jobs_completed_total{kind="test.record"}') == 2
+
+
+def test_failing_jobs_are_retried_then_left_failed(engine, counted):
+    with Session(engine) as session:
+        service.enqueue(session, "test.flaky", max_attempts=3)
+        service.enqueue(session, "test.unknown", max_attempts=1)
+        session.commit()
+
+    worker = _worker(engine)
+    worker.drain()
+    worker.close()
+
+    flaky_job, unknown_job = _jobs(engine)
+    assert (flaky_job.status, flaky_job.attempts) == (JobStatus.failed, 3)
+    assert flaky_job.last_error == "RuntimeError: still broken"
+    assert unknown_job.status == JobStatus.failed
+    assert "No handler registered" in unknown_job.last_error
+    assert counted('jobs_retried_total{kind="test.flaky"}') == 2
+    assert counted('jobs_failed_total{kind="test.flaky"}') == 1
+
+
+def test_retry_delay_grows_exponentially_up_to_the_cap():
+    for attempts, expected in [(1, 5.0), (2, 10.0), (3, 20.0), (6, 60.0)]:
+        delay = service.retry_delay(attempts, base=5.0, cap=60.0)
+        assert expected / 2 <= delay <= expected
+
+
+def test_jobs_of_a_lost_worker_are_requeued_after_the_lease(engine):
+    with Session(engine) as session:
+        service.enqueue(session, "test.record", {"n": 1})
+        service.enqueue(session, "test.record", {"n": 2}, max_attempts=1)
+        session.commit()
+        claimed = service.claim_jobs(session, worker_id="gone", limit=10)
+        assert [job.attempts for job in claimed] == [1, 1]
+        assert service.claim_jobs(session, worker_id="other", limit=10) == []
+
+        session.execute(update(Job).values(locked_at=datetime.now(tz=UTC) - timedelta(hours=1)))
+        session.commit()
+        assert service.requeue_stale_jobs(session, lease_timeout=timedelta(minutes=10)) == 2
+
+    worker = _worker(engine)
+    worker.drain()
+    worker.close()
+
+    assert calls == [{"n": 1}]
+    [buried] = _jobs(engine)
+    assert (buried.payload, buried.status) == ({"n": 2}, JobStatus.failed)
+
+
+def test_only_the_current_holder_settles_a_job(engine):
+    with Session(engine) as session:
+        service.enqueue(session, "test.record")
+        session.commit()
+        [job] = service.claim_jobs(session, worker_id="slow", limit=1)
+        assert service.renew_leases(session, [job.id], worker_id="slow") == 1
+
+        # The slow worker's lease runs out and another worker claims the job again.
+        session.execute(update(Job).values(locked_at=datetime.now(tz=UTC) - timedelta(hours=1)))
+        session.commit()
+        service.requeue_stale_jobs(session, lease_timeout=timedelta(minutes=10))
+        [reclaimed] = service.claim_jobs(session, worker_id="fast", limit=1)
+
+        assert service.renew_leases(session, [job.id], worker_id="slow") == 0
+        assert service.complete_job(session, job.id, worker_id="slow") is False
+        assert (
+            service.fail_job(session, job, "late", worker_id="slow", backoff=0.0, backoff_max=0.0)
+            is None
+        )
+        [running] = _jobs(engine)
+        assert (running.status, running.locked_by, running.attempts) == ("running", "fast", 2)
+
+        assert service.complete_job(session, reclaimed.id, worker_id="fast") is True
+    assert _jobs(engine) == []
+
+
+def test_recurring_jobs_are_queued_once_per_slot(engine, monkeypatch):
+    monkeypatch.setitem(service._schedules, "test.record", lambda settings: 3600.0)
+    monkeypatch.setitem(service._schedules, "test.flaky", lambda settings: 0.0)
+    recurring = service.recurring_jobs(Settings())
+    assert recurring["test.record"] == 3600.0
+    assert "test.flaky" not in recurring  # a zero interval disables the schedule
+
+    workers = [_worker(engine, schedules={"test.record": 3600.0}) for _ in range(2)]
+    for worker in workers:
+        worker.poll()
+        worker.close()
+
+    [queued] = _jobs(engine)
+    assert (queued.kind, queued.status, queued.dedupe_key) == (
+        "test.record",
+        "queued",
+        "test.record",
+    )
+    run_at = queued.run_at.replace(tzinfo=UTC).timestamp()
+    assert round(run_at) % 3600 == 0
+    assert 0 < run_at - datetime.now(tz=UTC).timestamp() <= 3600
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.core.logging import DebugSampleFilter, JsonFormatter
+from app.main import app
+
+
+def test_request_id_is_generated_and_echoed():
+    client = TestClient(app)
+
+    generated = client.get("/api/healthz")
+    assert generated.headers["x-request-id"]
+
+    echoed = client.get("/api/healthz", headers={"X-Request-ID": "abc-123"})
+    assert echoed.headers["x-request-id"] == "abc-123"
+
+    rejected = client.get("/api/healthz", headers={"X-Request-ID": "bad id\n"})
+    assert rejected.headers["x-request-id"] != "bad id\n"
+
+
+def test_access_log_includes_route_status_and_duration(caplog):
+    client = TestClient(app)
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        client.get("/api/healthz", headers={"X-Request-ID": "trace-me"})
+
+    record = next(r for r in caplog.records if r.name == "app.access")
+    assert record.route == "/api/healthz"
+    assert record.status == 503  # lifespan warm-up has not run for this client
+    assert record.duration_ms >= 0
+
+
+def test_json_formatter_emits_context_and_extras():
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.request_id = "req-1"
+    record.route = "/api/todo/lists"
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "hello world"
+    assert payload["request_id"] == "req-1"
+    assert payload["route"] == "/api/todo/lists"
+    assert payload["level"] == "INFO"
+
+
+def test_debug_sampling_only_drops_debug_records():
+    sampler = DebugSampleFilter(rate=0.0)
+    debug = logging.LogRecord("app", logging.DEBUG, __file__, 1, "noisy", None, None)
+    warning = logging.LogRecord("app", logging.WARNING, __file__, 1, "important", None, None)
+    assert sampler.filter(debug) is False
+    assert sampler.filter(warning) is True
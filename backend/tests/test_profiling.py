@@ -0,0 +1,64 @@
+import json
+import pstats
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from app.core.database import instrument_engine
+from app.extensions import ProfilingMiddleware, RequestContextMiddleware
+
+
+def _build_app(tmp_path, **options) -> FastAPI:
+    engine = instrument_engine(create_engine("sqlite://"))
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    def read_thing(thing_id: int) -> dict[str, int]:
+        with engine.connect() as connection:
+            value = connection.execute(text("SELECT :value"), {"value": thing_id}).scalar_one()
+        return {"value": value}
+
+    app.add_middleware(ProfilingMiddleware, output_dir=tmp_path, **options)
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def test_requests_are_not_profiled_without_token(tmp_path):
+    client = TestClient(_build_app(tmp_path, token="secret"))
+
+    response = client.get("/things/1", headers={"X-Profile": "wrong"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_authorized_request_writes_annotated_profile(tmp_path):
+    client = TestClient(_build_app(tmp_path, token="secret"))
+
+    response = client.get(
+        "/things/7", headers={"X-Profile": "secret", "X-Request-ID": "profile-me"}
+    )
+
+    assert response.json() == {"value": 7}
+    profile_id = response.headers["x-profile-id"]
+    assert profile_id.endswith("profile-me")
+
+    annotation = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    assert annotation["route"] == "/things/{thing_id}"
+    assert annotation["status"] == 200
+    assert annotation["sql_statements"] == 1
+    assert annotation["sql_ms"] >= 0
+
+    stats = pstats.Stats(str(tmp_path / f"{profile_id}.prof"))
+    assert any(func_name == "read_thing" for _, _, func_name in stats.stats)
+
+
+def test_sample_rate_profiles_without_header(tmp_path):
+    client = TestClient(_build_app(tmp_path, sample_rate=1.0))
+
+    response = client.get("/things/3")
+
+    assert "x-profile-id" in response.headers
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core.settings import Settings
+from app.serve import check_worker_settings, default_worker_count, server_options
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_server_options_default_to_cpu_sized_workers():
+    options = server_options(Settings(web_concurrency=None))
+    assert options["workers"] == default_worker_count() >= 1
+    assert options["lifespan"] == "on"
+    assert options["loop"] in {"uvloop", "asyncio"}
+    assert options["http"] in {"httptools", "h11"}
+
+
+def test_server_options_honour_settings():
+    options = server_options(
+        Settings(web_concurrency=3, server_port=9000, graceful_shutdown_timeout=12)
+    )
+    assert options["workers"] == 3
+    assert options["port"] == 9000
+    assert options["timeout_graceful_shutdown"] == 12
+
+
+def test_importing_the_app_defers_engine_and_driver_setup():
+    probe = (
+        "import sys, app.main\n"
+        "from app.core import database\n"
+        "assert database._engine is None\n"
+        "assert not {'psycopg', 'alembic.script', 'redis'} & set(sys.modules)\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, check=True)
+
+
+def test_migration_imports_leave_query_instrumentation_out():
+    probe = (
+        "import sys, app.db.models, app.db.partitioning\n"
+        "assert 'app.core.database' not in sys.modules\n"
+        "from app.db import get_session\n"
+        "assert 'app.core.database' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, check=True)
+
+
+def test_memory_cache_is_refused_with_several_workers():
+    memory = Settings(cache_backend="memory")
+    check_worker_settings(memory, 1)
+    check_worker_settings(Settings(cache_backend="auto"), 4)
+    with pytest.raises(SystemExit, match="CACHE_BACKEND=memory"):
+        check_worker_settings(memory, 4)
+
+
+def test_reused_coalesced_reads_need_a_cache_backend_with_several_workers():
+    check_worker_settings(Settings(), 4)  # unset, the reuse window is 0 without a backend
+    check_worker_settings(Settings(read_coalescing_ttl=1.0), 1)
+    check_worker_settings(Settings(read_coalescing_ttl=1.0, cache_url="redis://cache:6379/0"), 4)
+    with pytest.raises(SystemExit, match="READ_COALESCING_TTL"):
+        check_worker_settings(Settings(read_coalescing_ttl=1.0), 4)
@@ -0,0 +1,52 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_load():
+    flight = SingleFlight(ttl=0)
+    calls = 0
+    started = threading.Event()
+
+    def loader() -> bytes:
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.05)
+        return b"body"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "key", loader)
+        started.wait()
+        followers = [pool.submit(flight.do, "key", loader) for _ in range(7)]
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert results == [b"body"] * 8
+    assert calls == 1
+
+
+def test_results_expire_after_ttl_and_errors_are_not_cached():
+    flight = SingleFlight(ttl=0.05)
+    values = iter([1, 2])
+    assert flight.do("key", lambda: next(values)) == 1
+    assert flight.do("key", lambda: next(values)) == 1
+    time.sleep(0.06)
+    assert flight.do("key", lambda: next(values)) == 2
+
+    def failing() -> int:
+        raise LookupError("missing")
+
+    with pytest.raises(LookupError):
+        flight.do("missing", failing)
+    assert flight.do("missing", lambda: 3) == 3
+
+
+def test_entries_are_bounded():
+    flight = SingleFlight(ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        flight.do(key, lambda key=key: key)
+    assert flight.do("a", lambda: "reloaded") == "reloaded"
@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from app.api.dependencies import get_settings_dependency
+from app.core.database import get_slow_query_log, instrument_engine
+from app.core.settings import Settings
+from app.core.slow_queries import normalize_statement, redact_parameters
+from app.main import app
+
+
+@pytest.fixture
+def capture_all_queries():
+    slow_query_log = get_slow_query_log()
+    threshold = slow_query_log.threshold_ms
+    slow_query_log.threshold_ms = 0
+    slow_query_log.clear()
+    try:
+        yield slow_query_log
+    finally:
+        slow_query_log.threshold_ms = threshold
+        slow_query_log.clear()
+
+
+def test_normalize_statement_collapses_whitespace_and_in_lists():
+    statement = (
+        "SELECT *\n  FROM todo_tags\n WHERE name IN (%(name_1_1)s, %(name_1_2)s, %(name_1_3)s)"
+    )
+    assert normalize_statement(statement) == "SELECT * FROM todo_tags WHERE name IN (...)"
+
+
+def test_redact_parameters_hides_values():
+    assert redact_parameters({"name": "secret", "limit": 5}) == {"name": "str", "limit": "int"}
+    assert redact_parameters(("secret", 1)) == ["str", "int"]
+
+
+def test_slow_queries_are_buffered(capture_all_queries):
+    engine = instrument_engine(create_engine("sqlite://"))
+    with engine.connect() as connection:
+        connection.execute(text("SELECT   :token"), {"token": "hunter2"})
+
+    entry = capture_all_queries.recent()[0]
+    assert entry["statement"] == "SELECT ?"
+    assert entry["parameters"] == ["str"]
+    assert entry["plan"] is None
+    assert "hunter2" not in repr(entry)
+
+
+def test_only_instrumented_engines_are_observed(capture_all_queries):
+    with create_engine("sqlite://").connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert capture_all_queries.recent() == []
+
+
+def test_slow_query_endpoint_requires_admin_token(capture_all_queries):
+    client = TestClient(app)
+    assert client.get("/api/admin/slow-queries").status_code == 404
+
+    app.dependency_overrides[get_settings_dependency] = lambda: Settings(admin_token="s3cret")
+    try:
+        assert client.get("/api/admin/slow-queries").status_code == 403
+
+        engine = instrument_engine(create_engine("sqlite://"))
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        response = client.get("/api/admin/slow-queries", headers={"X-Admin-Token": "s3cret"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()[0]["statement"] == "SELECT 1"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from app.core.settings import Settings
+from app.core.sqlite import create_sqlite_engines
+from app.modules import load_all_modules
+from app.modules.todos import service
+from app.modules.todos.models import TodoItem, TodoItemTagLink
+from app.modules.todos.schemas import TodoItemCreate, TodoListCreate
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+WRITERS = 8
+INSERTS_PER_WRITER = 5
+
+
+@pytest.fixture(scope="module")
+def migrated_url(tmp_path_factory) -> str:
+    url = f"sqlite:///{tmp_path_factory.mktemp('sqlite') / 'todo.db'}"
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": url},
+        check=True,
+        capture_output=True,
+    )
+    return url
+
+
+@pytest.fixture
+def engines(migrated_url):
+    load_all_modules()
+    writer, reader = create_sqlite_engines(Settings(database_url=migrated_url))
+    try:
+        yield writer, reader
+    finally:
+        writer.dispose()
+        reader.dispose()
+
+
+def test_connections_apply_pragmas(engines):
+    writer, reader = engines
+    for engine in (writer, reader):
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+            assert connection.exec_driver_sql("PRAGMA cache_size").scalar() == -64 * 1024
+
+    with reader.connect() as connection, pytest.raises(OperationalError, match="readonly"):
+        connection.execute(text("DELETE FROM todo_tags"))
+
+
+def test_migrated_schema_serves_writes_and_cascades(engines):
+    writer, reader = engines
+    with Session(writer) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Embedded")).id
+        item = service.create_item(session, list_id, TodoItemCreate(title="One", tags=["Home"]))
+        item_id = item.id
+
+    with Session(reader) as session:
+        assert [tag.name for tag in service.get_item(session, item_id).tags] == ["home"]
+        assert [usage.tag.name for usage in service.list_tags(session, prefix="ho")] == ["home"]
+
+    # Delete through SQL so the foreign keys, not the ORM, have to clean up.
+    with writer.begin() as connection:
+        connection.execute(text("DELETE FROM todo_lists WHERE id = :id"), {"id": list_id.hex})
+    with Session(reader) as session:
+        assert session.exec(select(TodoItemTagLink)).all() == []
+
+
+def test_writes_queue_on_the_single_writer_connection(engines):
+    writer, reader = engines
+    with Session(writer) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Busy")).id
+
+    def insert(index: int) -> None:
+        with Session(writer) as session:
+            for offset in range(INSERTS_PER_WRITER):
+                service.create_item(session, list_id, TodoItemCreate(title=f"{index}-{offset}"))
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        list(pool.map(insert, range(WRITERS)))
+
+    with Session(reader) as session:
+        positions = session.exec(select(TodoItem.position).where(TodoItem.list_id == list_id))
+        assert sorted(positions) == list(range(WRITERS * INSERTS_PER_WRITER))
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
+from datetime import UTC, date, datetime, timedelta
+from uuid import UUID
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, SQLModel, create_engine, select, update
 
 from app.api.dependencies import get_db_session
+from app.core.cache import InMemoryCache
+from app.core.metrics import metrics
+from app.core.settings import Settings
 from app.main import app
-from app.modules import load_all_modules
+from app.modules import load_all_modules, load_job_handlers
+from app.modules.jobs.models import Job
+from app.modules.jobs.worker import JobWorker
+from app.modules.todos import cache as todo_cache
+from app.modules.todos import service
+from app.modules.todos.models import TodoIdempotencyKey, TodoItem, TodoItemTagLink
+from app.modules.todos.schemas import TodoItemCreate
 
 
 @pytest.fixture(name="engine")
 def engine_fixture():
     load_all_modules()
+    load_job_handlers()
     engine = create_engine(
         "sqlite://",
         connect_args={"check_same_thread": False},
@@ -27,6 +40,17 @@ def engine_fixture():
         engine.dispose()
 
 
+@pytest.fixture(name="response_cache", autouse=True)
+def response_cache_fixture(monkeypatch):
+    """Give every test an empty cache so bodies cached against another database never leak in."""
+
+    backend = InMemoryCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(todo_cache, "backend", backend)
+    todo_cache.read_flight.clear()
+    yield backend
+    todo_cache.read_flight.clear()
+
+
 @pytest_asyncio.fixture
 async def client(engine):
     def _get_session_override():
@@ -41,7 +65,7 @@ async def client(engine):
 
 
 @pytest.mark.asyncio
-async def test_todo_list_and_item_flow(client: AsyncClient):
+async def test_todo_list_and_item_flow(client: AsyncClient, engine):
     # Create a list
     create_list_resp = await client.post("/api/todo/lists", json={"name": "Inbox"})
     assert create_list_resp.status_code == 201
@@ -126,6 +150,430 @@ async def test_todo_list_and_item_flow(client: AsyncClient):
     # Delete the list
     delete_list_resp = await client.delete(f"/api/todo/lists/{list_id}")
     assert delete_list_resp.status_code == 204
+    with Session(engine) as session:
+        # Removed with set-based deletes, without relying on the ORM or FK cascades.
+        assert session.exec(select(TodoItem)).all() == []
+        assert session.exec(select(TodoItemTagLink)).all() == []
 
     empty_lists_resp = await client.get("/api/todo/lists")
     assert empty_lists_resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_summaries_include_status_aggregates(client: AsyncClient):
+    list_resp = await client.post("/api/todo/lists", json={"name": "Launch"})
+    list_id = list_resp.json()["id"]
+
+    now = datetime.now(tz=UTC)
+    payloads = [
+        {"title": "Overdue", "due_date": (now - timedelta(days=2)).isoformat()},
+        {"title": "Soon", "status": "in_progress", "due_date": (now + timedelta(days=1)).isoformat()},
+        {"title": "Later", "status": "blocked", "due_date": (now + timedelta(days=5)).isoformat()},
+        {"title": "Finished late", "status": "done", "due_date": (now - timedelta(days=3)).isoformat()},
+    ]
+    for payload in payloads:
+        resp = await client.post(f"/api/todo/lists/{list_id}/items", json=payload)
+        assert resp.status_code == 201
+
+    await client.post("/api/todo/lists", json={"name": "Empty"})
+
+    summaries = (await client.get("/api/todo/lists")).json()
+    launch, empty = summaries
+
+    assert launch["item_count"] == 4
+    assert launch["status_counts"] == {"todo": 1, "in_progress": 1, "blocked": 1, "done": 1}
+    assert launch["overdue_count"] == 1
+    assert launch["next_due_date"] is not None
+    next_due = datetime.fromisoformat(launch["next_due_date"])
+    if next_due.tzinfo is None:
+        next_due = next_due.replace(tzinfo=UTC)
+    assert now < next_due < now + timedelta(days=2)
+
+    assert empty["item_count"] == 0
+    assert empty["status_counts"] == {"todo": 0, "in_progress": 0, "blocked": 0, "done": 0}
+    assert empty["overdue_count"] == 0
+    assert empty["next_due_date"] is None
+
+
+@pytest.mark.asyncio
+async def test_due_items_range_and_calendar(client: AsyncClient):
+    first = (await client.post("/api/todo/lists", json={"name": "Work"})).json()["id"]
+    second = (await client.post("/api/todo/lists", json={"name": "Home"})).json()["id"]
+
+    def due(day: int, hour: int = 9) -> str:
+        return datetime(2025, 3, day, hour, tzinfo=UTC).isoformat()
+
+    for list_id, title, due_date, item_status in [
+        (first, "Standup notes", due(3), "todo"),
+        (second, "Groceries", due(3, 18), "in_progress"),
+        (first, "Quarterly plan", due(5), "blocked"),
+        (second, "Taxes", due(6), "todo"),
+        (first, "Shipped", due(4), "done"),
+        (first, "Next month", datetime(2025, 4, 1, tzinfo=UTC).isoformat(), "todo"),
+    ]:
+        resp = await client.post(
+            f"/api/todo/lists/{list_id}/items",
+            json={"title": title, "due_date": due_date, "status": item_status},
+        )
+        assert resp.status_code == 201
+
+    params = {"from": due(1, 0), "to": due(6, 0), "limit": 2}
+    page_one = (await client.get("/api/todo/items/due", params=params)).json()
+    assert [item["title"] for item in page_one["items"]] == ["Standup notes", "Groceries"]
+    assert page_one["next_cursor"]
+
+    page_two = (
+        await client.get(
+            "/api/todo/items/due", params={**params, "cursor": page_one["next_cursor"]}
+        )
+    ).json()
+    assert [item["title"] for item in page_two["items"]] == ["Quarterly plan"]
+    assert page_two["next_cursor"] is None
+
+    bad_cursor = await client.get("/api/todo/items/due", params={**params, "cursor": "nope"})
+    assert bad_cursor.status_code == 400
+
+    calendar = (await client.get("/api/todo/calendar", params={"month": "2025-03"})).json()
+    assert calendar["month"] == "2025-03"
+    assert calendar["days"] == [
+        {"day": "2025-03-03", "count": 2},
+        {"day": "2025-03-05", "count": 1},
+        {"day": "2025-03-06", "count": 1},
+    ]
+
+    invalid_month = await client.get("/api/todo/calendar", params={"month": "2025-13"})
+    assert invalid_month.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tag_autocomplete_and_orphan_collection(client: AsyncClient, engine):
+    list_id = (await client.post("/api/todo/lists", json={"name": "Tags"})).json()["id"]
+
+    created = []
+    for title, tags in [
+        ("Draft", ["planning", "priority"]),
+        ("Review", ["planning", "private_notes"]),
+        ("Ship", ["planning"]),
+    ]:
+        resp = await client.post(
+            f"/api/todo/lists/{list_id}/items", json={"title": title, "tags": tags}
+        )
+        created.append(resp.json())
+
+    tags = (await client.get("/api/todo/tags")).json()
+    assert [(tag["name"], tag["usage_count"]) for tag in tags] == [
+        ("planning", 3),
+        ("priority", 1),
+        ("private_notes", 1),
+    ]
+
+    prefixed = (await client.get("/api/todo/tags", params={"prefix": "PRI"})).json()
+    assert [tag["name"] for tag in prefixed] == ["priority", "private_notes"]
+
+    # LIKE wildcards in the prefix are matched literally.
+    wildcard = (await client.get("/api/todo/tags", params={"prefix": "pr_"})).json()
+    assert wildcard == []
+
+    # Removing the only item using a tag lets the background collector drop it.
+    await client.delete(f"/api/todo/items/{created[0]['id']}")
+    await client.patch(f"/api/todo/items/{created[1]['id']}", json={"tags": ["planning"]})
+    with Session(engine) as session:
+        queued = session.exec(select(Job.kind)).all()
+    assert queued == [service.TAG_COLLECTION_JOB]  # both writes share one queued job
+
+    worker = JobWorker.from_settings(engine, Settings())
+    worker.drain()
+    worker.close()
+
+    remaining = (await client.get("/api/todo/tags")).json()
+    assert [(tag["name"], tag["usage_count"]) for tag in remaining] == [("planning", 2)]
+
+
+@pytest.mark.asyncio
+async def test_tag_links_carry_the_item_list_id(client: AsyncClient, engine):
+    list_ids = [
+        (await client.post("/api/todo/lists", json={"name": name})).json()["id"]
+        for name in ("Home", "Work")
+    ]
+    for list_id in list_ids:
+        await client.post(
+            f"/api/todo/lists/{list_id}/items", json={"title": "Shared", "tags": ["errand"]}
+        )
+
+    with Session(engine) as session:
+        links = session.exec(
+            select(TodoItemTagLink.list_id, TodoItem.list_id).join(
+                TodoItem, TodoItem.id == TodoItemTagLink.item_id
+            )
+        ).all()
+    assert len(links) == 2
+    assert all(link_list_id == item_list_id for link_list_id, item_list_id in links)
+
+    # Tags load through links of the same list only.
+    for list_id in list_ids:
+        items = (await client.get(f"/api/todo/lists/{list_id}/items")).json()
+        assert [[tag["name"] for tag in item["tags"]] for item in items] == [["errand"]]
+        detail = (
+            await client.get(f"/api/todo/lists/{list_id}", params={"include_items": "true"})
+        ).json()
+        assert [[tag["name"] for tag in item["tags"]] for item in detail["items"]] == [["errand"]]
+
+
+@pytest.mark.asyncio
+async def test_list_detail_reads_reflect_mutations_immediately(client: AsyncClient):
+    list_id = (await client.post("/api/todo/lists", json={"name": "Shared"})).json()["id"]
+    params = {"include_items": "true"}
+
+    first = (await client.get(f"/api/todo/lists/{list_id}", params=params)).json()
+    assert first["items"] == []
+
+    item = (
+        await client.post(f"/api/todo/lists/{list_id}/items", json={"title": "Fresh"})
+    ).json()
+    after_create = (await client.get(f"/api/todo/lists/{list_id}", params=params)).json()
+    assert [entry["title"] for entry in after_create["items"]] == ["Fresh"]
+
+    await client.patch(f"/api/todo/items/{item['id']}", json={"title": "Renamed"})
+    await client.patch(f"/api/todo/lists/{list_id}", json={"name": "Shared board"})
+    after_update = (await client.get(f"/api/todo/lists/{list_id}", params=params)).json()
+    assert after_update["name"] == "Shared board"
+    assert [entry["title"] for entry in after_update["items"]] == ["Renamed"]
+
+    await client.delete(f"/api/todo/lists/{list_id}")
+    missing = await client.get(f"/api/todo/lists/{list_id}", params=params)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_summaries_are_served_from_cache_until_a_write(client: AsyncClient):
+    def lookups(result: str) -> float:
+        return metrics.snapshot().get(
+            f'cache_requests_total{{cache="todo_lists",result="{result}"}}', 0
+        )
+
+    await client.post("/api/todo/lists", json={"name": "Cached"})
+    hits, misses = lookups("hit"), lookups("miss")
+
+    first = (await client.get("/api/todo/lists")).json()
+    todo_cache.read_flight.clear()  # skip the coalescing micro-cache to reach the backend
+    second = (await client.get("/api/todo/lists")).json()
+    assert first == second
+    assert (lookups("hit") - hits, lookups("miss") - misses) == (1, 1)
+
+    list_id = first[0]["id"]
+    await client.post(f"/api/todo/lists/{list_id}/items", json={"title": "Invalidate"})
+    after_write = (await client.get("/api/todo/lists")).json()
+    assert after_write[0]["item_count"] == 1
+    assert lookups("miss") - misses == 2
+
+
+@pytest.mark.asyncio
+async def test_completed_items_are_archived_and_restorable(client: AsyncClient, engine):
+    list_id = (await client.post("/api/todo/lists", json={"name": "Archive"})).json()["id"]
+    items = {}
+    for title, item_status, tags in [
+        ("Old report", "done", []),
+        ("Open task", "todo", []),
+        ("Old launch", "done", ["ops"]),
+        ("Fresh win", "done", []),
+    ]:
+        resp = await client.post(
+            f"/api/todo/lists/{list_id}/items",
+            json={"title": title, "status": item_status, "tags": tags},
+        )
+        items[title] = resp.json()
+
+    long_ago = datetime.now(tz=UTC) - timedelta(days=40)
+    with Session(engine) as session:
+        for offset, title in enumerate(["Old report", "Old launch"]):
+            session.execute(
+                update(TodoItem)
+                .where(TodoItem.id == UUID(items[title]["id"]))
+                .values(completed_at=long_ago + timedelta(hours=offset))
+            )
+        session.commit()
+
+    archived = service.archive_completed_items(engine, older_than=timedelta(days=30), batch_size=1)
+    assert archived == 2
+    with Session(engine) as session:
+        # Tags used only by archived items are left to the collector.
+        assert session.exec(select(Job.kind)).all() == [service.TAG_COLLECTION_JOB]
+
+    remaining = (await client.get(f"/api/todo/lists/{list_id}/items")).json()
+    assert [(item["title"], item["position"]) for item in remaining] == [
+        ("Open task", 0),
+        ("Fresh win", 1),
+    ]
+
+    page_one = (await client.get("/api/todo/archive", params={"list_id": list_id, "limit": 1})).json()
+    assert [item["title"] for item in page_one["items"]] == ["Old launch"]
+    assert page_one["items"][0]["tags"] == ["ops"]
+    page_two = (
+        await client.get("/api/todo/archive", params={"limit": 1, "cursor": page_one["next_cursor"]})
+    ).json()
+    assert [item["title"] for item in page_two["items"]] == ["Old report"]
+    assert page_two["next_cursor"] is None
+
+    restored = await client.post(f"/api/todo/archive/{items['Old launch']['id']}/restore")
+    assert restored.status_code == 200
+    body = restored.json()
+    assert body["id"] == items["Old launch"]["id"]
+    assert body["status"] == "done"
+    assert body["position"] == 2
+    assert [tag["name"] for tag in body["tags"]] == ["ops"]
+
+    again = await client.post(f"/api/todo/archive/{items['Old launch']['id']}/restore")
+    assert again.status_code == 404
+    left = (await client.get("/api/todo/archive")).json()
+    assert [item["title"] for item in left["items"]] == ["Old report"]
+
+
+@pytest.mark.asyncio
+async def test_cached_filter_statements_bind_each_call_values(client: AsyncClient):
+    list_ids = {}
+    for name, items in {
+        "Home": [("Water plants", "todo", "garden"), ("Pay rent", "done", "bills")],
+        "Work": [("Write report", "done", "writing"), ("Plan sprint", "todo", "planning")],
+    }.items():
+        list_ids[name] = (await client.post("/api/todo/lists", json={"name": name})).json()["id"]
+        for title, item_status, tag in items:
+            await client.post(
+                f"/api/todo/lists/{list_ids[name]}/items",
+                json={"title": title, "status": item_status, "tags": [tag]},
+            )
+
+    async def titles(list_name: str, **params: str) -> list[str]:
+        resp = await client.get(f"/api/todo/lists/{list_ids[list_name]}/items", params=params)
+        return [item["title"] for item in resp.json()]
+
+    # The same filter combinations run repeatedly with different values and lists.
+    assert await titles("Home", status="done") == ["Pay rent"]
+    assert await titles("Work", status="done") == ["Write report"]
+    assert await titles("Work", status="todo") == ["Plan sprint"]
+    assert await titles("Home", tag="garden") == ["Water plants"]
+    assert await titles("Home", tag="bills") == ["Pay rent"]
+    assert await titles("Work", tag="garden") == []
+    assert await titles("Work", search="sprint") == ["Plan sprint"]
+    assert await titles("Work", search="report", status="done", tag="writing") == ["Write report"]
+    assert await titles("Home", search="plants", status="todo", tag="garden") == ["Water plants"]
+
+
+@pytest.mark.asyncio
+async def test_daily_stats_are_rolled_up_incrementally(client: AsyncClient, engine):
+    list_id = (await client.post("/api/todo/lists", json={"name": "Throughput"})).json()["id"]
+    day_one = datetime(2025, 3, 1, 10, tzinfo=UTC)
+    history = {
+        "Quick fix": (day_one, day_one + timedelta(hours=1)),
+        "Long haul": (day_one + timedelta(hours=2), day_one + timedelta(days=1, hours=2)),
+        "Still open": (day_one + timedelta(days=1), None),
+    }
+    with Session(engine) as session:
+        for title, (created_at, completed_at) in history.items():
+            item = service.create_item(session, UUID(list_id), TodoItemCreate(title=title))
+            session.execute(
+                update(TodoItem)
+                .where(TodoItem.id == item.id)
+                .values(
+                    created_at=created_at,
+                    completed_at=completed_at,
+                    status="done" if completed_at else "todo",
+                )
+            )
+        session.commit()
+
+    def refresh() -> int:
+        return service.refresh_daily_stats(engine, lag=timedelta(0), window=timedelta(days=30))
+
+    assert refresh() > 1  # the backfill runs in 30-day windows
+    refresh()  # a re-run only covers the time since the previous one
+
+    async def stats(day_from: str, day_to: str) -> dict:
+        resp = await client.get(
+            f"/api/todo/lists/{list_id}/stats", params={"from": day_from, "to": day_to}
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    body = await stats("2025-03-01", "2025-03-04")
+    assert [(day["day"], day["created"], day["completed"]) for day in body["days"]] == [
+        ("2025-03-01", 2, 1),
+        ("2025-03-02", 1, 1),
+        ("2025-03-03", 0, 0),
+    ]
+    assert body["days"][0]["median_completion_seconds"] == pytest.approx(3600, rel=0.1)
+    assert body["days"][1]["median_completion_seconds"] == pytest.approx(86400, rel=0.1)
+    assert (body["created"], body["completed"]) == (3, 2)
+    assert body["refreshed_through"] is not None
+
+    # Later events are added to the rollup without recounting history.
+    created = await client.post(
+        f"/api/todo/lists/{list_id}/items", json={"title": "Today", "status": "done"}
+    )
+    today = date.fromisoformat(created.json()["created_at"][:10])
+    refresh()
+    assert (await stats("2025-03-01", "2025-03-04"))["created"] == 3
+    latest = await stats(today.isoformat(), (today + timedelta(days=1)).isoformat())
+    assert (latest["created"], latest["completed"]) == (1, 1)
+
+    invalid = await client.get(
+        f"/api/todo/lists/{list_id}/stats", params={"from": "2025-01-01", "to": "2026-06-01"}
+    )
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_writes_with_an_idempotency_key_are_replayed(client: AsyncClient, engine):
+    list_id = (await client.post("/api/todo/lists", json={"name": "Retries"})).json()["id"]
+    url = f"/api/todo/lists/{list_id}/items"
+    headers = {"Idempotency-Key": "create-1"}
+
+    first = await client.post(url, json={"title": "Once"}, headers=headers)
+    retried = await client.post(url, json={"title": "Once"}, headers=headers)
+    assert first.status_code == retried.status_code == 201
+    assert retried.json() == first.json()
+    assert retried.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert [item["title"] for item in (await client.get(url)).json()] == ["Once"]
+
+    reused = await client.post(url, json={"title": "Twice"}, headers=headers)
+    assert reused.status_code == 422
+
+    item_url = f"/api/todo/items/{first.json()['id']}"
+    patched = await client.patch(item_url, json={"status": "done"}, headers={"Idempotency-Key": "p"})
+    await client.patch(item_url, json={"status": "todo"})
+    replayed = await client.patch(item_url, json={"status": "done"}, headers={"Idempotency-Key": "p"})
+    assert replayed.json() == patched.json()
+    assert (await client.get(item_url)).json()["status"] == "todo"
+
+    deleted = await client.delete(item_url, headers={"Idempotency-Key": "d"})
+    replayed = await client.delete(item_url, headers={"Idempotency-Key": "d"})
+    assert deleted.status_code == replayed.status_code == 204
+    assert (await client.delete(item_url)).status_code == 404
+
+    # Expired keys are purged and no longer replayed.
+    with Session(engine) as session:
+        session.execute(update(TodoIdempotencyKey).values(expires_at=datetime.now(tz=UTC)))
+        session.commit()
+        assert service.purge_expired_idempotency_keys(session, batch_size=2) == 2
+        assert service.collect_expired_idempotency_keys(engine, batch_size=2) == 1
+    again = await client.post(url, json={"title": "Once"}, headers=headers)
+    assert again.status_code == 201
+    assert again.json()["id"] != first.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_list_writes_report_exhausted_retries_as_conflicts(client: AsyncClient, monkeypatch):
+    list_id = (await client.post("/api/todo/lists", json={"name": "Contended"})).json()["id"]
+
+    def conflict(*args, **kwargs):
+        raise service.TodoWriteConflictError()
+
+    for name in ("create_todo_list", "update_todo_list", "delete_todo_list"):
+        monkeypatch.setattr(service, name, conflict)
+    responses = [
+        await client.post("/api/todo/lists", json={"name": "Again"}),
+        await client.patch(f"/api/todo/lists/{list_id}", json={"name": "Renamed"}),
+        await client.delete(f"/api/todo/lists/{list_id}"),
+    ]
+    assert [resp.status_code for resp in responses] == [409, 409, 409]
+    assert all(resp.headers["Retry-After"] == "1" for resp in responses)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.modules import load_all_modules
+from app.modules.todos import service
+from app.modules.todos.models import TodoItem
+from app.modules.todos.schemas import TodoItemCreate, TodoItemUpdate, TodoListCreate
+
+WRITERS = 8
+INSERTS_PER_WRITER = 6
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    """File-backed SQLite whose transactions take the write lock up front.
+
+    This stands in for the per-list row lock the service takes on Postgres: writers queue on the
+    lock instead of reading a stale position count.
+    """
+
+    load_all_modules()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30, "isolation_level": None},
+    )
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    SQLModel.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def _positions(engine, list_id) -> list[int]:
+    with Session(engine) as session:
+        items = session.exec(select(TodoItem).where(TodoItem.list_id == list_id)).all()
+        return sorted(item.position for item in items)
+
+
+def test_parallel_inserts_and_moves_keep_positions_dense(engine):
+    with Session(engine) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Busy")).id
+
+    def insert(writer: int) -> list:
+        created = []
+        with Session(engine) as session:
+            for index in range(INSERTS_PER_WRITER):
+                item = service.create_item(
+                    session,
+                    list_id,
+                    TodoItemCreate(title=f"w{writer}-{index}", position=index % 3, tags=["load"]),
+                )
+                created.append(item.id)
+        return created
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        item_ids = [item_id for batch in pool.map(insert, range(WRITERS)) for item_id in batch]
+
+    total = WRITERS * INSERTS_PER_WRITER
+    assert _positions(engine, list_id) == list(range(total))
+
+    def move(item_id) -> None:
+        with Session(engine) as session:
+            service.update_item(session, item_id, TodoItemUpdate(position=0))
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        list(pool.map(move, item_ids[::3]))
+
+    assert _positions(engine, list_id) == list(range(total))
+
+
+def test_retry_gives_up_with_conflict_after_bounded_attempts(engine):
+    attempts = 0
+
+    def always_conflicts():
+        nonlocal attempts
+        attempts += 1
+        original = sqlite3.IntegrityError("UNIQUE constraint failed")
+        original.sqlite_errorname = "SQLITE_CONSTRAINT_UNIQUE"
+        raise IntegrityError("INSERT", {}, original)
+
+    with Session(engine) as session, pytest.raises(service.TodoWriteConflictError):
+        service._retry_on_conflict(session, always_conflicts)
+
+    assert attempts == service._WRITE_ATTEMPTS
+
+
+def test_non_retryable_errors_propagate_immediately(engine):
+    attempts = 0
+
+    def not_null_violation():
+        nonlocal attempts
+        attempts += 1
+        original = sqlite3.IntegrityError("NOT NULL constraint failed")
+        original.sqlite_errorname = "SQLITE_CONSTRAINT_NOTNULL"
+        raise IntegrityError("INSERT", {}, original)
+
+    with Session(engine) as session, pytest.raises(IntegrityError):
+        service._retry_on_conflict(session, not_null_violation)
+
+    assert attempts == 1
@@ -0,0 +1,284 @@
+"""Behaviour that only real Postgres exercises: constraints, cascades and row locks."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic.script import ScriptDirectory
+from sqlalchemy import func, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.db import partitioning
+from app.modules.jobs import service as jobs
+from app.modules.jobs.models import Job
+from app.modules.jobs.worker import JobWorker
+from app.modules.todos import service
+from app.modules.todos.models import (
+    TodoDailyStats,
+    TodoItem,
+    TodoItemArchive,
+    TodoItemTagLink,
+    TodoTag,
+)
+from app.modules.todos.schemas import TodoItemCreate, TodoItemUpdate, TodoListCreate
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "app" / "db" / "migrations"
+WRITERS = 8
+INSERTS_PER_WRITER = 6
+
+
+def _count(session: Session, model, *criteria) -> int:
+    return session.exec(select(func.count()).select_from(model).where(*criteria)).one()
+
+
+def test_database_is_migrated_to_head(postgres_session):
+    version = postgres_session.exec(text("SELECT version_num FROM alembic_version")).scalar_one()
+    heads = ScriptDirectory(str(MIGRATIONS_DIR)).get_heads()
+    assert [version] == heads
+
+
+def test_deleting_a_list_cascades_to_items_and_tag_links(postgres_session):
+    list_id = service.create_todo_list(postgres_session, TodoListCreate(name="Doomed")).id
+    for title in ("One", "Two"):
+        service.create_item(
+            postgres_session, list_id, TodoItemCreate(title=title, tags=["shared", title])
+        )
+
+    # Delete through SQL so the foreign keys, not the ORM, have to clean up.
+    postgres_session.exec(text("DELETE FROM todo_lists WHERE id = :id").bindparams(id=list_id))
+
+    assert _count(postgres_session, TodoItem, TodoItem.list_id == list_id) == 0
+    assert _count(postgres_session, TodoItemTagLink, TodoItemTagLink.list_id == list_id) == 0
+    assert _count(postgres_session, TodoTag) == 3  # tags are shared and left to the collector
+
+
+def test_duplicate_positions_are_rejected_as_retryable(postgres_session):
+    list_id = service.create_todo_list(postgres_session, TodoListCreate(name="Ordered")).id
+    first = service.create_item(postgres_session, list_id, TodoItemCreate(title="First"))
+    second = service.create_item(postgres_session, list_id, TodoItemCreate(title="Second"))
+
+    with pytest.raises(IntegrityError) as raised, postgres_session.begin_nested():
+        postgres_session.exec(
+            update(TodoItem)
+            .where(TodoItem.id == second.id, TodoItem.list_id == list_id)
+            .values(position=first.position)
+        )
+
+    assert raised.value.orig.sqlstate == "23505"
+    assert service._is_retryable(raised.value)
+
+
+def test_archive_and_restore_round_trip(postgres_session):
+    list_id = service.create_todo_list(postgres_session, TodoListCreate(name="Done")).id
+    item = service.create_item(
+        postgres_session, list_id, TodoItemCreate(title="Shipped", status="done", tags=["release"])
+    )
+    service.create_item(postgres_session, list_id, TodoItemCreate(title="Next"))
+
+    archived = service.archive_completed_batch(
+        postgres_session, completed_before=datetime.now(tz=UTC) + timedelta(days=1), batch_size=10
+    )
+
+    assert archived == 1
+    assert postgres_session.get(TodoItemArchive, item.id).tags == ["release"]
+    assert [item.position for item in service.list_items(postgres_session, list_id)] == [0]
+
+    restored = service.restore_item(postgres_session, item.id)
+    assert restored.position == 1
+    assert [tag.name for tag in restored.tags] == ["release"]
+
+
+def test_parallel_writers_keep_positions_dense(committing_postgres_engine):
+    engine = committing_postgres_engine
+    with Session(engine) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Busy")).id
+
+    def insert(writer: int) -> list:
+        with Session(engine) as session:
+            return [
+                service.create_item(
+                    session,
+                    list_id,
+                    TodoItemCreate(title=f"w{writer}-{index}", position=index % 3, tags=["load"]),
+                ).id
+                for index in range(INSERTS_PER_WRITER)
+            ]
+
+    def move(item_id) -> None:
+        with Session(engine) as session:
+            service.update_item(session, item_id, TodoItemUpdate(position=0))
+
+    def positions() -> list[int]:
+        with Session(engine) as session:
+            return sorted(
+                session.exec(select(TodoItem.position).where(TodoItem.list_id == list_id)).all()
+            )
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        item_ids = [item_id for batch in pool.map(insert, range(WRITERS)) for item_id in batch]
+    total = WRITERS * INSERTS_PER_WRITER
+    assert positions() == list(range(total))
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        list(pool.map(move, item_ids[::3]))
+    assert positions() == list(range(total))
+
+
+def test_concurrent_stats_refreshes_count_each_event_once(committing_postgres_engine):
+    engine = committing_postgres_engine
+    with Session(engine) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Charted")).id
+        for index in range(20):
+            service.create_item(
+                session,
+                list_id,
+                TodoItemCreate(title=f"item {index}", status="done" if index % 2 else "todo"),
+            )
+
+    def refresh(_: int) -> int:
+        return service.refresh_daily_stats(engine, lag=timedelta(0), window=timedelta(days=1))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(refresh, range(4)))
+
+    with Session(engine) as session:
+        rows = session.exec(select(TodoDailyStats).where(TodoDailyStats.list_id == list_id)).all()
+    assert sum(row.created_count for row in rows) == 20
+    assert sum(row.completed_count for row in rows) == 10
+
+
+def test_concurrent_requests_with_one_idempotency_key_write_once(committing_postgres_engine):
+    engine = committing_postgres_engine
+    with Session(engine) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Retried")).id
+    idempotency = service.IdempotentWrite(
+        key="same-request",
+        fingerprint="fingerprint",
+        status_code=201,
+        render=lambda item: str(item.id),
+        ttl=timedelta(minutes=5),
+    )
+
+    def create(_: int) -> str:
+        with Session(engine) as session:
+            try:
+                item = service.create_item(
+                    session, list_id, TodoItemCreate(title="Once"), idempotency=idempotency
+                )
+            except service.IdempotentReplay as replay:
+                return replay.body
+            return str(item.id)
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        bodies = set(pool.map(create, range(WRITERS)))
+
+    with Session(engine) as session:
+        item_ids = session.exec(select(TodoItem.id).where(TodoItem.list_id == list_id)).all()
+    assert bodies == {str(item_ids[0])}
+    assert len(item_ids) == 1
+
+
+def test_tag_collection_skips_tags_being_attached(committing_postgres_engine):
+    engine = committing_postgres_engine
+    with Session(engine) as session:
+        list_id = service.create_todo_list(session, TodoListCreate(name="Tagged")).id
+        session.add(TodoTag(name="shared"))
+        session.commit()
+
+    with Session(engine) as writer, Session(engine) as collector:
+        # The writer has looked up the orphaned tag but not yet inserted or committed its link.
+        item = TodoItem(list_id=list_id, title="Late", position=0)
+        writer.add(item)
+        service._synchronize_tags(writer, item, ["shared"])
+
+        collector.execute(text("SET LOCAL lock_timeout = '2s'"))
+        assert service.purge_orphan_tags(collector, batch_size=10) == 0
+        writer.commit()
+
+        assert _count(collector, TodoItemTagLink, TodoItemTagLink.item_id == item.id) == 1
+        assert service.purge_orphan_tags(collector, batch_size=10) == 0
+
+
+@pytest.fixture
+def counted_runs(monkeypatch) -> list[int]:
+    """Payload numbers of the ``test.count`` jobs run; the handler is registered for one test."""
+
+    runs: list[int] = []
+    lock = threading.Lock()
+
+    def count(bind, payload: dict) -> None:
+        with lock:
+            runs.append(payload["n"])
+
+    monkeypatch.setitem(jobs._handlers, "test.count", count)
+    return runs
+
+
+def test_concurrent_workers_claim_each_job_once(committing_postgres_engine, counted_runs):
+    engine = committing_postgres_engine
+    with Session(engine) as session:
+        for n in range(60):
+            jobs.enqueue(session, "test.count", {"n": n})
+        session.commit()
+
+    workers = [
+        JobWorker(
+            engine,
+            concurrency=3,
+            batch_size=4,
+            poll_interval=0.05,
+            lease_timeout=60.0,
+            backoff=0.0,
+            backoff_max=0.0,
+        )
+        for _ in range(4)
+    ]
+    with ThreadPoolExecutor(max_workers=len(workers)) as pool:
+        list(pool.map(JobWorker.drain, workers))
+    for worker in workers:
+        worker.close()
+
+    assert sorted(counted_runs) == list(range(60))
+    with Session(engine) as session:
+        assert _count(session, Job) == 0
+
+
+def test_partitioning_converts_a_migrated_database_in_place(postgres_session):
+    list_id = service.create_todo_list(postgres_session, TodoListCreate(name="Kept")).id
+    service.create_item(postgres_session, list_id, TodoItemCreate(title="Survivor", tags=["old"]))
+    connection = postgres_session.connection()
+    assert partitioning.partition_count(connection) == 0
+
+    for statement in partitioning.conversion_statements(connection, 4):
+        connection.exec_driver_sql(statement)
+    assert partitioning.partition_count(connection) == 4
+    assert partitioning.conversion_statements(connection, 4) == []  # re-running is a no-op
+    indexes = connection.exec_driver_sql(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'todo_items'"
+    ).scalars()
+    assert "ix_todo_items_created_at" in set(indexes)  # added by a later migration, carried over
+
+    service.create_item(postgres_session, list_id, TodoItemCreate(title="New", tags=["old"]))
+    titles = [item.title for item in service.list_items(postgres_session, list_id)]
+    assert titles == ["Survivor", "New"]
+
+    for statement in partitioning.conversion_statements(connection, 0):
+        connection.exec_driver_sql(statement)
+    assert partitioning.partition_count(connection) == 0
+    assert _count(postgres_session, TodoItemTagLink, TodoItemTagLink.list_id == list_id) == 2
+
+
+def test_due_calendar_buckets_by_utc_day_in_any_session_timezone(postgres_session):
+    list_id = service.create_todo_list(postgres_session, TodoListCreate(name="Late")).id
+    # 23:30 UTC on the 10th is already the 11th in Tokyo.
+    due = datetime(2025, 3, 10, 23, 30, tzinfo=UTC)
+    service.create_item(postgres_session, list_id, TodoItemCreate(title="Night", due_date=due))
+    postgres_session.exec(text("SET LOCAL TIME ZONE 'Asia/Tokyo'"))
+
+    counts = service.due_calendar(postgres_session, date(2025, 3, 1))
+    assert counts == {date(2025, 3, 10): 1}
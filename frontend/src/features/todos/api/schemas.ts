@@ -36,8 +36,20 @@ export const todoListReadSchema = z.object({
 
 export type TodoListRead = z.infer<typeof todoListReadSchema>;
 
+export const todoStatusCountsSchema = z.object({
+  todo: z.number().int().nonnegative(),
+  in_progress: z.number().int().nonnegative(),
+  blocked: z.number().int().nonnegative(),
+  done: z.number().int().nonnegative(),
+});
+
+export type TodoStatusCounts = z.infer<typeof todoStatusCountsSchema>;
+
 export const todoListSummarySchema = todoListReadSchema.extend({
   item_count: z.number().int().nonnegative(),
+  status_counts: todoStatusCountsSchema.optional(),
+  overdue_count: z.number().int().nonnegative().optional(),
+  next_due_date: z.string().datetime({ offset: true }).nullable().optional(),
 });
 
 export type TodoListSummary = z.infer<typeof todoListSummarySchema>;